@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Índice aproximado de vecinos (IVF) sobre embeddings de conceptos, en NumPy.
+
+• build_ivf(): k-means esférico (coseno) en `nlist` celdas; los vectores
+  se reordenan por celda (ids, offsets) para que cada lista invertida sea
+  un bloque contiguo de la matriz.
+• IvfIndex.search(): por consulta se eligen las `nprobe` celdas más
+  cercanas a los centroides y solo se puntúan sus vectores (producto
+  bloque @ q + top-k parcial). nprobe = nlist equivale a la búsqueda exacta.
+• save()/load(): directorio con .npy (abiertos con mmap) + meta.json.
+
+Las consultas se procesan por lotes: la asignación a celdas es un único
+producto (consultas × centroides) y el bucle Python es por consulta, nunca
+por concepto.
+
+Uso:
+    python cli.py ann --lsa lsa/ --nlist 256
+    python -m benchmarks.ann --n 200000 --nprobe 1 4 16 64
+"""
+
+import json
+import os
+
+import numpy as np
+
+from rowops import normalize_rows
+
+ASSIGN_CHUNK = 65536
+
+
+def _assign(vectors, centroids):
+    # Celda de cada vector (coseno máximo), por bloques para acotar memoria
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        block = np.asarray(vectors[start:start + ASSIGN_CHUNK])
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def spherical_kmeans(vectors, nlist, iters=20, seed=0, sample=None):
+    """Centroides L2 (nlist × d); `sample` limita los vectores de entrenamiento."""
+    rng = np.random.default_rng(seed)
+    train = vectors
+    if sample is not None and sample < len(vectors):
+        train = vectors[np.sort(rng.choice(len(vectors), sample, replace=False))]
+    train = np.asarray(train, dtype=np.float32)
+    centroids = train[rng.choice(len(train), nlist, replace=False)].copy()
+    for _ in range(iters):
+        labels = _assign(train, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, train)
+        counts = np.bincount(labels, minlength=nlist)
+        # Celdas vacías: se resiembran con vectores al azar
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = train[rng.choice(len(train), int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums).astype(np.float32)
+    return centroids
+
+
+def default_nlist(n):
+    return max(1, min(n, int(4 * np.sqrt(n))))
+
+
+def build_ivf(embeddings, nlist=None, iters=20, seed=0, sample=None):
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    nlist = nlist or default_nlist(len(embeddings))
+    centroids = spherical_kmeans(embeddings, nlist, iters, seed, sample)
+    labels = _assign(embeddings, centroids)
+    ids = np.argsort(labels, kind="stable").astype(np.int32)
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels, minlength=nlist), out=offsets[1:])
+    meta = {"nlist": int(nlist), "n": int(len(embeddings)), "dim": int(embeddings.shape[1]),
+            "iters": iters, "seed": seed}
+    return IvfIndex(centroids, np.ascontiguousarray(embeddings[ids]), ids, offsets, meta)
+
+
+class IvfIndex:
+    """Listas invertidas: vectores reordenados por celda + ids + offsets."""
+
+    def __init__(self, centroids, vectors, ids, offsets, meta, nprobe=8):
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.offsets = offsets
+        self.meta = meta
+        self.nprobe = nprobe
+
+    def __len__(self):
+        return len(self.ids)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            np.save(os.path.join(path, f"{name}.npy"), np.asarray(getattr(self, name)))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(self.meta, fh, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True, nprobe=8):
+        mode = "r" if mmap else None
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+                  for name in ("centroids", "vectors", "ids", "offsets")]
+        # Centroides y offsets son pequeños y se leen en cada consulta
+        arrays[0] = np.asarray(arrays[0])
+        arrays[3] = np.asarray(arrays[3])
+        return cls(*arrays, meta, nprobe)
+
+    def search(self, queries, k=10, nprobe=None):
+        """(ids, scores) de forma (n_consultas × k); -1 / -inf si faltan candidatos."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        coarse = queries @ self.centroids.T
+        if nprobe < coarse.shape[1]:
+            probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.broadcast_to(np.arange(coarse.shape[1]), coarse.shape)
+        out_ids = np.full((len(queries), k), -1, dtype=np.int32)
+        out_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        starts, stops = self.offsets[:-1], self.offsets[1:]
+        for row, query in enumerate(queries):
+            cells = probes[row]
+            rows = np.concatenate([np.arange(starts[c], stops[c]) for c in cells])
+            if not len(rows):
+                continue
+            scores = np.asarray(self.vectors[rows]) @ query
+            m = min(k, len(scores))
+            best = np.argpartition(-scores, m - 1)[:m]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            out_ids[row, :m] = self.ids[rows[best]]
+            out_scores[row, :m] = scores[best]
+        return out_ids, out_scores
+
+    @property
+    def nbytes(self):
+        return (self.centroids.nbytes + self.vectors.nbytes + self.ids.nbytes
+                + self.offsets.nbytes)
+
+
+def exact_search(embeddings, queries, k=10):
+    """Referencia exacta (fuerza bruta) con la misma salida que IvfIndex.search()."""
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    scores = queries @ np.asarray(embeddings).T
+    k = min(k, scores.shape[1])
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return (np.take_along_axis(best, order, axis=1).astype(np.int32),
+            np.take_along_axis(top, order, axis=1))
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Autocompletado de términos del tesauro (ES y EN).
+
+• Prefijo: array ordenado de claves sin tildes + bisección.
+• Infijo: índice de trigramas (trigrama -> IDs de entrada, int32); se
+  intersecan las listas más cortas y se verifica la subcadena solo sobre
+  los candidatos más cortos hasta llenar el límite. Un segundo índice de
+  trigramas de inicio de palabra da prioridad a "dental" en "salud dental"
+  frente a "accidental".
+• Erratas: si prefijo e infijo no dan resultados, la consulta se corrige
+  con el índice de borrados de cada idioma (fuzzy.TermCorrector) y se
+  repite la búsqueda por prefijo.
+• Similares: coeficiente de Dice sobre trigramas con bincount sobre las
+  listas de postings (consultas con errores o variantes morfológicas).
+
+Una entrada es un par (concepto, idioma); search() devuelve Completion
+con el ID de concepto, de modo que ES y EN se resuelven por alineación.
+"""
+
+from bisect import bisect_left
+from collections import namedtuple
+
+import numpy as np
+
+from concept_store import LANGS
+from textnorm import fold_key, tokenize
+
+Completion = namedtuple("Completion", "concept_id lang term match")
+
+_MAX_CHAR = "\U0010ffff"
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def _trigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TermAutocomplete:
+    def __init__(self, store, langs=LANGS):
+        self.store = store
+        entries = []
+        for lang_id, lang in enumerate(langs):
+            column = store.column(lang)
+            for cid in range(len(column)):
+                entries.append((fold_key(column[cid]), cid, lang_id))
+        entries.sort()
+        self.langs = tuple(langs)
+        self.keys = [key for key, _, _ in entries]
+        self.concept_ids = np.fromiter((cid for _, cid, _ in entries), dtype=np.int32,
+                                       count=len(entries))
+        self.lang_ids = np.fromiter((lang for _, _, lang in entries), dtype=np.int8,
+                                    count=len(entries))
+        self.key_lengths = np.fromiter((len(k) for k in self.keys), dtype=np.int16,
+                                       count=len(self.keys))
+        postings = {}
+        starts = {}
+        for pos, key in enumerate(self.keys):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, []).append(pos)
+            for word in key.split():
+                if len(word) >= 3:
+                    starts.setdefault(word[:3], set()).add(pos)
+        self.trigrams = {gram: np.asarray(p, dtype=np.int32) for gram, p in postings.items()}
+        self.trigram_counts = np.fromiter((len(_trigrams(k)) for k in self.keys),
+                                          dtype=np.int16, count=len(self.keys))
+        self.word_starts = {gram: np.asarray(sorted(p), dtype=np.int32)
+                            for gram, p in starts.items()}
+
+    def _entry(self, pos, match):
+        cid = int(self.concept_ids[pos])
+        lang = self.langs[self.lang_ids[pos]]
+        return Completion(cid, lang, self.store.term(lang, cid), match)
+
+    def prefix(self, query, limit=10):
+        key = fold_key(query)
+        lo = bisect_left(self.keys, key)
+        hi = bisect_left(self.keys, key + _MAX_CHAR, lo)
+        # Más cortos primero: el término exacto o el más general
+        positions = lo + np.argsort(self.key_lengths[lo:hi], kind="stable")[:limit]
+        return [self._entry(p, "prefix") for p in positions.tolist()]
+
+    def infix(self, query, limit=10, exclude=()):
+        key = fold_key(query)
+        grams = {key[i:i + 3] for i in range(len(key) - 2)}
+        if not grams:
+            return []
+        postings = sorted((self.trigrams.get(g, _EMPTY) for g in grams), key=len)
+        candidates = postings[0]
+        for other in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, other, assume_unique=True)
+        order = candidates[np.argsort(self.key_lengths[candidates], kind="stable")]
+        word_start = order[np.isin(order, self.word_starts.get(key[:3], _EMPTY))]
+
+        # Inicio de palabra primero, después en medio de palabra; más cortos antes
+        keys = self.keys
+        hits = []
+        seen = set(exclude)
+        for group, needle in ((word_start, f" {key}"), (order, key)):
+            for p in group.tolist():
+                if p in seen:
+                    continue
+                if needle in f" {keys[p]}":
+                    hits.append(p)
+                    seen.add(p)
+                    if len(hits) >= limit:
+                        return [self._entry(h, "infix") for h in hits]
+        return [self._entry(h, "infix") for h in hits]
+
+    def similar(self, query, limit=5, min_score=0.5, lang=None):
+        """Entradas más parecidas por Dice de trigramas; [(Completion, score)]."""
+        grams = _trigrams(fold_key(query))
+        postings = [self.trigrams[g] for g in grams if g in self.trigrams]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.keys))
+        scores = 2.0 * shared / (len(grams) + self.trigram_counts)
+        if lang is not None:
+            scores[self.lang_ids != self.langs.index(lang)] = 0.0
+        if limit < len(scores):
+            best = np.argpartition(-scores, limit)[:limit]
+            best = best[np.argsort(-scores[best], kind="stable")]
+        else:
+            best = np.argsort(-scores, kind="stable")
+        return [(self._entry(p, "similar"), float(scores[p]))
+                for p in best.tolist() if scores[p] >= min_score]
+
+    def corrected(self, query, limit=10):
+        """Prefijo sobre la consulta corregida en cada idioma (match "fuzzy")."""
+        tokens = tokenize(query)
+        results = []
+        seen = set()
+        for lang in self.langs:
+            fixed, _ = self.store.column(lang).corrector.correct_tokens(tokens)
+            if fixed == tokens:
+                continue
+            for c in self.prefix(" ".join(fixed), limit):
+                if (c.concept_id, c.lang) not in seen:
+                    seen.add((c.concept_id, c.lang))
+                    results.append(c._replace(match="fuzzy"))
+        return results[:limit]
+
+    def search(self, query, limit=10):
+        """Prefijo, después infijo (sin repetir entradas) y, sin resultados, erratas."""
+        results = self.prefix(query, limit)
+        if len(results) < limit:
+            seen = {(r.concept_id, r.lang) for r in results}
+            key = fold_key(query)
+            lo = bisect_left(self.keys, key)
+            hi = bisect_left(self.keys, key + _MAX_CHAR, lo)
+            more = self.infix(query, limit, exclude=range(lo, hi))
+            results += [r for r in more if (r.concept_id, r.lang) not in seen][:limit - len(results)]
+        if not results:
+            results = self.corrected(query, limit)
+        return results
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks reproducibles del generador de keywords.
+
+Ejecutar desde la raíz del repositorio, p. ej.:
+    python -m benchmarks.pipeline --output bench.json
+"""
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Índice IVF (ann.py) frente a la búsqueda exacta sobre embeddings.
+
+Embeddings sintéticos agrupados (n × dim, L2) o, con --lsa, los del índice
+LSA del tesauro. Las consultas son embeddings perturbados. Por cada nprobe
+mide recall@k respecto a exact_search() y la latencia por lote; además el
+tiempo de construcción (k-means) y los bytes del índice.
+
+Uso:
+    python -m benchmarks.ann --n 200000 --nprobe 1 4 16 64
+    python -m benchmarks.ann --lsa lsa/ --queries 500
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from ann import build_ivf, default_nlist, exact_search
+from rowops import normalize_rows
+
+
+def clustered(n, dim, clusters, seed=0, spread=0.35):
+    """Vectores L2 alrededor de `clusters` centros aleatorios."""
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((clusters, dim)).astype(np.float32))
+    labels = rng.integers(0, clusters, n)
+    noise = rng.standard_normal((n, dim)).astype(np.float32) * (spread / np.sqrt(dim))
+    return normalize_rows(centers[labels] + noise).astype(np.float32)
+
+
+def _queries(embeddings, n, seed, noise=0.1):
+    rng = np.random.default_rng(seed + 1)
+    base = embeddings[rng.choice(len(embeddings), n, replace=False)]
+    jitter = rng.standard_normal(base.shape).astype(np.float32) * (noise / np.sqrt(base.shape[1]))
+    return normalize_rows(base + jitter).astype(np.float32)
+
+
+def _timed(fn, repeat=3):
+    fn()  # calentamiento
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, min(samples)
+
+
+def run(n=200_000, dim=128, clusters=1000, queries=1000, k=10, nlist=None,
+        nprobes=(1, 4, 16, 64), iters=20, sample=None, seed=0, lsa=None):
+    if lsa:
+        from lsa import LsaIndex
+
+        embeddings = np.asarray(LsaIndex.load(lsa, mmap=False).embeddings, dtype=np.float32)
+    else:
+        embeddings = clustered(n, dim, clusters, seed)
+    queries = _queries(embeddings, min(queries, len(embeddings)), seed)
+    nlist = nlist or default_nlist(len(embeddings))
+
+    started = time.perf_counter()
+    ivf = build_ivf(embeddings, nlist, iters, seed, sample)
+    build_s = time.perf_counter() - started
+
+    (exact_ids, _), exact_s = _timed(lambda: exact_search(embeddings, queries, k))
+    results = {"exact": {"batch_ms": exact_s * 1000.0,
+                         "per_query_ms": exact_s * 1000.0 / len(queries)}}
+    for nprobe in nprobes:
+        (ids, _), elapsed = _timed(lambda: ivf.search(queries, k, nprobe))
+        hits = [len(set(a) & set(b)) / k for a, b in zip(ids.tolist(), exact_ids.tolist())]
+        results[f"nprobe_{nprobe}"] = {
+            "recall_at_k": float(np.mean(hits)),
+            "batch_ms": elapsed * 1000.0,
+            "per_query_ms": elapsed * 1000.0 / len(queries),
+            "scanned_fraction": min(1.0, nprobe / nlist),
+        }
+    results["meta"] = {
+        "n": int(len(embeddings)), "dim": int(embeddings.shape[1]), "nlist": int(nlist),
+        "queries": int(len(queries)), "k": k, "iters": iters, "sample": sample,
+        "seed": seed, "lsa": lsa, "build_s": build_s, "index_bytes": int(ivf.nbytes),
+        "python": platform.python_version(), "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="IVF vs búsqueda exacta sobre embeddings")
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, help="celdas (por defecto 4·√n)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--iters", type=int, default=20)
+    parser.add_argument("--sample", type=int, help="vectores de entrenamiento del k-means")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--lsa", help="usar los embeddings de un índice LSA (cli.py lsa)")
+    parser.add_argument("--output", help="ruta del JSON de resultados")
+    args = parser.parse_args(argv)
+
+    results = run(args.n, args.dim, args.clusters, args.queries, args.k, args.nlist,
+                  tuple(args.nprobe), args.iters, args.sample, args.seed, args.lsa)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
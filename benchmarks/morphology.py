@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del índice de n-gramas de caracteres (char_index.py).
+
+Compara el índice solo de palabras con índices fusionados para varios
+pesos de caracteres sobre resúmenes sintéticos etiquetados, con y sin
+flexión de los términos plantados (synth.generate(morph=...)):
+
+• calidad: recall@k frente a los conceptos plantados;
+• latencia: similarities (etapa fusionada) y suggest_indices por resumen;
+• coste: tiempo de construcción, memoria pico al construir y bytes del
+  índice de caracteres.
+
+Uso:
+    python -m benchmarks.morphology --weights 0.3 0.5 0.7 --output morph.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.pipeline import _latency, _peak_memory
+from benchmarks.synth import generate
+from concept_store import load_store
+from keyword_engine import prepare_vectorizer, similarities, suggest_batch, suggest_indices
+
+
+def _recall(docs, terms, vect, matrix, k):
+    batch = suggest_batch([d.text for d in docs], terms, vect, matrix, k)
+    return float(np.mean([len(set(ids) & d.concept_ids) / min(k, len(d.concept_ids))
+                          for ids, d in zip(batch, docs)]))
+
+
+def bench_weight(terms, weight, labeled, k):
+    times = []
+    for _ in range(2):
+        started = time.perf_counter()
+        prepare_vectorizer(terms, char_weight=weight)
+        times.append(time.perf_counter() - started)
+    (vect, matrix), peak = _peak_memory(lambda: prepare_vectorizer(terms, char_weight=weight))
+    texts = [d.text for d in labeled["morph"]]
+    result = {
+        "build_s": min(times),
+        "build_peak_bytes": peak,
+        "char_index_bytes": matrix.char.nbytes if weight is not None else 0,
+        "similarities": _latency(lambda t: similarities(vect, matrix, [t]), texts),
+        "suggest_indices": _latency(lambda t: suggest_indices(t, terms, vect, matrix, k), texts),
+    }
+    for name, docs in labeled.items():
+        result[f"recall_at_k_{name}"] = _recall(docs, terms, vect, matrix, k)
+    return result
+
+
+def run(weights=(0.3, 0.5, 0.7), n=200, k=5, seed=0, morph=0.5):
+    terms = load_store().column("es")
+    labeled = {
+        "clean": generate(terms, "abstract", n, seed=seed),
+        "morph": generate(terms, "abstract", n, seed=seed, morph=morph),
+    }
+    results = {"word_only": bench_weight(terms, None, labeled, k)}
+    for weight in weights:
+        results[f"char_{weight:g}"] = bench_weight(terms, weight, labeled, k)
+    results["meta"] = {
+        "n": n, "k": k, "seed": seed, "morph": morph,
+        "python": platform.python_version(), "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del índice de n-gramas de caracteres")
+    parser.add_argument("--weights", type=float, nargs="+", default=[0.3, 0.5, 0.7])
+    parser.add_argument("--n", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--morph", type=float, default=0.5,
+                        help="probabilidad de flexionar cada palabra plantada")
+    parser.add_argument("--output", help="ruta del JSON de resultados")
+    args = parser.parse_args(argv)
+
+    text = json.dumps(run(tuple(args.weights), args.n, args.k, args.seed, args.morph), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
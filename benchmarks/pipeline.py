@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark del pipeline de sugerencia.
+
+Mide, por tipo de documento sintético (abstract, paper, thesis):
+latencia por etapa (extract_ngrams, exacta, TF-IDF, suggest_indices),
+throughput de suggest_batch, memoria pico y tiempo de construcción del
+índice. Escribe un JSON y, con --baseline, compara contra uno guardado y
+termina con código 1 si alguna métrica empeora más de --tolerance más el
+ruido medido.
+
+Las medias y percentiles sobre todas las muestras se informan pero no se
+comparan: varían más que una regresión real entre dos ejecuciones del
+mismo código. La comparación usa la mejor mediana de `repeat` pasadas
+(best_p50_ms), el mejor tiempo de construcción y el mejor throughput, y
+cada una guarda su ruido (<métrica>_noise: dispersión relativa entre
+pasadas) para ensanchar el umbral.
+
+Uso:
+    python -m benchmarks.pipeline --output bench.json
+    python -m benchmarks.pipeline --baseline bench.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synth import LENGTHS, generate
+from concept_store import load_store
+from keyword_engine import (exact_matches, extract_ngrams, prepare_vectorizer,
+                            similarities, suggest_batch, suggest_indices)
+
+DOCS_PER_KIND = {"abstract": 200, "paper": 20, "thesis": 3}
+
+
+def _spread(values):
+    # Dispersión relativa entre pasadas: (peor - mejor) / mejor
+    best = min(values)
+    return float((max(values) - best) / best) if best else 0.0
+
+
+def _latency(fn, inputs, repeat=5):
+    fn(inputs[0])  # calentamiento
+    samples, medians = [], []
+    for _ in range(repeat):
+        run = []
+        for x in inputs:
+            started = time.perf_counter()
+            fn(x)
+            run.append(time.perf_counter() - started)
+        samples.extend(run)
+        medians.append(float(np.median(run)) * 1000.0)
+    ms = np.asarray(samples) * 1000.0
+    return {
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "best_p50_ms": min(medians),
+        "best_p50_ms_noise": _spread(medians),
+    }
+
+
+def _peak_memory(fn):
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+def bench_index(terms, compact=None, repeat=3):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        prepare_vectorizer(terms, compact=compact)
+        times.append(time.perf_counter() - started)
+    (vect, matrix), peak = _peak_memory(lambda: prepare_vectorizer(terms, compact=compact))
+    return (vect, matrix), {"build_s": min(times), "build_s_noise": _spread(times),
+                            "peak_bytes": peak}
+
+
+def bench_kind(docs, terms, vect, matrix, k, repeat=3):
+    texts = [d.text for d in docs]
+    result = {
+        "extract_ngrams": _latency(extract_ngrams, texts),
+        "exact": _latency(lambda t: exact_matches(t, terms), texts),
+        "exact_fuzzy": _latency(lambda t: exact_matches(t, terms, fuzzy=True), texts),
+        "tfidf": _latency(lambda t: similarities(vect, matrix, [t]), texts),
+        "suggest_indices": _latency(lambda t: suggest_indices(t, terms, vect, matrix, k), texts),
+    }
+    rates = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        batch = suggest_batch(texts, terms, vect, matrix, k)
+        rates.append(len(texts) / (time.perf_counter() - started))
+    result["throughput_docs_s"] = max(rates)
+    result["throughput_docs_s_noise"] = _spread([1.0 / r for r in rates])
+    _, result["peak_bytes"] = _peak_memory(
+        lambda: suggest_batch(texts[:10], terms, vect, matrix, k))
+    recall = [len(set(ids) & d.concept_ids) / min(k, len(d.concept_ids))
+              for ids, d in zip(batch, docs)]
+    result["recall_at_k"] = float(np.mean(recall))
+    return result
+
+
+def run(seed=0, k=5, kinds=tuple(LENGTHS), compact=None):
+    terms = load_store().column("es")
+    (vect, matrix), index = bench_index(terms, compact)
+    results = {"index": index, "kinds": {}}
+    for kind in kinds:
+        docs = generate(terms, kind, DOCS_PER_KIND[kind], seed=seed)
+        results["kinds"][kind] = bench_kind(docs, terms, vect, matrix, k)
+    results["meta"] = {
+        "seed": seed, "k": k, "compact": compact,
+        "python": platform.python_version(), "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+    return results
+
+
+# ------------------------------------------------------------
+#  Comparación con baseline
+# ------------------------------------------------------------
+
+# Métricas comparadas: donde un valor mayor es peor / mejor
+_LOWER_IS_BETTER = ("best_p50_ms", "build_s", "peak_bytes")
+_HIGHER_IS_BETTER = ("throughput_docs_s", "recall_at_k")
+
+
+def _flatten(d, prefix=""):
+    for key, value in d.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, name + ".")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def compare(current, baseline, tolerance=0.2):
+    """Lista de (métrica, baseline, actual) que empeoran más de `tolerance`.
+
+    El umbral de cada métrica se ensancha con el mayor ruido medido
+    (<métrica>_noise) en la ejecución actual o en la baseline.
+    """
+    base = dict(_flatten({k: v for k, v in baseline.items() if k != "meta"}))
+    cur = dict(_flatten({k: v for k, v in current.items() if k != "meta"}))
+    regressions = []
+    for name, value in cur.items():
+        old = base.get(name)
+        if not old:
+            continue
+        margin = tolerance + max(cur.get(name + "_noise", 0.0), base.get(name + "_noise", 0.0))
+        if name.endswith(_HIGHER_IS_BETTER):
+            worse = value < old / (1 + margin)
+        elif name.endswith(_LOWER_IS_BETTER):
+            worse = value > old * (1 + margin)
+        else:
+            continue
+        if worse:
+            regressions.append((name, old, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del pipeline de keywords")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--kinds", nargs="+", choices=list(LENGTHS), default=list(LENGTHS))
+    parser.add_argument("--compact", default=None)
+    parser.add_argument("--output", help="ruta del JSON de resultados")
+    parser.add_argument("--baseline", help="JSON previo con el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.seed, args.k, tuple(args.kinds), args.compact)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.tolerance)
+        for name, old, new in regressions:
+            print(f"REGRESIÓN {name}: {old:.4g} -> {new:.4g}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
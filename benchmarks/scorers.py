@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Comparativa de scorers del fallback (scorers.py): TF-IDF, BM25 y, con
+--lsa / --vectors, los scorers LSA y de vectores de palabras.
+
+Sobre resúmenes sintéticos etiquetados (limpios y con flexión de los
+términos plantados) mide, por scorer:
+
+• calidad: recall@k del ranking del scorer solo (scores + prior, sin la
+  etapa exacta) y de suggest_batch completo;
+• latencia: scores() por resumen y suggest_indices (media, p50, p95);
+• coste: construcción del scorer y bytes de sus estructuras propias;
+• perfiles de fusión (fusion.py) aplicables: recall@k y latencia de
+  suggest_batch con fusion=perfil.
+
+Uso:
+    python -m benchmarks.scorers --kinds abstract paper --output scorers.json
+    python -m benchmarks.scorers --lsa lsa/
+    python -m benchmarks.scorers --vectors vectores_es/
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.pipeline import _latency
+from benchmarks.synth import LENGTHS, generate
+from concept_store import load_store
+from keyword_engine import prepare_vectorizer, suggest_batch, suggest_indices, top_k
+from lsa import LsaIndex
+from fusion import available_profiles
+from scorers import attach_lsa, attach_word_vectors, available_scorers, get_scorer
+
+DOCS_PER_KIND = {"abstract": 200, "paper": 20, "thesis": 3}
+
+
+def _recall(batch, docs, k):
+    return float(np.mean([len(set(ids) & d.concept_ids) / min(k, len(d.concept_ids))
+                          for ids, d in zip(batch, docs)]))
+
+
+def bench_scorer(name, terms, vect, matrix, labeled, k):
+    # La primera llamada construye el scorer (el motor reutiliza la instancia)
+    started = time.perf_counter()
+    scorer = get_scorer(name, vect, matrix)
+    result = {"build_s": time.perf_counter() - started,
+              "nbytes": getattr(scorer, "nbytes", 0)}
+    prior = terms.meta.prior
+    for label, docs in labeled.items():
+        texts = [d.text for d in docs]
+        ranked = [top_k(row + prior, k).tolist() for row in scorer.scores(texts)]
+        result[label] = {
+            "scorer_recall_at_k": _recall(ranked, docs, k),
+            "suggest_recall_at_k": _recall(
+                suggest_batch(texts, terms, vect, matrix, k, scorer=name), docs, k),
+            "scores": _latency(lambda t: scorer.scores([t]), texts),
+            "suggest_indices": _latency(
+                lambda t: suggest_indices(t, terms, vect, matrix, k, scorer=name), texts),
+        }
+    return result
+
+
+def run(kinds=("abstract", "paper"), k=5, seed=0, morph=0.5, compact=None, lsa=None,
+        vectors=None):
+    terms = load_store().column("es")
+    vect, matrix = prepare_vectorizer(terms, compact=compact)
+    if lsa:
+        attach_lsa(vect, matrix, LsaIndex.load(lsa))
+    if vectors:
+        from word_vectors import WordVectors
+
+        attach_word_vectors(vect, matrix, WordVectors.load(vectors), terms)
+    labeled = {}
+    for kind in kinds:
+        n = DOCS_PER_KIND[kind]
+        labeled[f"{kind}_clean"] = generate(terms, kind, n, seed=seed)
+        labeled[f"{kind}_morph"] = generate(terms, kind, n, seed=seed, morph=morph)
+    results = {name: bench_scorer(name, terms, vect, matrix, labeled, k)
+               for name in available_scorers(matrix)}
+    for profile in available_profiles(available_scorers(matrix)):
+        results[f"fusion:{profile}"] = {
+            label: {
+                "suggest_recall_at_k": _recall(
+                    suggest_batch([d.text for d in docs], terms, vect, matrix, k,
+                                  fusion=profile), docs, k),
+                "suggest_indices": _latency(
+                    lambda t: suggest_indices(t, terms, vect, matrix, k, fusion=profile),
+                    [d.text for d in docs]),
+            } for label, docs in labeled.items()}
+    results["meta"] = {
+        "k": k, "seed": seed, "morph": morph, "compact": compact, "lsa": lsa,
+        "vectors": vectors,
+        "python": platform.python_version(), "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparativa TF-IDF vs BM25")
+    parser.add_argument("--kinds", nargs="+", choices=list(LENGTHS), default=["abstract", "paper"])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--morph", type=float, default=0.5)
+    parser.add_argument("--compact", default=None)
+    parser.add_argument("--lsa", help="directorio del índice LSA (cli.py lsa)")
+    parser.add_argument("--vectors", help="directorio de vectores de palabras (cli.py vectors)")
+    parser.add_argument("--output", help="ruta del JSON de resultados")
+    args = parser.parse_args(argv)
+
+    results = run(tuple(args.kinds), args.k, args.seed, args.morph, args.compact, args.lsa,
+                  args.vectors)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
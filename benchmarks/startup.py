@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de arranque en frío.
+
+Lanza intérpretes nuevos y descompone el arranque en:
+import (motor y, opcionalmente, Streamlit), carga del vocabulario,
+índice (ajuste TF-IDF o carga de snapshot) y primera consulta.
+Con --importtime lista además los módulos más lentos de importar.
+
+Uso:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --snapshot index.npz --ui
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+snapshot, ui = sys.argv[1] or None, sys.argv[2] == "1"
+t0 = time.perf_counter()
+if ui:
+    import streamlit
+import concept_store, keyword_engine
+t1 = time.perf_counter()
+terms = concept_store.load_store().column("es")
+t2 = time.perf_counter()
+if snapshot:
+    from compact_index import load_index
+    vect, matrix = load_index(snapshot)
+else:
+    vect, matrix = keyword_engine.prepare_vectorizer(terms)
+t3 = time.perf_counter()
+keyword_engine.suggest_indices("estudio sobre salud dental en escuelas", terms, vect, matrix, 5)
+t4 = time.perf_counter()
+print(json.dumps({"import_s": t1 - t0, "vocabulary_s": t2 - t1,
+                  "index_s": t3 - t2, "first_query_s": t4 - t3, "total_s": t4 - t0}))
+"""
+
+
+def run_child(snapshot=None, ui=False, importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", CHILD, snapshot or "", "1" if ui else "0"]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def slowest_imports(stderr, top=15):
+    # Líneas "import time: <self us> | <acumulado us> | <módulo>"
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[0].isdigit():
+            continue
+        rows.append((int(parts[1]), int(parts[0]), parts[2]))
+    rows.sort(reverse=True)
+    return [{"module": n, "cumulative_ms": c / 1000.0, "self_ms": s / 1000.0}
+            for c, s, n in rows[:top]]
+
+
+def run(runs=5, snapshot=None, ui=False, importtime=False):
+    samples = [run_child(snapshot, ui)[0] for _ in range(runs)]
+    result = {
+        "runs": runs, "snapshot": snapshot, "ui": ui,
+        "median": {key: statistics.median(s[key] for s in samples) for key in samples[0]},
+    }
+    if importtime:
+        result["slowest_imports"] = slowest_imports(run_child(snapshot, ui, True)[1])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de arranque del generador de keywords")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--snapshot", help="snapshot .npz (compact_index.save_index)")
+    parser.add_argument("--ui", action="store_true", help="incluye el import de Streamlit")
+    parser.add_argument("--importtime", action="store_true")
+    parser.add_argument("--output", help="ruta del JSON de resultados")
+    args = parser.parse_args(argv)
+
+    snapshot = os.path.abspath(args.snapshot) if args.snapshot else None
+    text = json.dumps(run(args.runs, snapshot, args.ui, args.importtime), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Generador sintético y determinista de resúmenes.
+
+Mezcla términos del tesauro con texto de relleno hasta una longitud
+controlada y devuelve, para cada documento, los IDs de concepto que se
+plantaron (etiquetas para medir calidad). Con `morph` > 0 las palabras de
+los términos plantados se flexionan ("odontología" -> "odontológica") con
+esa probabilidad, para medir robustez morfológica.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Longitud aproximada en palabras por tipo de documento
+LENGTHS = {
+    "abstract": 250,
+    "paper": 6000,
+    "thesis": 40000,
+}
+
+FILLER = {
+    "es": ("el estudio analiza los resultados de una muestra en la población con "
+           "un enfoque cualitativo y cuantitativo se observó que los datos sugieren "
+           "una relación entre las variables durante el periodo considerado además "
+           "se discuten las implicaciones para futuras investigaciones").split(),
+    "en": ("the study analyses the results of a sample in the population with a "
+           "qualitative and quantitative approach it was observed that the data "
+           "suggest a relationship between the variables during the period in "
+           "addition implications for future research are discussed").split(),
+}
+
+# Sustituciones de sufijo (la primera que encaje); si ninguna encaja se
+# añade el plural de MORPH_PLURAL
+MORPH_SUFFIXES = {
+    "es": (("ología", "ológica"), ("ción", "cional"), ("sión", "siones"),
+           ("ía", "ías"), ("dad", "dades"), ("al", "ales"), ("ico", "icos"),
+           ("o", "os"), ("a", "as"), ("e", "es")),
+    "en": (("ology", "ological"), ("ies", "y"), ("ion", "ional"), ("ics", "ical"),
+           ("y", "ies"), ("al", "ally"), ("s", "")),
+}
+
+MORPH_PLURAL = {"es": "es", "en": "s"}
+
+SyntheticDoc = namedtuple("SyntheticDoc", "text concept_ids")
+
+
+def inflect(word, lang="es"):
+    for old, new in MORPH_SUFFIXES[lang]:
+        if word.endswith(old):
+            return word[:len(word) - len(old)] + new
+    return word + MORPH_PLURAL[lang]
+
+
+def _perturb(term, rng, morph, lang):
+    words = term.split()
+    flips = rng.random(len(words)) < morph
+    return " ".join(inflect(w, lang) if flip and len(w) >= 5 else w
+                    for w, flip in zip(words, flips))
+
+
+def generate(terms, kind="abstract", n=50, seed=0, lang="es", terms_per_100=3, morph=0.0):
+    """`n` documentos de tipo `kind` con ~terms_per_100 términos cada 100 palabras."""
+    rng = np.random.default_rng(seed)
+    filler = FILLER[lang]
+    length = LENGTHS[kind]
+    docs = []
+    for _ in range(n):
+        planted = rng.choice(len(terms), size=max(1, length * terms_per_100 // 100),
+                             replace=False)
+        gaps = rng.multinomial(length, np.ones(len(planted) + 1) / (len(planted) + 1))
+        words = []
+        for gap, cid in zip(gaps, planted):
+            words.extend(filler[j] for j in rng.integers(0, len(filler), size=gap))
+            term = terms[int(cid)]
+            # Sin flexión no se consumen números aleatorios (documentos idénticos)
+            words.append(_perturb(term, rng, morph, lang) if morph else term)
+        words.extend(filler[j] for j in rng.integers(0, len(filler), size=gaps[-1]))
+        docs.append(SyntheticDoc(" ".join(words), frozenset(int(c) for c in planted)))
+    return docs
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+Generador de las tablas de conceptos y de los índices precalculados a
+partir del RDF SKOS del Tesauro UNESCO.
+
+Una sola pasada en streaming (skos.iter_resources: iterparse vaciando el
+árbol tras cada recurso) y, a partir de ella:
+
+• thesaurus_terms_bilingual.py: CONCEPTS alineados por ID, ordenados por
+  etiqueta ES y luego EN. Es la única tabla que define los IDs.
+• thesaurus_terms_es.py / thesaurus_terms_en.py: etiquetas únicas de cada
+  idioma en orden alfabético (no alineadas). Si dos conceptos comparten
+  etiqueta ("cultura oceánica" = ocean literacy / oceanic cultures) esta
+  aparece una vez, así que un idioma puede tener menos términos que la
+  tabla bilingüe; el informe lista esas etiquetas repetidas.
+• thesaurus_hierarchy.npz (hierarchy.py), con las URIs resueltas
+  directamente a ID: las etiquetas repetidas no se confunden.
+• <index-dir>/index.npz (snapshot de compact_index) y
+  <index-dir>/neighbors.npz (grafo de neighbors.py).
+
+Es incremental: <index-dir>/build_manifest.json guarda, para cada salida,
+la huella de sus entradas y el sha256 del fichero escrito. Si ambas
+coinciden la salida ni se reconstruye ni se reescribe, de modo que volver
+a ejecutar el generador sobre el mismo RDF solo cuesta el parseo.
+
+Uso:
+    python build_thesaurus.py --rdf unesco-thesaurus.rdf
+    python build_thesaurus.py --rdf unesco-thesaurus.rdf --compact int8 --force
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from concept_store import LANGS, ConceptStore
+from hierarchy import HIERARCHY_PATH, build_from_resources
+from neighbors import N_NEIGHBORS
+from skos import iter_resources
+from vocabulary import VOCAB_MODULES
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.path.join(ROOT, "thesaurus_index")
+MANIFEST_NAME = "build_manifest.json"
+
+HEADERS = {
+    "bilingual": "Módulo con el vocabulario bilingüe (ES/EN) alineado por índice.\n"
+                 "Generado automáticamente desde el RDF del Tesauro UNESCO.",
+    "es": "Módulo con el vocabulario del Tesauro UNESCO embebido.\n"
+          "Generado automáticamente desde el RDF.",
+    "en": "Módulo con el vocabulario en inglés del Tesauro UNESCO embebido.\n"
+          "Generado automáticamente desde el RDF.",
+}
+
+
+# ------------------------------------------------------------
+#  Huellas y manifiesto
+# ------------------------------------------------------------
+
+def _digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Manifest:
+    """Huella de entradas y sha256 de cada salida de la última ejecución."""
+
+    def __init__(self, path, force=False):
+        self.path = path
+        self.entries = {}
+        if not force and os.path.exists(path):
+            with open(path, encoding="utf-8") as fh:
+                self.entries = json.load(fh)
+
+    def fresh(self, output, inputs):
+        entry = self.entries.get(os.path.abspath(output))
+        return (entry is not None and entry["inputs"] == inputs and os.path.exists(output)
+                and _file_digest(output) == entry["sha256"])
+
+    def record(self, output, inputs):
+        self.entries[os.path.abspath(output)] = {"inputs": inputs,
+                                                 "sha256": _file_digest(output)}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as fh:
+            json.dump(self.entries, fh, indent=1, sort_keys=True)
+
+
+# ------------------------------------------------------------
+#  Lectura del RDF
+# ------------------------------------------------------------
+
+def _clean(label):
+    # Las tablas usan minúsculas y espacios simples ("Water supply" -> "water supply")
+    return " ".join(label.split()).lower()
+
+
+def collect(rdf_path, langs=LANGS):
+    """Una pasada por el RDF: (conceptos ordenados, grupos/colecciones, omitidos).
+
+    Los conceptos sin etiqueta en alguno de `langs` se omiten.
+    """
+    concepts, others, skipped = [], [], 0
+    for res in iter_resources(rdf_path):
+        if res.kind != "concept":
+            others.append(res)
+        elif all(res.labels.get(lang) for lang in langs):
+            concepts.append(res._replace(labels={lang: _clean(res.labels[lang])
+                                                 for lang in langs}))
+        else:
+            skipped += 1
+    concepts.sort(key=lambda res: tuple(res.labels[lang] for lang in langs))
+    return concepts, others, skipped
+
+
+# ------------------------------------------------------------
+#  Tablas de conceptos (módulos Python)
+# ------------------------------------------------------------
+
+def _quote(text):
+    return json.dumps(text, ensure_ascii=False)
+
+
+def render_bilingual(concepts, langs=LANGS):
+    rows = ["    {" + ", ".join(f"'{lang}': {_quote(res.labels[lang])}" for lang in langs) + "},"
+            for res in concepts]
+    return _module(HEADERS["bilingual"], "CONCEPTS", rows)
+
+
+def render_terms(concepts, lang):
+    rows = [f"    {_quote(term)}," for term in sorted({res.labels[lang] for res in concepts})]
+    return _module(HEADERS[lang], "THESAURUS_TERMS", rows)
+
+
+def _module(header, name, rows):
+    return ("# -*- coding: utf-8 -*-\n" f'"""\n{header}\n"""\n\n'
+            f"{name} = [\n" + "\n".join(rows) + "\n]\n")
+
+
+def _write_text(path, text):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+def _npz_target(path, save):
+    # np.savez añade ".npz" si falta: se escribe a un temporal con esa extensión
+    tmp = path[:-len(".npz")] + ".tmp.npz" if path.endswith(".npz") else path + ".tmp.npz"
+    save(tmp)
+    os.replace(tmp, path)
+
+
+# ------------------------------------------------------------
+#  Generación
+# ------------------------------------------------------------
+
+def build(rdf_path, tables_dir=ROOT, index_dir=INDEX_DIR, hierarchy_path=HIERARCHY_PATH,
+          compact=None, char_weight=None, n_neighbors=N_NEIGHBORS, force=False, log=None):
+    """Genera tablas, jerarquía e índices; devuelve un informe (dict)."""
+    log = log or (lambda message: None)
+    started = time.perf_counter()
+    manifest = Manifest(os.path.join(index_dir, MANIFEST_NAME), force)
+    report = {"written": [], "unchanged": []}
+
+    def step(output, inputs, produce):
+        if manifest.fresh(output, inputs):
+            report["unchanged"].append(output)
+            log(f"sin cambios: {output}")
+            return
+        step_started = time.perf_counter()
+        produce(output)
+        manifest.record(output, inputs)
+        report["written"].append(output)
+        log(f"escrito: {output} ({time.perf_counter() - step_started:.2f} s)")
+
+    concepts, others, skipped = collect(rdf_path)
+    report.update(concepts=len(concepts), skipped=skipped,
+                  parse_s=round(time.perf_counter() - started, 3))
+    if not concepts:
+        raise ValueError(f"{rdf_path}: no hay conceptos con etiqueta en {', '.join(LANGS)}")
+    for lang in LANGS:
+        counts = Counter(res.labels[lang] for res in concepts)
+        report[f"shared_labels_{lang}"] = sorted(t for t, c in counts.items() if c > 1)
+
+    # Tablas: la huella es su propio contenido
+    bilingual = render_bilingual(concepts)
+    tables = {VOCAB_MODULES["bilingual"]: bilingual}
+    tables.update({VOCAB_MODULES[lang]: render_terms(concepts, lang) for lang in LANGS})
+    os.makedirs(tables_dir, exist_ok=True)
+    for module, text in tables.items():
+        step(os.path.join(tables_dir, module + ".py"), _digest(text),
+             lambda path, text=text: _write_text(path, text))
+
+    # Jerarquía e índices: dependen de la tabla bilingüe (IDs) y de sus parámetros
+    table_key = _digest(bilingual)
+    store = ConceptStore([res.labels for res in concepts])
+    uri_ids = {res.uri: cid for cid, res in enumerate(concepts)}
+
+    def save_hierarchy(path):
+        hierarchy, report["hierarchy"] = build_from_resources(concepts + others, store, uri_ids)
+        _npz_target(path, hierarchy.save)
+
+    relations = repr([(res.uri, res.broader, res.narrower) for res in concepts]) + repr(others)
+    step(hierarchy_path, _digest(table_key, relations), save_hierarchy)
+
+    os.makedirs(index_dir, exist_ok=True)
+
+    def save_snapshot(path):
+        from compact_index import save_index
+        from keyword_engine import prepare_vectorizer
+
+        vect, matrix = prepare_vectorizer(store.column("es"), compact=compact,
+                                          char_weight=char_weight)
+        _npz_target(path, lambda tmp: save_index(tmp, vect, matrix))
+
+    step(os.path.join(index_dir, "index.npz"), _digest(table_key, compact, char_weight),
+         save_snapshot)
+
+    def save_neighbors(path):
+        from neighbors import build_concept_graph, save_graph
+
+        graph = build_concept_graph(store, LANGS, n_neighbors)
+        _npz_target(path, lambda tmp: save_graph(tmp, graph, LANGS))
+
+    step(os.path.join(index_dir, "neighbors.npz"), _digest(table_key, LANGS, n_neighbors),
+         save_neighbors)
+
+    manifest.save()
+    report["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rdf", required=True, help="RDF/XML SKOS del tesauro")
+    parser.add_argument("--tables-dir", default=ROOT,
+                        help="directorio de los módulos thesaurus_terms_*.py")
+    parser.add_argument("--index-dir", default=INDEX_DIR,
+                        help="directorio del snapshot, el grafo y el manifiesto")
+    parser.add_argument("--hierarchy", default=HIERARCHY_PATH, help="salida de la jerarquía")
+    parser.add_argument("--compact", default=os.environ.get("KEYWORDS_INDEX_MODE") or None,
+                        help="modo del snapshot: float32, uint16 o int8")
+    parser.add_argument("--char-weight", type=float, metavar="W",
+                        help="incluye un índice de n-gramas de caracteres con peso W")
+    parser.add_argument("--neighbors", type=int, default=N_NEIGHBORS,
+                        help="vecinos por concepto en el grafo de relacionados")
+    parser.add_argument("--force", action="store_true",
+                        help="ignora el manifiesto y regenera todas las salidas")
+    args = parser.parse_args(argv)
+
+    report = build(args.rdf, args.tables_dir, args.index_dir, args.hierarchy, args.compact,
+                   args.char_weight, args.neighbors, args.force,
+                   log=lambda message: print(message, file=sys.stderr))
+    print(json.dumps(report, ensure_ascii=False, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
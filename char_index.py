@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de n-gramas de caracteres (espacio de features con hashing).
+
+• CharNgramIndex: n-gramas de caracteres dentro de palabra (char_wb, 3-5)
+  sin tildes, proyectados con HashingVectorizer a `n_features` columnas.
+  No hay vocabulario: la memoria del espacio de features es fija (idf de
+  n_features floats) con independencia del tamaño del tesauro.
+  "odontológico" y "odontología" comparten "odo", "odon", "ntol", ...
+  En la consulta cada n-grama cuenta una vez (presencia): un resumen repite
+  mucho sus palabras funcionales y con frecuencias brutas dominarían.
+• FusedMatrix: matriz de palabras + índice de caracteres. El motor la
+  recibe como `matrix` y similarities() devuelve
+  (1 - weight) · coseno_palabras + weight · coseno_caracteres / máximo,
+  con el coseno de caracteres reescalado a [0, 1] por resumen para que
+  sea comparable con el boost a priori de dominios.
+
+scikit-learn se importa al construir el HashingVectorizer (como en
+prepare_vectorizer); los arrays del índice pueden guardarse en snapshots.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from rowops import scale_to_peak
+
+N_FEATURES = 1 << 18
+NGRAM_RANGE = (3, 5)
+
+
+def _l2_rows(m):
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms).astype(m.dtype) @ m)
+
+
+class CharNgramIndex:
+    """TF-IDF de n-gramas de caracteres con hashing, filas L2."""
+
+    def __init__(self, terms, n_features=N_FEATURES, ngram_range=NGRAM_RANGE,
+                 dtype=np.float32):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.dtype = dtype
+        self._hasher = None
+        counts = self.hasher.transform(terms)
+        counts.sum_duplicates()
+        # idf suavizado como TfidfVectorizer: ln((1 + n) / (1 + df)) + 1
+        df = np.bincount(counts.indices, minlength=n_features)
+        self.idf = (np.log((1.0 + len(terms)) / (1.0 + df)) + 1.0).astype(dtype)
+        self.matrix = self._weight(counts)
+
+    @classmethod
+    def from_arrays(cls, idf, data, indices, indptr, shape, ngram_range):
+        index = object.__new__(cls)
+        index.n_features = len(idf)
+        index.ngram_range = tuple(ngram_range)
+        index.dtype = idf.dtype.type
+        index._hasher = None
+        index.idf = idf
+        index.matrix = sparse.csr_matrix((data, indices, indptr), shape=shape)
+        return index
+
+    @property
+    def hasher(self):
+        if self._hasher is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+
+            self._hasher = HashingVectorizer(
+                analyzer="char_wb", ngram_range=self.ngram_range,
+                n_features=self.n_features, strip_accents="unicode",
+                alternate_sign=False, norm=None, dtype=self.dtype)
+        return self._hasher
+
+    def _weight(self, counts):
+        return _l2_rows(sparse.csr_matrix(counts.multiply(self.idf)))
+
+    def transform(self, texts, binary=False):
+        counts = self.hasher.transform(texts)
+        if binary:
+            counts.sum_duplicates()
+            counts.data[:] = 1
+        return self._weight(counts)
+
+    def similarities(self, summaries):
+        """Coseno (n_resúmenes × n_términos) en el espacio de caracteres."""
+        return (self.transform(summaries, binary=True) @ self.matrix.T).toarray()
+
+    @property
+    def nbytes(self):
+        m = self.matrix
+        return self.idf.nbytes + m.data.nbytes + m.indices.nbytes + m.indptr.nbytes
+
+
+class FusedMatrix:
+    """Matriz de palabras (CSR o CompactMatrix) + CharNgramIndex.
+
+    shape, nnz y los arrays CSR son los de la matriz de palabras, de modo
+    que métricas e informes de memoria siguen funcionando; `char.nbytes`
+    da el coste adicional.
+    """
+
+    def __init__(self, word, char, weight=0.5):
+        if not 0.0 <= weight <= 1.0:
+            raise ValueError(f"El peso de caracteres debe estar en [0, 1]: {weight!r}")
+        self.word = word
+        self.char = char
+        self.weight = weight
+
+    shape = property(lambda self: self.word.shape)
+    nnz = property(lambda self: self.word.nnz)
+    data = property(lambda self: self.word.data)
+    indices = property(lambda self: self.word.indices)
+    indptr = property(lambda self: self.word.indptr)
+
+    def fuse(self, word_sims, char_sims):
+        return (1.0 - self.weight) * word_sims + self.weight * scale_to_peak(char_sims)
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+Línea de comandos del generador de keywords (sin Streamlit).
+
+    python cli.py suggest --text "resumen ..." --k 5
+    python cli.py suggest --file resumen.txt --profile perfil/
+    python cli.py suggest --pdf articulo.pdf --profile perfil/
+    python cli.py index --output index.npz --compact int8
+    python cli.py suggest --snapshot index.npz --text "..."
+    python cli.py idf --corpus resumenes/ --output idf.npz
+    python cli.py suggest --idf idf.npz --text "..."
+    python cli.py lsa --output lsa/ --components 128 --corpus resumenes/
+    python cli.py suggest --lsa lsa/ --scorer tfidf+lsa --text "..."
+    python cli.py ann --lsa lsa/ --nlist 256
+    python cli.py suggest --fusion rrf --text "..."
+    python cli.py suggest --fusion perfil_fusion.json --char-weight 0.5 --text "..."
+    python cli.py suggest --mmr 0.5 --k 5 --text "..."
+    python cli.py neighbors --output vecinos.npz --neighbors 20
+    python cli.py related --graph vecinos.npz "geografía humana"
+    python cli.py hierarchy --rdf unesco-thesaurus.rdf
+    python cli.py suggest --hierarchy-boost 0.2 --text "..."
+    python cli.py suggest --domains health education --text "..."
+    python cli.py vectors --input cc.es.300.vec --output vectores_es/ --lang es
+    python cli.py suggest --vectors vectores_es/ --scorer tfidf+wordvec --text "..."
+    python cli.py translate salud "dental health" --source auto
+    python cli.py translate --input keywords.csv --column 0 --output out.csv
+
+Con --profile se ejecuta la consulta bajo cProfile y tracemalloc y se
+escriben los informes en el directorio indicado (ver profiling.py).
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from compact_index import load_index, save_index
+from concept_store import load_store
+from domains import DOMAINS
+from hierarchy import HIERARCHY_BOOST, HIERARCHY_PATH, require_hierarchy
+from keyword_engine import prepare_vectorizer, suggest_batch
+from mmr import MMR_LAMBDA
+from scorers import ATTACHED, DEFAULT_SCORER, SCORERS, attach_lsa, attach_word_vectors
+
+
+def read_pdf(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        try:
+            from PyPDF2 import PdfReader
+        except ImportError:
+            raise SystemExit("Para leer PDF instala pypdf (o PyPDF2).")
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _read_inputs(args):
+    if args.text:
+        return list(args.text)
+    if args.pdf:
+        return [read_pdf(path) for path in args.pdf]
+    if args.file:
+        out = []
+        for path in args.file:
+            with open(path, encoding="utf-8") as fh:
+                out.append(fh.read())
+        return out
+    return [sys.stdin.read()]
+
+
+def cmd_suggest(args):
+    option = ATTACHED.get(args.scorer)
+    if option and not getattr(args, option):
+        raise SystemExit(f"--scorer {args.scorer} requiere --{option} DIR")
+    summaries = _read_inputs(args)
+    store = load_store()
+    terms = store.column("es")
+    if args.hierarchy_boost:
+        try:
+            require_hierarchy(len(terms))
+        except ValueError as exc:
+            raise SystemExit(f"--hierarchy-boost: {exc}") from None
+    if args.snapshot:
+        vect, matrix = load_index(args.snapshot)
+    else:
+        vect, matrix = prepare_vectorizer(terms, compact=args.compact,
+                                          char_weight=args.char_weight, idf=args.idf)
+    if args.lsa:
+        from lsa import LsaIndex
+
+        attach_lsa(vect, matrix, LsaIndex.load(args.lsa, nprobe=args.nprobe), args.lsa_weight)
+    if args.vectors:
+        from word_vectors import WordVectors
+
+        attach_word_vectors(vect, matrix, WordVectors.load(args.vectors), terms,
+                            args.vectors_weight)
+
+    if args.profile:
+        from profiling import profile_suggest
+
+        results, paths = profile_suggest(summaries, terms, vect, matrix, args.k, args.profile,
+                                         fuzzy=args.fuzzy, scorer=args.scorer,
+                                         fusion=args.fusion, mmr=args.mmr,
+                                         hierarchy_boost=args.hierarchy_boost,
+                                         domains=args.domains)
+        for name, path in paths.items():
+            print(f"{name}: {path}", file=sys.stderr)
+    else:
+        results = suggest_batch(summaries, terms, vect, matrix, args.k, fuzzy=args.fuzzy,
+                                scorer=args.scorer, fusion=args.fusion, mmr=args.mmr,
+                                hierarchy_boost=args.hierarchy_boost, domains=args.domains)
+
+    for ids in results:
+        keywords = [{"es": store.term("es", cid), "en": store.term("en", cid)} for cid in ids]
+        print(json.dumps(keywords, ensure_ascii=False))
+    return 0
+
+
+def cmd_index(args):
+    terms = load_store().column("es")
+    vect, matrix = prepare_vectorizer(terms, compact=args.compact, char_weight=args.char_weight)
+    save_index(args.output, vect, matrix)
+    print(f"Snapshot escrito en {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_lsa(args):
+    from corpus_idf import iter_corpus
+    from lsa import fit_lsa
+
+    terms = load_store().column("es")
+    vect, matrix = prepare_vectorizer(terms, compact=args.compact)
+    corpus = iter_corpus(args.corpus) if args.corpus else None
+    index = fit_lsa(vect, matrix, args.components, corpus, args.max_docs)
+    index.save(args.output)
+    print(f"LSA de {index.meta['n_components']} componentes "
+          f"(varianza explicada {index.meta['explained_variance']:.2f}) en {args.output}",
+          file=sys.stderr)
+    return 0
+
+
+def cmd_ann(args):
+    from ann import build_ivf
+    from lsa import LsaIndex
+
+    index = LsaIndex.load(args.lsa, mmap=False)
+    ivf = build_ivf(index.embeddings, args.nlist, args.iters, sample=args.sample)
+    ivf.save(os.path.join(args.lsa, "ivf"))
+    print(f"IVF con {ivf.meta['nlist']} celdas sobre {ivf.meta['n']} conceptos "
+          f"en {os.path.join(args.lsa, 'ivf')}", file=sys.stderr)
+    return 0
+
+
+def cmd_neighbors(args):
+    from neighbors import build_concept_graph, graph_nbytes, save_graph
+
+    graph = build_concept_graph(load_store(), args.langs, args.neighbors, args.block_rows,
+                                args.chunk_cols)
+    save_graph(args.output, graph, args.langs)
+    print(f"Grafo de {graph.shape[0]} conceptos ({graph.nnz} aristas, "
+          f"{graph_nbytes(graph) / 1e6:.1f} MB) en {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_related(args):
+    from neighbors import load_graph, related
+    from textnorm import normalize_key
+
+    store = load_store()
+    graph = load_graph(args.graph)
+    for term in args.terms:
+        found = store.column(args.lang).lookup([normalize_key(term)])
+        if not len(found):
+            print(json.dumps({"term": term, "error": "término no encontrado"}, ensure_ascii=False))
+            continue
+        ids, scores = related(graph, int(found[0]), args.limit)
+        print(json.dumps({"term": term, "related": [
+            {"es": store.term("es", cid), "en": store.term("en", cid), "score": round(float(s), 3)}
+            for cid, s in zip(ids.tolist(), scores)]}, ensure_ascii=False))
+    return 0
+
+
+def cmd_hierarchy(args):
+    from hierarchy import build_from_resources
+    from skos import iter_resources
+
+    hierarchy, report = build_from_resources(iter_resources(args.rdf), load_store())
+    hierarchy.save(args.output)
+    print(f"Jerarquía en {args.output}: {json.dumps(report)}", file=sys.stderr)
+    return 0
+
+
+def cmd_vectors(args):
+    from word_vectors import ingest_vec
+
+    vectors = ingest_vec(args.input, args.output, args.max_words, args.lang)
+    print(f"{len(vectors)} vectores de dimensión {vectors.dim} en {args.output}",
+          file=sys.stderr)
+    return 0
+
+
+def cmd_idf(args):
+    from corpus_idf import CorpusIDF, iter_corpus
+
+    corpus = CorpusIDF.load(args.update) if args.update else CorpusIDF(args.features)
+    before = corpus.n_docs
+    corpus.partial_fit(iter_corpus(args.corpus), args.batch_size)
+    output = args.output or args.update
+    corpus.save(output)
+    print(f"{corpus.n_docs - before} documentos añadidos ({corpus.n_docs} en total), "
+          f"idf escrito en {output}", file=sys.stderr)
+    return 0
+
+
+def cmd_translate(args):
+    from translate import translate_file
+
+    fuzzy = not args.no_fuzzy
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.input:
+            with open(args.input, encoding="utf-8", newline="") as src:
+                count = translate_file(src, out, args.source, args.column, fuzzy)
+        else:
+            count = translate_file(args.keywords or sys.stdin, out, args.source, None, fuzzy)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{count} keywords traducidas", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generador de keywords ES/EN (Tesauro UNESCO)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("suggest", help="sugiere keywords para uno o más resúmenes")
+    source = p.add_mutually_exclusive_group()
+    source.add_argument("--text", nargs="+", help="resumen(es) en línea")
+    source.add_argument("--file", nargs="+", help="ficheros de texto UTF-8")
+    source.add_argument("--pdf", nargs="+", help="ficheros PDF")
+    p.add_argument("--k", type=int, default=3)
+    p.add_argument("--compact", default=os.environ.get("KEYWORDS_INDEX_MODE") or None)
+    p.add_argument("--char-weight", type=float, metavar="W",
+                   help="fusiona un índice de n-gramas de caracteres con peso W (0-1)")
+    p.add_argument("--snapshot", help="snapshot .npz creado con 'index'")
+    p.add_argument("--idf", help="idf de corpus de fondo (.npz creado con 'idf')")
+    p.add_argument("--fuzzy", action="store_true",
+                   help="corrige erratas (con KEYWORDS_LEXICON) y tildes omitidas antes de "
+                        "buscar términos")
+    p.add_argument("--scorer", choices=list(SCORERS), default=DEFAULT_SCORER,
+                   help="puntuación del fallback tras las coincidencias exactas")
+    p.add_argument("--fusion", metavar="PERFIL",
+                   help="fusiona exactas y scorers: 'rrf', 'linear' o un perfil .json")
+    p.add_argument("--mmr", type=float, nargs="?", const=MMR_LAMBDA, metavar="LAMBDA",
+                   help=f"diversifica el top-k con MMR (λ, por defecto {MMR_LAMBDA})")
+    p.add_argument("--hierarchy-boost", type=float, nargs="?", const=HIERARCHY_BOOST,
+                   metavar="W", help="boost a genéricos/específicos de las coincidencias exactas")
+    p.add_argument("--domains", nargs="+", choices=list(DOMAINS), metavar="DOMINIO",
+                   help=f"solo conceptos de estos dominios ({', '.join(DOMAINS)})")
+    p.add_argument("--lsa", metavar="DIR", help="índice LSA creado con 'lsa' (scorers lsa)")
+    p.add_argument("--lsa-weight", type=float, default=0.3,
+                   help="peso del coseno LSA en el scorer tfidf+lsa")
+    p.add_argument("--nprobe", type=int, help="celdas IVF visitadas por consulta (si hay ivf/)")
+    p.add_argument("--vectors", metavar="DIR",
+                   help="vectores de palabras creados con 'vectors' (scorers wordvec)")
+    p.add_argument("--vectors-weight", type=float, default=0.3,
+                   help="peso del coseno de vectores en el scorer tfidf+wordvec")
+    p.add_argument("--profile", metavar="DIR",
+                   help="perfila la consulta y escribe los informes en DIR")
+    p.set_defaults(func=cmd_suggest)
+
+    p = sub.add_parser("index", help="construye y guarda un snapshot del índice")
+    p.add_argument("--output", required=True)
+    p.add_argument("--compact", default=os.environ.get("KEYWORDS_INDEX_MODE") or None)
+    p.add_argument("--char-weight", type=float, metavar="W",
+                   help="fusiona un índice de n-gramas de caracteres con peso W (0-1)")
+    p.set_defaults(func=cmd_index)
+
+    p = sub.add_parser("lsa", help="ajusta y guarda un índice semántico latente (SVD)")
+    p.add_argument("--output", required=True, help="directorio de salida")
+    p.add_argument("--components", type=int, default=128)
+    p.add_argument("--corpus", nargs="+", help="corpus de fondo (como en 'idf')")
+    p.add_argument("--max-docs", type=int, default=20000)
+    p.add_argument("--compact", default=os.environ.get("KEYWORDS_INDEX_MODE") or None)
+    p.set_defaults(func=cmd_lsa)
+
+    p = sub.add_parser("ann", help="construye un índice IVF sobre los embeddings LSA")
+    p.add_argument("--lsa", required=True, help="directorio del índice LSA")
+    p.add_argument("--nlist", type=int, help="número de celdas (por defecto 4·√n)")
+    p.add_argument("--iters", type=int, default=20)
+    p.add_argument("--sample", type=int, help="vectores de entrenamiento del k-means")
+    p.set_defaults(func=cmd_ann)
+
+    p = sub.add_parser("neighbors", help="grafo de conceptos relacionados (top-N, CSR)")
+    p.add_argument("--output", required=True, help="fichero .npz de salida")
+    p.add_argument("--neighbors", type=int, default=20, help="vecinos por concepto")
+    p.add_argument("--langs", nargs="+", default=["es", "en"], choices=["es", "en"])
+    p.add_argument("--block-rows", type=int, default=1024)
+    p.add_argument("--chunk-cols", type=int, default=65536)
+    p.set_defaults(func=cmd_neighbors)
+
+    p = sub.add_parser("related", help="conceptos relacionados de uno o más términos")
+    p.add_argument("terms", nargs="+")
+    p.add_argument("--graph", required=True, help="grafo creado con 'neighbors'")
+    p.add_argument("--lang", choices=["es", "en"], default="es")
+    p.add_argument("--limit", type=int, default=10)
+    p.set_defaults(func=cmd_related)
+
+    p = sub.add_parser("hierarchy", help="importa broader/narrower y microtesauros del RDF SKOS")
+    p.add_argument("--rdf", required=True, help="RDF/XML SKOS del tesauro")
+    p.add_argument("--output", default=HIERARCHY_PATH)
+    p.set_defaults(func=cmd_hierarchy)
+
+    p = sub.add_parser("vectors", help="convierte un .vec (fastText/word2vec) a matriz mmap")
+    p.add_argument("--input", required=True, help="fichero .vec de texto")
+    p.add_argument("--output", required=True, help="directorio de salida")
+    p.add_argument("--max-words", type=int, help="solo las N primeras (más frecuentes)")
+    p.add_argument("--lang", choices=["es", "en"], help="idioma de los vectores (informativo)")
+    p.set_defaults(func=cmd_vectors)
+
+    p = sub.add_parser("idf", help="acumula el idf de un corpus de resúmenes (hashing)")
+    p.add_argument("--corpus", nargs="+", required=True,
+                   help="directorios de .txt o ficheros con un documento por línea")
+    target = p.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", help="nuevo fichero .npz")
+    target.add_argument("--update", help="añade los documentos a un .npz existente")
+    p.add_argument("--features", type=int, default=1 << 20, help="columnas del espacio de hashing")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.set_defaults(func=cmd_idf)
+
+    p = sub.add_parser("translate", help="traduce keywords ES <-> EN (CSV por stdout)")
+    p.add_argument("keywords", nargs="*", help="keywords en línea (si no, --input o stdin)")
+    p.add_argument("--input", help="fichero con una keyword por línea o CSV con --column")
+    p.add_argument("--column", type=int, help="columna (0-based) del CSV de entrada")
+    p.add_argument("--output", help="CSV de salida (por defecto stdout)")
+    p.add_argument("--source", choices=("auto", "es", "en"), default="auto")
+    p.add_argument("--no-fuzzy", action="store_true", help="solo coincidencias exactas")
+    p.set_defaults(func=cmd_translate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
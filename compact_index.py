@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+Almacenamiento compacto del índice TF-IDF.
+
+• CompactMatrix: matriz término×feature con pesos float32 o cuantizados
+  (uint16 / int8) e índices int32.
+• StringPool: cadenas deduplicadas en un único buffer UTF-8.
+• memory_report(): bytes ocupados por componente del índice.
+• check_recall(): equivalencia de resultados frente al índice float64.
+• save_index() / load_index(): snapshot .npz del vectorizador y la matriz,
+  para arrancar sin reajustar el TF-IDF, sin importar el vocabulario y sin
+  importar scikit-learn (SnapshotVectorizer replica su transform()). Si
+  incluye índice de caracteres, sklearn se importa en la primera consulta.
+
+Uso:  python compact_index.py --mode int8 --k 5
+"""
+
+import re
+import sys
+
+import numpy as np
+from scipy import sparse
+
+COMPACT_MODES = ("float64", "float32", "uint16", "int8")
+
+
+class StringPool:
+    """Lista inmutable de cadenas guardada como buffer UTF-8 + offsets int32.
+
+    Las cadenas repetidas se almacenan una sola vez; `refs[i]` apunta a la
+    entrada del pool que corresponde a la posición i.
+    """
+
+    def __init__(self, strings):
+        seen = {}
+        chunks = []
+        offsets = [0]
+        refs = np.empty(len(strings), dtype=np.int32)
+        for i, s in enumerate(strings):
+            j = seen.get(s)
+            if j is None:
+                j = seen[s] = len(chunks)
+                raw = s.encode("utf-8")
+                chunks.append(raw)
+                offsets.append(offsets[-1] + len(raw))
+            refs[i] = j
+        self.buffer = b"".join(chunks)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        self.refs = refs
+
+    def view(self, start, stop):
+        """Sub-lista [start, stop) que comparte buffer y offsets."""
+        sub = object.__new__(StringPool)
+        sub.buffer = self.buffer
+        sub.offsets = self.offsets
+        sub.refs = self.refs[start:stop]
+        return sub
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __getitem__(self, i):
+        j = self.refs[i]
+        return self.buffer[self.offsets[j]:self.offsets[j + 1]].decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self.refs)):
+            yield self[i]
+
+    @property
+    def unique_count(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        return len(self.buffer) + self.offsets.nbytes + self.refs.nbytes
+
+
+class CompactMatrix:
+    """Matriz CSR con pesos en `mode` e índices int32.
+
+    Las filas TF-IDF están normalizadas (L2) y son no negativas, así que la
+    cuantización usa una única escala global: peso ≈ data * scale.
+    """
+
+    def __init__(self, matrix, mode="float32"):
+        if mode not in COMPACT_MODES:
+            raise ValueError(f"Modo compacto desconocido: {mode!r}")
+        m = sparse.csr_matrix(matrix)
+        m.sort_indices()
+        self.mode = mode
+        self.shape = m.shape
+        self.indices = m.indices.astype(np.int32)
+        self.indptr = m.indptr.astype(np.int32)
+        if mode.startswith("float"):
+            self.scale = 1.0
+            self.data = m.data.astype(mode)
+        else:
+            top = np.iinfo(mode).max
+            peak = float(np.abs(m.data).max()) if m.nnz else 0.0
+            self.scale = peak / top if peak else 1.0
+            self.data = np.rint(m.data / self.scale).astype(mode)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    def to_csr(self, dtype=np.float32):
+        data = self.data.astype(dtype) * dtype(self.scale)
+        return sparse.csr_matrix((data, self.indices, self.indptr), shape=self.shape)
+
+    def similarities(self, queries):
+        """Coseno entre consultas TF-IDF (n_q × features) y los términos."""
+        m = sparse.csr_matrix((self.data, self.indices, self.indptr),
+                              shape=self.shape, copy=False)
+        sims = (m @ queries.T).T
+        sims = sims.toarray() if sparse.issparse(sims) else np.asarray(sims)
+        if self.scale != 1.0:
+            sims *= self.scale
+        return sims
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.indices.nbytes + self.indptr.nbytes
+
+
+# ------------------------------------------------------------
+#  Snapshot del índice
+# ------------------------------------------------------------
+
+def save_index(path, vect, matrix):
+    """Guarda vocabulario, idf y matriz (densa de scipy o CompactMatrix)."""
+    if not hasattr(vect, "vocabulary_"):
+        # HashedTfidfVectorizer: basta con el .npz del CorpusIDF
+        raise ValueError("El índice con idf de corpus no usa snapshot; reutiliza el fichero de idf")
+    extra = {}
+    char = getattr(matrix, "char", None)
+    if char is not None:
+        # FusedMatrix (char_index.py): se añaden los arrays del índice de caracteres
+        extra = dict(char_weight=np.array(matrix.weight), char_idf=char.idf,
+                     char_data=char.matrix.data, char_indices=char.matrix.indices,
+                     char_indptr=char.matrix.indptr,
+                     char_shape=np.array(char.matrix.shape, dtype=np.int64),
+                     char_ngram_range=np.array(char.ngram_range, dtype=np.int64))
+        matrix = matrix.word
+    features = [None] * len(vect.vocabulary_)
+    for feature, col in vect.vocabulary_.items():
+        features[col] = feature
+    pool = StringPool(features)
+    compact = isinstance(matrix, CompactMatrix)
+    np.savez(
+        path,
+        mode=np.array(matrix.mode if compact else matrix.dtype.name),
+        scale=np.array(matrix.scale if compact else 1.0),
+        shape=np.array(matrix.shape, dtype=np.int64),
+        data=matrix.data,
+        indices=matrix.indices,
+        indptr=matrix.indptr,
+        idf=vect.idf_,
+        ngram_range=np.array(vect.ngram_range, dtype=np.int64),
+        features=np.frombuffer(pool.buffer, dtype=np.uint8),
+        feature_offsets=pool.offsets,
+        **extra,
+    )
+
+
+class SnapshotVectorizer:
+    """transform() equivalente al TfidfVectorizer por defecto ya ajustado.
+
+    Minúsculas, token_pattern (?u)\b\w\w+\b, n-gramas de palabras,
+    tf bruto × idf y normalización L2.
+    """
+
+    token_re = re.compile(r"(?u)\b\w\w+\b")
+
+    def __init__(self, vocabulary, idf, ngram_range=(1, 1), dtype=np.float64):
+        self.vocabulary_ = vocabulary
+        self.idf_ = np.asarray(idf)
+        self.ngram_range = tuple(ngram_range)
+        self.dtype = dtype
+
+    def _features(self, text):
+        tokens = self.token_re.findall(text.lower())
+        min_n, max_n = self.ngram_range
+        for n in range(min_n, max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                yield " ".join(tokens[i:i + n])
+
+    def transform(self, texts):
+        vocabulary = self.vocabulary_
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts = {}
+            for feature in self._features(text):
+                col = vocabulary.get(feature)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+            cols = sorted(counts)
+            indices.extend(cols)
+            data.extend(counts[c] for c in cols)
+            indptr.append(len(indices))
+        indices = np.asarray(indices, dtype=np.int32)
+        values = np.asarray(data, dtype=self.dtype) * self.idf_[indices]
+        indptr = np.asarray(indptr, dtype=np.int32)
+        # Normalización L2 por fila
+        rows = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(texts)))
+        if len(values):
+            values /= norms[rows].astype(self.dtype)
+        return sparse.csr_matrix((values, indices, indptr),
+                                 shape=(len(texts), len(self.idf_)))
+
+
+def load_index(path):
+    """Reconstruye (vect, matrix) desde un snapshot de save_index()."""
+    with np.load(path, allow_pickle=False) as snap:
+        mode = str(snap["mode"])
+        buffer = snap["features"].tobytes()
+        offsets = snap["feature_offsets"]
+        vocabulary = {buffer[offsets[i]:offsets[i + 1]].decode("utf-8"): i
+                      for i in range(len(offsets) - 1)}
+        dtype = np.float64 if mode == "float64" else np.float32
+        vect = SnapshotVectorizer(vocabulary, snap["idf"].astype(dtype),
+                                  tuple(int(n) for n in snap["ngram_range"]), dtype)
+        shape = tuple(int(n) for n in snap["shape"])
+        parts = (snap["data"], snap["indices"], snap["indptr"])
+        if mode == "float64":
+            matrix = sparse.csr_matrix(parts, shape=shape)
+        else:
+            matrix = object.__new__(CompactMatrix)
+            matrix.mode, matrix.shape, matrix.scale = mode, shape, float(snap["scale"])
+            matrix.data, matrix.indices, matrix.indptr = parts
+        if "char_idf" in snap:
+            from char_index import CharNgramIndex, FusedMatrix
+
+            char = CharNgramIndex.from_arrays(
+                snap["char_idf"], snap["char_data"], snap["char_indices"],
+                snap["char_indptr"], tuple(int(n) for n in snap["char_shape"]),
+                tuple(int(n) for n in snap["char_ngram_range"]))
+            matrix = FusedMatrix(matrix, char, float(snap["char_weight"]))
+    return vect, matrix
+
+
+# ------------------------------------------------------------
+#  Informe de memoria
+# ------------------------------------------------------------
+
+def _strings_nbytes(strings):
+    if isinstance(strings, StringPool):
+        return strings.nbytes
+    return sys.getsizeof(strings) + sum(sys.getsizeof(s) for s in strings)
+
+
+def _dict_nbytes(d):
+    return sys.getsizeof(d) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in d.items())
+
+
+def memory_report(vect, matrix, terms=None):
+    """Bytes por componente: pesos, índices, vocabulario, idf y términos."""
+    report = {
+        "matrix.data": matrix.data.nbytes,
+        "matrix.indices": matrix.indices.nbytes,
+        "matrix.indptr": matrix.indptr.nbytes,
+    }
+    if hasattr(vect, "vocabulary_"):
+        report["vectorizer.vocabulary"] = _dict_nbytes(vect.vocabulary_)
+    report["vectorizer.idf"] = vect.idf_.nbytes
+    char = getattr(matrix, "char", None)
+    if char is not None:
+        report["char_index"] = char.nbytes
+    stop_words = getattr(vect, "stop_words_", None)
+    if stop_words:
+        report["vectorizer.stop_words"] = sys.getsizeof(stop_words) + sum(
+            sys.getsizeof(s) for s in stop_words)
+    if terms is not None:
+        report["terms"] = _strings_nbytes(terms)
+    report["total"] = sum(report.values())
+    return report
+
+
+# ------------------------------------------------------------
+#  Equivalencia de resultados frente a float64
+# ------------------------------------------------------------
+
+def sample_summaries(terms, n=200, per_summary=4, seed=0):
+    """Resúmenes sintéticos: términos del tesauro mezclados con relleno."""
+    rng = np.random.default_rng(seed)
+    filler = ["el", "estudio", "analiza", "de", "la", "en", "con", "resultados", "y"]
+    out = []
+    for _ in range(n):
+        picks = rng.choice(len(terms), size=per_summary, replace=False)
+        words = []
+        for p in picks:
+            words.extend(rng.choice(filler, size=3))
+            words.append(terms[int(p)])
+        out.append(" ".join(words))
+    return out
+
+
+def check_recall(terms, summaries, mode, k=5):
+    """Recall@k medio del modo compacto respecto al índice float64."""
+    from concept_store import as_column
+    from keyword_engine import prepare_vectorizer, suggest_indices
+
+    terms = as_column(terms)
+    base_vect, base_matrix = prepare_vectorizer(terms)
+    vect, matrix = prepare_vectorizer(terms, compact=mode)
+    hits = 0
+    for summary in summaries:
+        expected = set(suggest_indices(summary, terms, base_vect, base_matrix, k))
+        got = set(suggest_indices(summary, terms, vect, matrix, k))
+        hits += len(expected & got) / max(len(expected), 1)
+    return hits / max(len(summaries), 1)
+
+
+def main(argv=None):
+    import argparse
+
+    from thesaurus_terms_bilingual import CONCEPTS
+    from keyword_engine import prepare_vectorizer
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=COMPACT_MODES[1:], default="float32")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--min-recall", type=float, default=0.99)
+    args = parser.parse_args(argv)
+
+    terms = [c["es"] for c in CONCEPTS]
+    for label, mode, strings in (("float64", None, terms),
+                                 (args.mode, args.mode, StringPool(terms))):
+        vect, matrix = prepare_vectorizer(terms, compact=mode)
+        print(f"[{label}]")
+        for name, size in memory_report(vect, matrix, strings).items():
+            print(f"  {name:<24} {size / 1024:10.1f} KiB")
+
+    recall = check_recall(terms, sample_summaries(terms, args.samples), args.mode, args.k)
+    print(f"recall@{args.k} vs float64: {recall:.4f}")
+    return 0 if recall >= args.min_recall else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Tabla columnar de conceptos del tesauro.
+
+• Cada concepto tiene un ID entero (su posición en CONCEPTS).
+• Los términos de todos los idiomas comparten un StringPool deduplicado.
+• Por idioma se precalculan claves normalizadas y TermMetadata (número de
+  palabras, longitud, dominios y peso a priori), de modo que el motor
+  trabaja solo con IDs y arrays.
+• meta.facets es la máscara de dominios del concepto (la misma en todos los
+  idiomas): base del filtro `domains=` del motor.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from compact_index import StringPool
+from domains import concept_facets, domain_flags, prior_flags, prior_weights
+from textnorm import normalize_key
+
+LANGS = ("es", "en")
+
+
+class TermMetadata:
+    """Arrays por término usados en el ranking (indexados por ID)."""
+
+    def __init__(self, terms, keys):
+        n = len(keys)
+        self.word_count = np.fromiter(
+            (len(key.split()) for key in keys), dtype=np.int16, count=n)
+        self.char_length = np.fromiter(
+            (len(t) for t in terms), dtype=np.int16, count=n)
+        self.domain_flags = domain_flags(terms)
+        self.prior = prior_weights(prior_flags(terms))
+        # Facetas del concepto; ConceptStore las sustituye por las de todos los idiomas
+        self.facets = self.domain_flags
+
+    @property
+    def nbytes(self):
+        return (self.word_count.nbytes + self.char_length.nbytes
+                + self.domain_flags.nbytes + self.prior.nbytes)
+
+
+class TermColumn:
+    """Términos de un idioma indexados por ID de concepto.
+
+    Se comporta como una secuencia de str (len, [], iteración) para que el
+    vectorizador y la UI puedan usarla igual que la antigua lista.
+    """
+
+    def __init__(self, lang, pool):
+        self.lang = lang
+        self.pool = pool
+        terms = list(pool)
+        keys = [normalize_key(t) for t in terms]
+        self.meta = TermMetadata(terms, keys)
+        # clave normalizada -> ID (o tupla de IDs si la clave se repite)
+        index = {}
+        for cid, key in enumerate(keys):
+            prev = index.get(key)
+            if prev is None:
+                index[key] = cid
+            else:
+                index[key] = (prev if isinstance(prev, tuple) else (prev,)) + (cid,)
+        self.key_index = index
+        # Palabras de otros idiomas que el corrector no debe tratar como erratas
+        self.known_words = frozenset()
+        self._corrector = None
+
+    @property
+    def corrector(self):
+        # Índice de erratas (fuzzy.TermCorrector), construido al primer uso
+        if self._corrector is None:
+            from fuzzy import TermCorrector, load_lexicon
+
+            self._corrector = TermCorrector(self, known=self.known_words,
+                                            lexicon=load_lexicon())
+        return self._corrector
+
+    def __len__(self):
+        return len(self.pool)
+
+    def __getitem__(self, cid):
+        return self.pool[cid]
+
+    def __iter__(self):
+        return iter(self.pool)
+
+    def lookup(self, keys):
+        """IDs (ordenados, sin repetir) cuyos términos coinciden con `keys`."""
+        index = self.key_index
+        found = []
+        for key in keys:
+            hit = index.get(key)
+            if hit is None:
+                continue
+            if isinstance(hit, tuple):
+                found.extend(hit)
+            else:
+                found.append(hit)
+        return np.unique(np.asarray(found, dtype=np.int32))
+
+
+class ConceptStore:
+    """Conceptos alineados por ID con una TermColumn por idioma."""
+
+    def __init__(self, concepts, langs=LANGS, hierarchy=None):
+        self.size = len(concepts)
+        self.ids = np.arange(self.size, dtype=np.int32)
+        pool = StringPool([c[lang] for lang in langs for c in concepts])
+        self.pool = pool
+        self.columns = {
+            lang: TermColumn(lang, pool.view(i * self.size, (i + 1) * self.size))
+            for i, lang in enumerate(langs)
+        }
+        tokens = {lang: frozenset(tok for key in column.key_index for tok in key.split())
+                  for lang, column in self.columns.items()}
+        for lang, column in self.columns.items():
+            column.known_words = frozenset().union(
+                *(words for other, words in tokens.items() if other != lang))
+        if hierarchy is not None and len(hierarchy) != self.size:
+            hierarchy = None
+        self.facets = concept_facets(list(self.columns.values()), hierarchy)
+        for column in self.columns.values():
+            column.meta.facets = self.facets
+
+    def __len__(self):
+        return self.size
+
+    def column(self, lang):
+        return self.columns[lang]
+
+    def term(self, lang, cid):
+        return self.columns[lang][cid]
+
+
+def as_column(terms):
+    # Compatibilidad: convierte una lista de str en TermColumn (coste O(n))
+    if isinstance(terms, TermColumn):
+        return terms
+    return TermColumn(None, StringPool(list(terms)))
+
+
+@lru_cache(maxsize=None)
+def load_store():
+    from hierarchy import load_hierarchy
+    from vocabulary import load_concepts
+
+    return ConceptStore(load_concepts(), hierarchy=load_hierarchy())
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+IDF a partir de un corpus de fondo (resúmenes locales) con hashing.
+
+El IDF que calcula TfidfVectorizer sobre los propios términos del tesauro
+(textos de 1-4 palabras) da pesos poco representativos. Aquí:
+
+• CorpusIDF: frecuencias de documento en un espacio de `n_features`
+  columnas (HashingVectorizer, (1,2)-gramas de palabras). La memoria es
+  fija (un contador uint32 por columna) sea cual sea el corpus, y
+  partial_fit() acumula lotes nuevos sin reprocesar los anteriores.
+• HashedTfidfVectorizer: transform() compatible con el motor (tf × idf del
+  corpus, filas L2), usado tanto para la matriz de términos como para las
+  consultas. reweight() recalcula la matriz de términos tras un
+  partial_fit() sin volver a tokenizar.
+
+Uso:
+    python cli.py idf --corpus resumenes/ --output idf.npz
+    python cli.py idf --corpus nuevos.txt --update idf.npz
+    python cli.py suggest --idf idf.npz --text "..."
+"""
+
+import os
+
+import numpy as np
+from scipy import sparse
+
+N_FEATURES = 1 << 20
+BATCH_SIZE = 1000
+
+
+def _hasher(n_features, ngram_range, binary):
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(n_features=n_features, ngram_range=tuple(ngram_range),
+                             alternate_sign=False, norm=None, binary=binary)
+
+
+def iter_corpus(paths):
+    """Documentos de `paths`: ficheros .txt de un directorio (uno por
+    documento) o ficheros de texto con un documento por línea."""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".txt"):
+                    with open(os.path.join(path, name), encoding="utf-8") as fh:
+                        yield fh.read()
+        else:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        yield line
+
+
+def _batches(docs, size):
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CorpusIDF:
+    """Frecuencias de documento acumuladas por lotes en un espacio con hashing."""
+
+    def __init__(self, n_features=N_FEATURES, ngram_range=(1, 2)):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.df = np.zeros(n_features, dtype=np.uint32)
+        self.n_docs = 0
+        self._binary = None
+
+    def partial_fit(self, docs, batch_size=BATCH_SIZE):
+        """Acumula las frecuencias de documento de `docs` (iterable, en streaming)."""
+        if self._binary is None:
+            self._binary = _hasher(self.n_features, self.ngram_range, binary=True)
+        for batch in _batches(docs, batch_size):
+            counts = self._binary.transform(batch)
+            counts.sum_duplicates()
+            self.df += np.bincount(counts.indices, minlength=self.n_features).astype(np.uint32)
+            self.n_docs += len(batch)
+        return self
+
+    @property
+    def idf(self):
+        # Suavizado como TfidfVectorizer: ln((1 + n) / (1 + df)) + 1
+        return np.log((1.0 + self.n_docs) / (1.0 + self.df)) + 1.0
+
+    def save(self, path):
+        np.savez(path, df=self.df, n_docs=np.array(self.n_docs, dtype=np.int64),
+                 ngram_range=np.array(self.ngram_range, dtype=np.int64))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as snap:
+            corpus = cls(len(snap["df"]), tuple(int(n) for n in snap["ngram_range"]))
+            corpus.df = snap["df"].astype(np.uint32)
+            corpus.n_docs = int(snap["n_docs"])
+        return corpus
+
+
+class HashedTfidfVectorizer:
+    """tf × idf del corpus de fondo sobre features con hashing, filas L2."""
+
+    def __init__(self, corpus, dtype=np.float64):
+        self.corpus = corpus
+        self.dtype = dtype
+        self.ngram_range = corpus.ngram_range
+        self._counts = _hasher(corpus.n_features, corpus.ngram_range, binary=False)
+        self.idf_ = corpus.idf.astype(dtype)
+        self.term_counts = None
+
+    def _weight(self, counts):
+        weighted = sparse.csr_matrix(counts.multiply(self.idf_), dtype=self.dtype)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ weighted)
+
+    def transform(self, texts):
+        return self._weight(self._counts.transform(texts))
+
+    def fit_transform(self, terms):
+        # Se guardan los conteos de los términos para reweight()
+        self.term_counts = self._counts.transform(terms)
+        return self._weight(self.term_counts)
+
+    def reweight(self):
+        """Matriz de términos con el idf actual del corpus (tras partial_fit)."""
+        self.idf_ = self.corpus.idf.astype(self.dtype)
+        return self._weight(self.term_counts)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Dominios temáticos de los términos y su peso a priori en el ranking.
+
+Cada término recibe una máscara de bits (uint8) con los dominios a los que
+pertenece: domain_flags() casa los prefijos de cada dominio al inicio de
+palabra ("dent" marca "dental" pero no "student" ni "accidents").
+
+El peso a priori se calcula aparte (prior_flags()) con la búsqueda como
+subcadena con la que se ajustó el ranking original, de modo que las
+sugerencias sin filtro no cambian.
+
+Las mismas máscaras sirven de facetas: concept_facets() combina las de
+todos los idiomas de un concepto (y, si existe, los dominios del RDF vía
+hierarchy.py) y domain_mask() da el filtro `domains=` del motor con una
+sola operación vectorizada. Solo el dominio de salud tiene peso a priori:
+el resto de bits no altera el ranking si no se filtra.
+"""
+
+import re
+
+import numpy as np
+
+# Prefijos comunes de salud en ambos idiomas
+HEALTH_KEYWORDS = [
+    "salud", "dental", "odont", "clínica", "médico", "paciente", "enfermedad",
+    "periodontal", "pulpar", "endo-periodontal", "oncológico", "radiológico",
+    "maxilar", "quirúrgico", "farmac", "epidemiol",
+    "health", "dent", "clinic", "medical", "patient", "disease",
+    "periodontal", "pulpar", "endodont", "oncologic", "radiologic",
+    "maxill", "surg", "pharmac", "epidemiol",
+]
+HEALTH_BOOST = 0.3
+
+# Bits de dominio
+DOMAIN_HEALTH = 1 << 0
+DOMAIN_EDUCATION = 1 << 1
+DOMAIN_SCIENCE = 1 << 2
+DOMAIN_CULTURE = 1 << 3
+DOMAIN_SOCIAL = 1 << 4
+DOMAIN_COMMUNICATION = 1 << 5
+DOMAIN_ECONOMY = 1 << 6
+DOMAIN_ENVIRONMENT = 1 << 7
+
+# Nombre de la faceta (API) -> bit, y etiqueta para la UI
+DOMAINS = {
+    "health": DOMAIN_HEALTH,
+    "education": DOMAIN_EDUCATION,
+    "science": DOMAIN_SCIENCE,
+    "culture": DOMAIN_CULTURE,
+    "social": DOMAIN_SOCIAL,
+    "communication": DOMAIN_COMMUNICATION,
+    "economy": DOMAIN_ECONOMY,
+    "environment": DOMAIN_ENVIRONMENT,
+}
+DOMAIN_LABELS = {
+    "health": "Ciencias de la salud",
+    "education": "Educación",
+    "science": "Ciencias naturales y tecnología",
+    "culture": "Cultura",
+    "social": "Ciencias sociales y humanas",
+    "communication": "Información y comunicación",
+    "economy": "Política, derecho y economía",
+    "environment": "Medio ambiente",
+}
+
+DOMAIN_PREFIXES = {
+    DOMAIN_HEALTH: tuple(HEALTH_KEYWORDS),
+    DOMAIN_EDUCATION: (
+        "educa", "enseñ", "escuela", "escolar", "alumno", "estudiante", "docente",
+        "profesor", "universi", "pedag", "didáct", "currícul", "aprendizaje", "alfabetiz",
+        "educat", "teach", "school", "pupil", "student", "universit", "pedagog",
+        "didactic", "curricul", "learning", "literacy",
+    ),
+    DOMAIN_SCIENCE: (
+        "ciencia", "científic", "física", "químic", "biolog", "matemát", "geolog",
+        "astronom", "ingenier", "tecnolog", "investigación",
+        "scien", "physic", "chemi", "biolog", "mathemat", "geolog", "astronom",
+        "engineer", "technolog", "research",
+    ),
+    DOMAIN_CULTURE: (
+        "cultur", "bellas artes", "artíst", "música", "musica", "literatura", "patrimonio",
+        "museo", "teatro", "danza", "cine", "religi", "lengua", "idioma", "folklore",
+        "arts", "artist", "music", "literat", "heritage", "museum", "theatre", "dance", "film",
+        "languag", "folklor",
+    ),
+    DOMAIN_SOCIAL: (
+        "social", "sociedad", "sociolog", "psicolog", "antropolog", "histori",
+        "demograf", "famili", "género", "pobreza", "migra", "filosof", "ética",
+        "societ", "psycholog", "anthropolog", "demograph", "gender", "poverty",
+        "philosoph", "ethic",
+    ),
+    DOMAIN_COMMUNICATION: (
+        "informa", "comunica", "bibliotec", "documenta", "archiv", "prensa",
+        "periodis", "radiodifus", "televis", "internet", "comput", "digital", "edición",
+        "inform", "communicat", "librar", "document", "press", "journalis", "broadcast",
+        "publishing",
+    ),
+    DOMAIN_ECONOMY: (
+        "económ", "economía", "finanz", "comercio", "mercado", "empleo", "trabajo",
+        "industri", "polític", "derecho", "jurídic", "legisla", "gobierno", "administra",
+        "econom", "financ", "trade", "market", "employment", "labour", "industr",
+        "politic", "legal", "legislat", "government", "administrat",
+    ),
+    DOMAIN_ENVIRONMENT: (
+        "ambient", "ecolog", "ecosistema", "clima", "contamina", "biodiversidad",
+        "agua", "océano", "oceano", "marin", "forest", "bosque", "agricult", "energía",
+        "recursos naturales", "environment", "ecosystem", "climat", "pollut",
+        "biodiversity", "water", "ocean", "energy", "natural resources",
+    ),
+}
+DOMAIN_BOOSTS = {
+    DOMAIN_HEALTH: HEALTH_BOOST,
+}
+# Dominios del RDF (etiqueta de la skos:Collection) -> bit; se compara por prefijo
+RDF_DOMAIN_HINTS = {
+    "educa": DOMAIN_EDUCATION,
+    "cienc": DOMAIN_SCIENCE,
+    "scien": DOMAIN_SCIENCE,
+    "cultur": DOMAIN_CULTURE,
+    "ciencias sociales": DOMAIN_SOCIAL,
+    "social": DOMAIN_SOCIAL,
+    "informa": DOMAIN_COMMUNICATION,
+    "polític": DOMAIN_ECONOMY,
+    "politic": DOMAIN_ECONOMY,
+}
+
+
+def _prefix_pattern(prefixes, word_start=False):
+    # Una sola alternancia compilada equivale a any(h in term for h in prefixes)
+    alternation = "|".join(re.escape(h) for h in sorted(set(prefixes), key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})" if word_start else alternation)
+
+
+def _matches(terms, prefixes, word_start):
+    search = _prefix_pattern(prefixes, word_start).search
+    return np.fromiter((search(t) is not None for t in terms), dtype=bool, count=len(terms))
+
+
+def domain_flags(terms):
+    """Facetas por término: prefijos de cada dominio al inicio de palabra."""
+    flags = np.zeros(len(terms), dtype=np.uint8)
+    for bit, prefixes in DOMAIN_PREFIXES.items():
+        flags[_matches(terms, prefixes, word_start=True)] |= bit
+    return flags
+
+
+def prior_flags(terms):
+    """Bits de los dominios con peso a priori, casados como subcadena.
+
+    Solo alimenta prior_weights(); no sirve como faceta (ver domain_flags).
+    """
+    flags = np.zeros(len(terms), dtype=np.uint8)
+    for bit in DOMAIN_BOOSTS:
+        flags[_matches(terms, DOMAIN_PREFIXES[bit], word_start=False)] |= bit
+    return flags
+
+
+def prior_weights(flags):
+    prior = np.zeros(len(flags), dtype=np.float32)
+    for bit, boost in DOMAIN_BOOSTS.items():
+        prior += np.float32(boost) * ((flags & bit) != 0)
+    return prior
+
+
+def domain_bits(domains):
+    """Nombres de faceta (o una máscara int) -> máscara de bits; None = sin filtro."""
+    if domains is None or isinstance(domains, (int, np.integer)):
+        return domains
+    bits = 0
+    for name in domains:
+        if name not in DOMAINS:
+            raise ValueError(f"Dominio desconocido: {name!r} (opciones: {', '.join(DOMAINS)})")
+        bits |= DOMAINS[name]
+    return bits
+
+
+def _rdf_domain_bit(label):
+    label = label.lower()
+    # Las pistas más largas primero ("ciencias sociales" antes que "cienc")
+    for hint in sorted(RDF_DOMAIN_HINTS, key=len, reverse=True):
+        if label.startswith(hint):
+            return RDF_DOMAIN_HINTS[hint]
+    return 0
+
+
+def concept_facets(columns, hierarchy=None):
+    """Máscara por concepto: OR de las de cada idioma y de los dominios del RDF."""
+    facets = np.bitwise_or.reduce([column.meta.domain_flags for column in columns])
+    if hierarchy is not None and len(hierarchy.domain_labels):
+        # Bit de cada microtesauro según su dominio, propagado a sus conceptos
+        domain_bit = np.array([_rdf_domain_bit(label) for label in hierarchy.domain_labels],
+                              dtype=np.uint8)
+        group_bit = np.where(hierarchy.group_domains >= 0,
+                             domain_bit[np.maximum(hierarchy.group_domains, 0)], 0)
+        rows = np.repeat(np.arange(len(hierarchy)), np.diff(hierarchy.group_indptr))
+        np.bitwise_or.at(facets, rows, group_bit[hierarchy.group_indices].astype(np.uint8))
+    return facets
+
+
+def domain_mask(facets, bits):
+    """Conceptos con algún dominio de `bits`: una operación sobre el array."""
+    return (facets & np.uint8(bits)) != 0
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Fusión de señales de ranking (exactas + scorers) en una sola etapa.
+
+Sin perfil el motor encadena: coincidencias exactas primero y después el
+top-k del scorer. Con un perfil de fusión (`fusion=` en suggest_*) todas
+las señales puntúan a la vez y se combinan con NumPy sobre el lote:
+
+• "rrf": Reciprocal Rank Fusion ponderada. Cada señal aporta
+  peso / (rrf_k + rango) a sus `candidates` primeros conceptos; las
+  coincidencias exactas son una señal más, con su orden (las más largas
+  primero).
+• "linear": suma ponderada de las puntuaciones reescaladas a [0, 1] por
+  resumen (dividiendo por el máximo); las exactas valen 1.
+
+Las señales son "exact" y cualquier nombre de scorers.SCORERS ("tfidf",
+"bm25", "char", "lsa", "wordvec", ...). Cada scorer añade un producto por
+lote y un scatter de (n × candidates) IDs: ningún bucle Python por término.
+
+Los perfiles son JSON:
+    {"name": "rrf_bm25", "method": "rrf", "rrf_k": 60, "candidates": 100,
+     "weights": {"exact": 3.0, "tfidf": 1.0, "bm25": 1.0}}
+load_profile() los registra en PROFILES para poder pedirlos por nombre.
+"""
+
+import json
+from collections import namedtuple
+
+import numpy as np
+
+from rowops import scale_to_peak
+
+METHODS = ("rrf", "linear")
+RRF_K = 60
+CANDIDATES = 100
+
+# weights: tupla de pares (señal, peso) para que el perfil sea hashable
+FusionProfile = namedtuple("FusionProfile", "name method weights rrf_k candidates")
+
+PROFILES = {
+    "rrf": FusionProfile("rrf", "rrf", (("exact", 3.0), ("tfidf", 1.0), ("bm25", 1.0)),
+                         RRF_K, CANDIDATES),
+    "linear": FusionProfile("linear", "linear", (("exact", 1.0), ("tfidf", 0.5), ("bm25", 0.5)),
+                            RRF_K, CANDIDATES),
+}
+
+
+def make_profile(spec):
+    """FusionProfile a partir de un dict (el contenido del JSON)."""
+    method = spec.get("method", "rrf")
+    if method not in METHODS:
+        raise ValueError(f"Método de fusión desconocido: {method!r} "
+                         f"(opciones: {', '.join(METHODS)})")
+    weights = spec.get("weights")
+    if not isinstance(weights, dict) or not weights:
+        raise ValueError("El perfil de fusión necesita 'weights': {señal: peso}")
+    for signal, weight in weights.items():
+        if not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f"Peso no válido para {signal!r}: {weight!r}")
+    return FusionProfile(spec.get("name", method), method,
+                         tuple((str(s), float(w)) for s, w in weights.items()),
+                         int(spec.get("rrf_k", RRF_K)), int(spec.get("candidates", CANDIDATES)))
+
+
+def load_profile(path):
+    with open(path, encoding="utf-8") as fh:
+        profile = make_profile(json.load(fh))
+    PROFILES[profile.name] = profile
+    return profile
+
+
+def get_profile(profile):
+    # None, un FusionProfile, un nombre de PROFILES o la ruta de un JSON
+    if profile is None or isinstance(profile, FusionProfile):
+        return profile
+    if profile in PROFILES:
+        return PROFILES[profile]
+    if str(profile).endswith(".json"):
+        return load_profile(profile)
+    raise ValueError(f"Perfil de fusión desconocido: {profile!r} "
+                     f"(opciones: {', '.join(PROFILES)})")
+
+
+def scorer_signals(profile):
+    return [name for name, _ in profile.weights if name != "exact"]
+
+
+def available_profiles(scorers):
+    """Perfiles de PROFILES cuyas señales están todas en `scorers`."""
+    return [name for name, profile in PROFILES.items()
+            if all(signal in scorers for signal in scorer_signals(profile))]
+
+
+def pad_rankings(rankings):
+    """Listas de IDs ordenadas (una por resumen) -> matriz (n × ancho), -1 de relleno."""
+    width = max((len(ids) for ids in rankings), default=0)
+    out = np.full((len(rankings), width), -1, dtype=np.int64)
+    for row, ids in enumerate(rankings):
+        out[row, :len(ids)] = ids
+    return out
+
+
+def rank_candidates(scores, candidates):
+    """IDs de los `candidates` mejores por fila, ordenados (desempate por ID)."""
+    c = min(candidates, scores.shape[1])
+    if c <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    best = np.argpartition(-scores, c - 1, axis=1)[:, :c]
+    top = np.take_along_axis(scores, best, axis=1)
+    order = np.lexsort((best, -top), axis=1)
+    return np.take_along_axis(best, order, axis=1)
+
+
+def _rrf(profile, exact, scores, n_terms):
+    fused = np.zeros((len(exact), n_terms))
+    for signal, weight in profile.weights:
+        if signal == "exact":
+            ranks = exact
+        else:
+            ranks = rank_candidates(scores[signal], profile.candidates)
+        if not weight or not ranks.shape[1]:
+            continue
+        contrib = np.broadcast_to(weight / (profile.rrf_k + 1.0 + np.arange(ranks.shape[1])),
+                                  ranks.shape)
+        rows = np.broadcast_to(np.arange(len(ranks))[:, None], ranks.shape)
+        valid = ranks >= 0
+        # Dentro de una señal cada ID aparece una vez por fila: += sin np.add.at
+        fused[rows[valid], ranks[valid]] += contrib[valid]
+    # Solo compiten los conceptos que alguna señal propuso
+    fused[fused == 0] = -np.inf
+    return fused
+
+
+def _linear(profile, exact, scores, n_terms):
+    fused = np.zeros((len(exact), n_terms))
+    for signal, weight in profile.weights:
+        if not weight:
+            continue
+        if signal == "exact":
+            rows = np.broadcast_to(np.arange(len(exact))[:, None], exact.shape)
+            valid = exact >= 0
+            fused[rows[valid], exact[valid]] += weight
+            continue
+        fused += weight * scale_to_peak(np.maximum(scores[signal], 0.0))
+    return fused
+
+
+def fuse(profile, exact, scores, n_terms):
+    """Puntuación fusionada (n × n_términos).
+
+    exact: matriz de pad_rankings() con las coincidencias exactas.
+    scores: {scorer: matriz densa (n × n_términos)} de las señales del perfil.
+    """
+    method = _rrf if profile.method == "rrf" else _linear
+    return method(profile, exact, scores, n_terms)
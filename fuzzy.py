@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Búsqueda tolerante a erratas (índice de borrados estilo SymSpell).
+
+• DeletionIndex: para cada palabra se precalculan las variantes con hasta
+  `max_distance` caracteres borrados (sobre los primeros `prefix_length`
+  caracteres) -> IDs de palabra. Una consulta genera sus propios borrados
+  y solo verifica con distancia de edición los candidatos que comparten
+  alguna variante, sin recorrer el vocabulario.
+• TermCorrector: corrige tokens contra el vocabulario de una TermColumn.
+  Los tokens se indexan sin tildes, de modo que "epidemiologia" se
+  resuelve a "epidemiología" con distancia 0.
+
+Una palabra que no está en el vocabulario del tesauro no es por ello una
+errata ("dental" no debe pasar a "mental", ni "observaron" a
+"observación"):
+
+• Solo se corrigen por distancia de edición los tokens que tampoco están
+  en un léxico real del idioma (`lexicon`: con KEYWORDS_LEXICON, una
+  lista de palabras o un .dic de hunspell; varias rutas separadas por
+  os.pathsep). Sin léxico solo se restauran tildes: no hay forma de
+  distinguir una errata de una palabra válida fuera del tesauro.
+• Tampoco se corrigen los tokens de `known` (los términos de los demás
+  idiomas).
+• Las ediciones permitidas dependen de la longitud del token (max_edits)
+  y la primera letra debe coincidir: las erratas reales casi nunca la
+  cambian, mientras que las palabras vecinas del idioma sí.
+
+Los tokens de menos de MIN_LENGTH caracteres no se corrigen (demasiados
+falsos positivos entre palabras funcionales cortas).
+"""
+
+import os
+from collections import Counter
+from functools import lru_cache
+
+from textnorm import fold_accents, normalize_key
+
+MIN_LENGTH = 5
+LEXICON_PATH = os.environ.get("KEYWORDS_LEXICON")
+MEMO_SIZE = 100_000
+
+
+def max_edits(length):
+    """Ediciones permitidas para un token de `length` caracteres."""
+    if length < MIN_LENGTH:
+        return 0
+    return 1 if length < 10 else 2
+
+
+@lru_cache(maxsize=None)
+def load_lexicon(paths=LEXICON_PATH):
+    """Palabras (sin tildes) de una o varias listas; frozenset vacío sin rutas."""
+    words = set()
+    for path in (paths or "").split(os.pathsep):
+        if not path:
+            continue
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                # hunspell: "palabra/FLAGS"; la primera línea (recuento) no es una palabra
+                word = line.split("/", 1)[0].strip().lower()
+                if word and not word.isdigit():
+                    words.add(fold_accents(word))
+    return frozenset(words)
+
+
+def _deletes(word, max_distance):
+    # Variantes de `word` con 1..max_distance borrados
+    found = set()
+    frontier = {word}
+    for _ in range(max_distance):
+        step = set()
+        for w in frontier:
+            if len(w) <= 1:
+                continue
+            for i in range(len(w)):
+                step.add(w[:i] + w[i + 1:])
+        step -= found
+        found |= step
+        frontier = step
+    return found
+
+
+def edit_distance(a, b, max_distance):
+    """Distancia de alineamiento óptimo (Damerau restringida) acotada.
+
+    Devuelve max_distance + 1 en cuanto se supera la cota.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (prev2 is not None and j > 1 and a[i - 1] == b[j - 2]
+                    and a[i - 2] == b[j - 1]):
+                value = min(value, prev2[j - 2] + 1)
+            cur[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class DeletionIndex:
+    """Palabras a distancia de edición acotada en tiempo casi constante."""
+
+    def __init__(self, words, max_distance=2, prefix_length=7):
+        self.words = list(words)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        # variante -> ID (o tupla de IDs si la variante se repite)
+        index = {}
+        for wid, word in enumerate(self.words):
+            prefix = word[:prefix_length]
+            for variant in _deletes(prefix, max_distance) | {prefix}:
+                prev = index.get(variant)
+                if prev is None:
+                    index[variant] = wid
+                else:
+                    index[variant] = (prev if isinstance(prev, tuple) else (prev,)) + (wid,)
+        self.index = index
+
+    def __len__(self):
+        return len(self.words)
+
+    def lookup(self, word, max_distance=None):
+        """[(palabra, distancia)] con distancia <= max_distance, más cercanas antes."""
+        max_distance = self.max_distance if max_distance is None else min(
+            max_distance, self.max_distance)
+        prefix = word[:self.prefix_length]
+        candidates = set()
+        for variant in _deletes(prefix, max_distance) | {prefix}:
+            hit = self.index.get(variant)
+            if hit is None:
+                continue
+            if isinstance(hit, tuple):
+                candidates.update(hit)
+            else:
+                candidates.add(hit)
+        found = []
+        for wid in candidates:
+            candidate = self.words[wid]
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found.append((distance, wid, candidate))
+        found.sort()
+        return [(candidate, distance) for distance, _, candidate in found]
+
+
+class TermCorrector:
+    """Corrección de tokens contra el vocabulario de una columna de términos."""
+
+    def __init__(self, terms, max_distance=2, known=(), lexicon=()):
+        counts = Counter(token for term in terms for token in normalize_key(term).split())
+        self.vocabulary = frozenset(counts)
+        # Palabras válidas fuera del tesauro: nunca se corrigen
+        self.known = frozenset(fold_accents(word) for word in known)
+        # Léxico del idioma; vacío = sin corrección por distancia de edición
+        self.lexicon = frozenset(fold_accents(word) for word in lexicon)
+        # Forma sin tildes -> variante original más frecuente
+        variants = {}
+        for token, count in counts.most_common():
+            variants.setdefault(fold_accents(token), token)
+        self.variants = variants
+        # Más frecuentes primero: desempatan a igual distancia
+        self.index = DeletionIndex(sorted(variants, key=lambda w: -counts[variants[w]]),
+                                   max_distance)
+        self._memo = {}
+
+    def correct(self, token):
+        """(token del vocabulario, distancia) o None si no hay candidato."""
+        if token in self.vocabulary:
+            return token, 0
+        hit = self._memo.get(token, False)
+        if hit is False:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            hit = self._memo[token] = self._correct(fold_accents(token))
+        return hit
+
+    def _correct(self, folded):
+        if folded in self.variants:
+            return self.variants[folded], 0
+        edits = max_edits(len(folded))
+        if (not edits or not self.lexicon or folded in self.lexicon
+                or folded in self.known):
+            return None
+        for word, distance in self.index.lookup(folded, edits):
+            if word[0] == folded[0]:
+                return self.variants[word], distance
+        return None
+
+    def recognizes(self, token):
+        """¿El token (con o sin tildes) está en el vocabulario?"""
+        return token in self.vocabulary or fold_accents(token) in self.variants
+
+    def correct_tokens(self, tokens):
+        """(tokens corregidos, ediciones); los no corregibles se mantienen.
+
+        Una corrección solo de tildes cuenta 0 ediciones.
+        """
+        out = []
+        total = 0
+        for token in tokens:
+            hit = self.correct(token)
+            if hit is None:
+                out.append(token)
+            else:
+                out.append(hit[0])
+                total += hit[1]
+        return out, total
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Jerarquía del tesauro (broader/narrower) y microtesauros, por ID de concepto.
+
+• broader: CSR concepto -> conceptos genéricos (padres directos).
+• ancestors: cierre transitivo precalculado como bitset (n × ⌈n/64⌉
+  uint64; 2.5 MB para 4.485 conceptos). is_descendant(c, a) es un acceso
+  a una palabra y un desplazamiento; descendants_mask(a) es un test de bit
+  sobre una columna. Con poli-jerarquía (varios padres) un bitset es
+  exacto, a diferencia de una codificación por intervalos.
+• groups: CSR concepto -> microtesauros (isothes:ConceptGroup) y, para cada
+  grupo, su dominio (skos:Collection), base de las facetas por dominio.
+
+El fichero thesaurus_hierarchy.npz se genera desde el RDF SKOS del
+tesauro; sin él load_hierarchy() devuelve None y el motor no aplica el
+boost jerárquico.
+
+Uso:
+    python cli.py hierarchy --rdf unesco-thesaurus.rdf
+    python cli.py suggest --hierarchy-boost 0.2 --text "..."
+"""
+
+import os
+import warnings
+from functools import lru_cache
+
+import numpy as np
+
+from textnorm import normalize_key
+
+HIERARCHY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "thesaurus_hierarchy.npz")
+HIERARCHY_BOOST = 0.2
+
+
+def _csr(n, pairs):
+    # Lista de pares (fila, valor) -> (indptr, indices) ordenados y sin repetir
+    if not pairs:
+        return np.zeros(n + 1, dtype=np.int32), np.empty(0, dtype=np.int32)
+    pairs = np.unique(np.asarray(pairs, dtype=np.int64), axis=0)
+    indptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(pairs[:, 0], minlength=n), out=indptr[1:])
+    return indptr, pairs[:, 1].astype(np.int32)
+
+
+def _closure(n, indptr, indices):
+    # Ancestros de cada concepto: los padres se resuelven antes que los hijos (Kahn)
+    words = (n + 63) // 64
+    ancestors = np.zeros((n, words), dtype=np.uint64)
+    children = [[] for _ in range(n)]
+    pending = np.diff(indptr).astype(np.int64)
+    for child in range(n):
+        for parent in indices[indptr[child]:indptr[child + 1]]:
+            children[parent].append(child)
+    queue = [c for c in range(n) if pending[c] == 0]
+    done = 0
+    while queue:
+        node = queue.pop()
+        done += 1
+        for parent in indices[indptr[node]:indptr[node + 1]]:
+            ancestors[node] |= ancestors[parent]
+            ancestors[node, parent >> 6] |= np.uint64(1) << np.uint64(parent & 63)
+        for child in children[node]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                queue.append(child)
+    if done < n:
+        raise ValueError(f"La jerarquía tiene ciclos ({n - done} conceptos sin resolver)")
+    return ancestors
+
+
+class Hierarchy:
+    """Arrays de la jerarquía y de los microtesauros, indexados por ID."""
+
+    def __init__(self, broader_indptr, broader_indices, ancestors, group_indptr,
+                 group_indices, group_labels, group_domains, domain_labels):
+        self.broader_indptr = broader_indptr
+        self.broader_indices = broader_indices
+        self.ancestors = ancestors
+        self.group_indptr = group_indptr
+        self.group_indices = group_indices
+        self.group_labels = group_labels
+        self.group_domains = group_domains
+        self.domain_labels = domain_labels
+
+    @classmethod
+    def from_edges(cls, n, broader, memberships=(), group_labels=(), group_domains=(),
+                   domain_labels=()):
+        """broader: pares (hijo, padre); memberships: pares (concepto, grupo)."""
+        broader_indptr, broader_indices = _csr(n, [(c, p) for c, p in broader if c != p])
+        group_indptr, group_indices = _csr(n, list(memberships))
+        return cls(broader_indptr, broader_indices,
+                   _closure(n, broader_indptr, broader_indices), group_indptr, group_indices,
+                   np.asarray(group_labels, dtype=str),
+                   np.asarray(group_domains, dtype=np.int16),
+                   np.asarray(domain_labels, dtype=str))
+
+    def __len__(self):
+        return len(self.ancestors)
+
+    def save(self, path=HIERARCHY_PATH):
+        np.savez(path, **vars(self))
+
+    @classmethod
+    def load(cls, path=HIERARCHY_PATH):
+        with np.load(path, allow_pickle=False) as snap:
+            return cls(**{name: snap[name] for name in snap.files})
+
+    def parents(self, cid):
+        return self.broader_indices[self.broader_indptr[cid]:self.broader_indptr[cid + 1]]
+
+    def is_descendant(self, cid, ancestor):
+        """¿`ancestor` es un genérico (directo o no) de `cid`? O(1)."""
+        word = self.ancestors[cid, ancestor >> 6]
+        return bool((word >> np.uint64(ancestor & 63)) & np.uint64(1))
+
+    def ancestors_of(self, cid):
+        bits = np.unpackbits(self.ancestors[cid].view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits[:len(self)])
+
+    def descendants_mask(self, ancestor):
+        """Máscara (n,) de los conceptos que descienden de `ancestor`."""
+        column = self.ancestors[:, ancestor >> 6]
+        return ((column >> np.uint64(ancestor & 63)) & np.uint64(1)).astype(bool)
+
+    def lineage_mask(self, anchors):
+        """Conceptos ancestros o descendientes de alguno de `anchors` (sin ellos)."""
+        anchors = np.asarray(anchors, dtype=np.int64)
+        n = len(self)
+        if not len(anchors):
+            return np.zeros(n, dtype=bool)
+        bits = np.zeros(self.ancestors.shape[1], dtype=np.uint64)
+        np.bitwise_or.at(bits, anchors >> 6, np.uint64(1) << (anchors & 63).astype(np.uint64))
+        mask = (self.ancestors & bits).any(axis=1)
+        above = np.bitwise_or.reduce(self.ancestors[anchors], axis=0)
+        mask |= np.unpackbits(above.view(np.uint8), bitorder="little")[:n].astype(bool)
+        mask[anchors] = False
+        return mask
+
+    def groups_of(self, cid):
+        return self.group_indices[self.group_indptr[cid]:self.group_indptr[cid + 1]]
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in vars(self).values())
+
+
+def _concept_ids(store):
+    # URI -> ID casando la etiqueta preferida con la tabla de conceptos. Una
+    # etiqueta compartida por varios conceptos ("cultura oceánica") no decide:
+    # se prueba el otro idioma y, si tampoco es única, el concepto queda
+    # como ambiguo (None, True)
+    indexes = [(lang, store.column(lang).key_index) for lang in ("es", "en")]
+
+    def resolve(labels):
+        ambiguous = False
+        for lang, index in indexes:
+            label = labels.get(lang)
+            if label is None:
+                continue
+            hit = index.get(normalize_key(label))
+            if isinstance(hit, tuple):
+                ambiguous = True
+            elif hit is not None:
+                return hit, False
+        return None, ambiguous
+    return resolve
+
+
+def build_from_resources(resources, store, uri_ids=None):
+    """Hierarchy a partir de skos.iter_resources(); devuelve (jerarquía, informe).
+
+    uri_ids: URI -> ID ya conocidos (build_thesaurus.py); sin ellos el ID se
+    obtiene casando la etiqueta preferida con la tabla de conceptos.
+    """
+    resolve = _concept_ids(store)
+    ids, broader, groups, collections = {}, [], {}, []
+    unmatched, ambiguous = 0, []
+    for res in resources:
+        if res.kind == "concept":
+            if uri_ids is None:
+                cid, shared = resolve(res.labels)
+            else:
+                cid, shared = uri_ids.get(res.uri), False
+            if cid is None:
+                if shared:
+                    ambiguous.append(_label(res.labels))
+                else:
+                    unmatched += 1
+                continue
+            ids[res.uri] = cid
+            broader.extend((res.uri, uri) for uri in res.broader)
+            broader.extend((uri, res.uri) for uri in res.narrower)
+        elif res.kind == "group":
+            groups[res.uri] = res
+        else:
+            collections.append(res)
+    edges = [(ids[c], ids[p]) for c, p in broader if c in ids and p in ids]
+    group_uris = list(groups)
+    group_ids = {uri: g for g, uri in enumerate(group_uris)}
+    memberships = [(ids[m], group_ids[uri]) for uri, res in groups.items()
+                   for m in res.members if m in ids]
+    # Dominios: colecciones cuyos miembros son microtesauros
+    domain_labels, group_domains = [], np.full(len(group_uris), -1, dtype=np.int16)
+    for res in collections:
+        members = [group_ids[m] for m in res.members if m in group_ids]
+        if members:
+            group_domains[members] = len(domain_labels)
+            domain_labels.append(_label(res.labels))
+    hierarchy = Hierarchy.from_edges(
+        len(store), edges, memberships, [_label(groups[u].labels) for u in group_uris],
+        group_domains, domain_labels)
+    if ambiguous:
+        warnings.warn(f"{len(ambiguous)} conceptos con etiquetas repetidas en todos los idiomas "
+                      f"no se han resuelto (p. ej. {', '.join(ambiguous[:5])}); "
+                      "usa build_thesaurus.py para resolverlos por URI")
+    report = {"concepts": len(ids), "unmatched": unmatched, "ambiguous": len(ambiguous),
+              "edges": len(set(edges)), "groups": len(group_uris),
+              "domains": len(domain_labels)}
+    return hierarchy, report
+
+
+def _label(labels):
+    return labels.get("es") or labels.get("en") or next(iter(labels.values()), "")
+
+
+@lru_cache(maxsize=None)
+def load_hierarchy(path=HIERARCHY_PATH):
+    """Jerarquía generada, o None si el fichero no existe."""
+    return Hierarchy.load(path) if os.path.exists(path) else None
+
+
+def require_hierarchy(n_concepts, path=HIERARCHY_PATH):
+    """load_hierarchy() comprobando que existe y que cubre `n_concepts` conceptos."""
+    hierarchy = load_hierarchy(path)
+    if hierarchy is None:
+        raise ValueError(f"No existe {path}: genera la jerarquía con "
+                         "'python cli.py hierarchy --rdf <tesauro.rdf>' o build_thesaurus.py")
+    if len(hierarchy) != n_concepts:
+        raise ValueError(f"{path} tiene {len(hierarchy)} conceptos y la tabla {n_concepts}: "
+                         "regenera la jerarquía con el vocabulario actual")
+    return hierarchy
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Medición de tiempos por etapa del motor.
+
+• TIMER.stage("nombre") envuelve una etapa; desactivado devuelve un
+  contexto nulo compartido (una comprobación de atributos por etapa).
+• Se activa globalmente con KEYWORDS_TIMING=1 / TIMER.enable(), o solo
+  para el hilo actual dentro de TIMER.collect().
+• Acumula llamadas y tiempo total por etapa (TIMER.snapshot()) y emite un
+  registro estructurado por bloque collect() en el logger "keywords.timing".
+• `listeners` recibe (etapa, segundos) de cada medición (ver metrics.py).
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger("keywords.timing")
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class StageTimer:
+    """Contadores acumulados por etapa y desglose por hilo."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.totals = defaultdict(float)
+            self.calls = defaultdict(int)
+
+    def stage(self, name):
+        if self.enabled or getattr(self._local, "current", None) is not None:
+            return _Stage(self, name)
+        return _NULL_STAGE
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.totals[name] += seconds
+            self.calls[name] += 1
+        for listener in self.listeners:
+            listener(name, seconds)
+        current = getattr(self._local, "current", None)
+        if current is not None:
+            current[name] = current.get(name, 0.0) + seconds
+
+    @contextmanager
+    def collect(self, label="suggest"):
+        """Activa la medición en este hilo y devuelve {etapa: segundos}."""
+        previous = getattr(self._local, "current", None)
+        current = self._local.current = {}
+        try:
+            yield current
+        finally:
+            self._local.current = previous
+            if previous is not None:
+                for name, seconds in current.items():
+                    previous[name] = previous.get(name, 0.0) + seconds
+            if logger.isEnabledFor(logging.INFO):
+                timings = {name: round(s * 1000.0, 3) for name, s in current.items()}
+                logger.info("%s timings_ms=%s", label, timings,
+                            extra={"label": label, "timings_ms": timings})
+
+    def snapshot(self):
+        with self._lock:
+            return {name: {"calls": self.calls[name], "total_ms": self.totals[name] * 1000.0}
+                    for name in self.totals}
+
+
+TIMER = StageTimer(enabled=os.environ.get("KEYWORDS_TIMING", "") not in ("", "0"))
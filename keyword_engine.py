@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de sugerencia de keywords (sin dependencia de Streamlit).
+
+• prepare_vectorizer(): índice TF-IDF de (1,2)-gramas sobre los términos.
+• Con `idf` (corpus_idf.CorpusIDF) los pesos salen de un corpus de fondo
+  de resúmenes en un espacio con hashing, en vez de los propios términos.
+• Con `char_weight` se añade un índice de n-gramas de caracteres con
+  hashing (char_index.py) cuyo coseno se fusiona con el de palabras, para
+  casar variantes morfológicas ("odontológico" / "odontología").
+• suggest_indices(): coincidencias exactas de n-gramas + TF-IDF con boost
+  de salud; suggest_batch() hace lo mismo para varios resúmenes con un
+  único producto disperso. El fallback es un scorer intercambiable por
+  petición (`scorer="tfidf"` o `"bm25"`, ver scorers.py).
+• Con `budget_ms` la etapa exacta siempre se ejecuta y el fallback TF-IDF
+  solo si su coste estimado cabe en el presupuesto (degradación a
+  coincidencias exactas).
+• Cada etapa se mide con instrumentation.TIMER (coste casi nulo si está
+  desactivado); stage_timings() devuelve los contadores acumulados.
+• Con `fuzzy=True` los tokens del resumen se corrigen contra el
+  vocabulario (fuzzy.TermCorrector) y los n-gramas corregidos también
+  cuentan como coincidencias exactas ("epidemologia" -> epidemiología),
+  por detrás de las literales. Las erratas solo se corrigen con un léxico
+  cargado (KEYWORDS_LEXICON); sin él solo se restauran tildes.
+• Con `fusion` (perfil de fusion.py) las exactas y varios scorers se
+  combinan por RRF o linealmente en vez de encadenarse.
+• Con `mmr` (λ de mmr.py) se toman MMR_POOL candidatos y se diversifica
+  el top-k con el grafo de vecinos precalculado (neighbors.py).
+• Con `hierarchy_boost` los genéricos y específicos (hierarchy.py) de las
+  coincidencias exactas reciben ese boost en el fallback.
+• Con `domains` (facetas de domains.py, p. ej. ["health", "education"])
+  solo se sugieren conceptos de esos dominios: la máscara de bits por
+  concepto (meta.facets) anula el vector de puntuaciones antes del top-k.
+• Los términos se direccionan por ID de concepto (ver concept_store) y el
+  ranking solo indexa los arrays de TermMetadata.
+"""
+
+import time
+from collections import defaultdict, namedtuple
+
+import numpy as np
+
+from char_index import CharNgramIndex, FusedMatrix
+from compact_index import CompactMatrix
+from concept_store import as_column
+from corpus_idf import CorpusIDF, HashedTfidfVectorizer
+from domains import HEALTH_KEYWORDS, domain_bits  # noqa: F401  (HEALTH_KEYWORDS reexportado)
+from fusion import fuse, get_profile, pad_rankings, scorer_signals
+from hierarchy import require_hierarchy
+from instrumentation import TIMER
+from mmr import MMR_POOL, mmr_rerank
+from neighbors import get_neighbors
+from scorers import DEFAULT_SCORER, get_scorer, similarities  # noqa: F401  (reexportado)
+from textnorm import tokenize
+
+
+def prepare_vectorizer(terms, compact=None, char_weight=None, idf=None):
+    # compact: None/"float64" (por defecto), "float32", "uint16" o "int8"
+    # char_weight: peso (0-1) del índice de n-gramas de caracteres, o None
+    # idf: CorpusIDF (o ruta .npz) con el idf de un corpus de fondo; None
+    #      ajusta el idf sobre los propios términos
+    # scikit-learn se importa aquí para no pagarlo al importar el motor
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    dtype = np.float64 if compact in (None, "float64") else np.float32
+    with TIMER.stage("index_build"):
+        if idf is None:
+            vect = TfidfVectorizer(ngram_range=(1,2), dtype=dtype)
+        else:
+            if isinstance(idf, str):
+                idf = CorpusIDF.load(idf)
+            vect = HashedTfidfVectorizer(idf, dtype=dtype)
+        matrix = vect.fit_transform(terms)
+        if compact:
+            # stop_words_ solo sirve para introspección
+            vect.stop_words_ = None
+            matrix = CompactMatrix(matrix, compact)
+    if char_weight is not None:
+        with TIMER.stage("char_index_build"):
+            matrix = FusedMatrix(matrix, CharNgramIndex(terms), char_weight)
+    return vect, matrix
+
+
+def extract_ngrams(text, max_n=5):
+    return _ngrams(tokenize(text), max_n)
+
+
+def _ngrams(tokens, max_n):
+    ngrams = set()
+    for n in range(1, max_n+1):
+        for i in range(len(tokens)-n+1):
+            ngrams.add(" ".join(tokens[i:i+n]))
+    return ngrams
+
+
+def top_k(scores, k, exclude=None):
+    """IDs de los k mayores `scores`, desempate por ID ascendente."""
+    scores = np.asarray(scores)
+    if exclude is not None and len(exclude):
+        scores = scores.copy()
+        scores[exclude] = -np.inf
+        k = min(k, len(scores) - len(exclude))
+    n = len(scores)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        threshold = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+        cand = np.concatenate([above, ties])
+    else:
+        cand = np.arange(n)
+    return cand[np.lexsort((cand, -scores[cand]))]
+
+
+def _longest_first(ids, column):
+    return ids[np.argsort(-column.meta.word_count[ids], kind="stable")]
+
+
+def exact_matches(summary, column, fuzzy=False):
+    # IDs cuyos términos aparecen como n-grama, los más largos primero; las
+    # coincidencias que solo aparecen tras corregir erratas van detrás
+    with TIMER.stage("ngrams"):
+        tokens = tokenize(summary)
+        ngrams = _ngrams(tokens, max_n=5)
+    corrected = tokens
+    if fuzzy:
+        with TIMER.stage("fuzzy"):
+            corrected, _ = column.corrector.correct_tokens(tokens)
+    with TIMER.stage("exact"):
+        ids = _longest_first(column.lookup(ngrams), column)
+        if corrected == tokens:
+            return ids
+        fixed = column.lookup(_ngrams(corrected, max_n=5) - ngrams)
+        fixed = fixed[~np.isin(fixed, ids)]
+        return np.concatenate([ids, _longest_first(fixed, column)])
+
+
+def stage_timings():
+    # Contadores acumulados por etapa: {etapa: {"calls", "total_ms"}}
+    return TIMER.snapshot()
+
+
+SuggestResult = namedtuple("SuggestResult", "indices stages degraded")
+
+
+class CostEstimate:
+    """Media móvil exponencial del coste (segundos) por resumen de una etapa."""
+
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self.value = None
+
+    def update(self, seconds, n=1):
+        per_item = seconds / max(n, 1)
+        if self.value is None:
+            self.value = per_item
+        else:
+            self.value += self.alpha * (per_item - self.value)
+
+    def predict(self, n=1):
+        # Sin mediciones previas se asume que la etapa cabe
+        return 0.0 if self.value is None else self.value * n
+
+
+# Coste estimado por scorer; TFIDF_COST se mantiene como alias del de TF-IDF
+SCORER_COSTS = defaultdict(CostEstimate)
+TFIDF_COST = SCORER_COSTS["tfidf"]
+
+
+def _hierarchy_lift(group, exact, boosts, n_terms):
+    # Boost (filas del grupo × términos) a la línea jerárquica de las exactas
+    if not any(boosts[i] for i in group):
+        return None
+    hierarchy = require_hierarchy(n_terms)
+    lift = np.zeros((len(group), len(hierarchy)), dtype=np.float32)
+    for row, i in enumerate(group):
+        if boosts[i] and len(exact[i]):
+            lift[row, hierarchy.lineage_mask(exact[i])] = boosts[i]
+    return lift
+
+
+def _domain_block(group, bits, facets):
+    # Máscara (filas del grupo × términos) de lo que queda fuera del filtro
+    row_bits = np.array([bits[i] or 0 for i in group], dtype=np.uint8)[:, None]
+    if not row_bits.any():
+        return None
+    return ((facets[None, :] & row_bits) == 0) & (row_bits != 0)
+
+
+def suggest_indices(summary, terms, vect, matrix, k=3, budget_ms=None, fuzzy=False,
+                    scorer=DEFAULT_SCORER, fusion=None, mmr=None, hierarchy_boost=None,
+                    domains=None):
+    return suggest_detailed(summary, terms, vect, matrix, k, budget_ms, fuzzy, scorer,
+                            fusion, mmr, hierarchy_boost, domains).indices
+
+
+def suggest_detailed(summary, terms, vect, matrix, k=3, budget_ms=None, fuzzy=False,
+                     scorer=DEFAULT_SCORER, fusion=None, mmr=None, hierarchy_boost=None,
+                     domains=None):
+    return suggest_batch_detailed([summary], terms, vect, matrix, [k], budget_ms, fuzzy,
+                                  scorer, fusion, mmr, hierarchy_boost, [domains])[0]
+
+
+def suggest_batch(summaries, terms, vect, matrix, k=3, budget_ms=None, fuzzy=False,
+                  scorer=DEFAULT_SCORER, fusion=None, mmr=None, hierarchy_boost=None,
+                  domains=None):
+    results = suggest_batch_detailed(summaries, terms, vect, matrix, k, budget_ms, fuzzy,
+                                     scorer, fusion, mmr, hierarchy_boost, domains)
+    return [r.indices for r in results]
+
+
+def suggest_batch_detailed(summaries, terms, vect, matrix, k=3, budget_ms=None, fuzzy=False,
+                           scorer=DEFAULT_SCORER, fusion=None, mmr=None,
+                           hierarchy_boost=None, domains=None):
+    # k, budget_ms, fuzzy, scorer, fusion, mmr y hierarchy_boost: valor común o una
+    # lista (uno por resumen); domains: lista de facetas común o lista de listas
+    started = time.perf_counter()
+    column = as_column(terms)
+    n = len(summaries)
+    ks = [k] * n if isinstance(k, int) else list(k)
+    budgets = budget_ms if isinstance(budget_ms, (list, tuple)) else [budget_ms] * n
+    fuzzies = fuzzy if isinstance(fuzzy, (list, tuple)) else [fuzzy] * n
+    names = [scorer] * n if isinstance(scorer, str) else list(scorer)
+    profiles = ([get_profile(p) for p in fusion] if isinstance(fusion, list)
+                else [get_profile(fusion)] * n)
+    # Con perfil de fusión el grupo (y su coste estimado) es el del perfil
+    groups = [names[i] if profiles[i] is None else profiles[i] for i in range(n)]
+    cost_keys = [names[i] if profiles[i] is None else f"fusion:{profiles[i].name}"
+                 for i in range(n)]
+    lambdas = mmr if isinstance(mmr, (list, tuple)) else [mmr] * n
+    # Con MMR se ordena una bolsa de candidatos mayor y luego se eligen k
+    wants = [ks[i] if lambdas[i] is None else max(ks[i], MMR_POOL) for i in range(n)]
+    boosts = (hierarchy_boost if isinstance(hierarchy_boost, (list, tuple))
+              else [hierarchy_boost] * n)
+    per_summary = (isinstance(domains, (list, tuple)) and len(domains) == n
+                   and all(d is None or isinstance(d, (list, tuple, int)) for d in domains))
+    bits = ([domain_bits(d) for d in domains] if per_summary
+            else [domain_bits(domains)] * n)
+    facets = column.meta.facets
+
+    # Coincidencias exactas de n-gramas
+    exact = [exact_matches(s, column, f) for s, f in zip(summaries, fuzzies)]
+    if any(bits):
+        with TIMER.stage("domains"):
+            exact = [ids if not b else ids[(facets[ids] & b) != 0]
+                     for ids, b in zip(exact, bits)]
+    results = [SuggestResult(ids[:m].tolist(), ("exact",), False)
+               for ids, m in zip(exact, wants)]
+    # La fusión puede reordenar las exactas: entran aunque ya llenen k
+    pending = [i for i, ids in enumerate(exact)
+               if len(ids) < wants[i] or profiles[i] is not None]
+
+    # Solo entran al fallback los resúmenes cuyo presupuesto lo permite
+    elapsed = time.perf_counter() - started
+    shed = {i for i in pending if budgets[i] is not None
+            and elapsed + SCORER_COSTS[cost_keys[i]].predict(len(pending)) > budgets[i] / 1000.0}
+    for i in shed:
+        results[i] = results[i]._replace(degraded=True)
+    pending = [i for i in pending if i not in shed]
+
+    # Un producto disperso por scorer, con boost a priori por dominio (salud)
+    for key in dict.fromkeys(groups[i] for i in pending):
+        group = [i for i in pending if groups[i] == key]
+        scorer_started = time.perf_counter()
+        texts = [summaries[i] for i in group]
+        if isinstance(key, str):
+            sims = get_scorer(key, vect, matrix).scores(texts)
+            with TIMER.stage("boost"):
+                scored = sims + column.meta.prior
+                lift = _hierarchy_lift(group, exact, boosts, len(column))
+                if lift is not None:
+                    scored += lift
+            block = _domain_block(group, bits, facets)
+            if block is not None:
+                with TIMER.stage("domains"):
+                    scored[block] = -np.inf
+            with TIMER.stage("rank"):
+                for row, i in enumerate(group):
+                    ranked = top_k(scored[row], wants[i] - len(exact[i]), exclude=exact[i])
+                    if block is not None:
+                        ranked = ranked[np.isfinite(scored[row, ranked])]
+                    results[i] = SuggestResult(exact[i].tolist() + ranked.tolist(),
+                                               ("exact", key), False)
+        else:
+            signals = scorer_signals(key)
+            scores = {}
+            lift = _hierarchy_lift(group, exact, boosts, len(column))
+            for name in signals:
+                sims = get_scorer(name, vect, matrix).scores(texts)
+                with TIMER.stage("boost"):
+                    scores[name] = sims + column.meta.prior
+                    if lift is not None:
+                        scores[name] += lift
+            with TIMER.stage("fusion"):
+                fused = fuse(key, pad_rankings([exact[i] for i in group]), scores, len(column))
+            block = _domain_block(group, bits, facets)
+            if block is not None:
+                with TIMER.stage("domains"):
+                    fused[block] = -np.inf
+            with TIMER.stage("rank"):
+                for row, i in enumerate(group):
+                    ranked = top_k(fused[row], wants[i])
+                    ranked = ranked[np.isfinite(fused[row, ranked])]
+                    results[i] = SuggestResult(ranked.tolist(),
+                                               ("exact", *signals, "fusion"), False)
+        SCORER_COSTS[cost_keys[group[0]]].update(time.perf_counter() - scorer_started,
+                                                 len(group))
+
+    # Diversificación MMR sobre la bolsa de candidatos
+    if any(lam is not None for lam in lambdas):
+        graph = get_neighbors(matrix)
+        with TIMER.stage("mmr"):
+            for i, lam in enumerate(lambdas):
+                if lam is not None:
+                    results[i] = results[i]._replace(
+                        indices=mmr_rerank(results[i].indices, graph, ks[i], lam),
+                        stages=results[i].stages + ("mmr",))
+    return results
@@ -1,75 +1,119 @@
+import os
+
 import streamlit as st
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
+
+from autocomplete import TermAutocomplete
+from compact_index import load_index as load_snapshot
+from concept_store import load_store
+from domains import DOMAIN_LABELS
+from instrumentation import TIMER
+from keyword_engine import (HEALTH_KEYWORDS, prepare_vectorizer, stage_timings,
+                            suggest_indices)
+from metrics import (CACHE_REQUESTS, DOCUMENT_CHARS, REQUEST_SECONDS, enable_stage_metrics,
+                     record_cache, record_index, serve_metrics)
+from fusion import PROFILES, available_profiles, load_profile
+from mmr import MMR_LAMBDA
+from neighbors import attach_neighbors, get_neighbors, load_graph, related
+from scorers import DEFAULT_SCORER, attach_lsa, attach_word_vectors, available_scorers
 
 # ------------------------------------------------------------
 #  App Streamlit: Generador de Keywords Bilingüe Consistente
 # ------------------------------------------------------------
 # • Utiliza lista bilingüe de conceptos alineados por índice.
-# • Esquema: CONCEPTS = [{'es':..., 'en':...}, ...]
+# • Esquema: CONCEPTS = [{'es':..., 'en':...}, ...], cargado como tabla
+#   columnar (concept_store) y direccionado por ID de concepto.
 # • Prioriza términos de salud y coincidencias exactas.
 # ------------------------------------------------------------
 
-# Importar lista alineada de conceptos (debes generar este módulo)
-from thesaurus_terms_bilingual import CONCEPTS
-
-# Construir vocabularios alineados
-terms_es = [c['es'] for c in CONCEPTS]
-terms_en = [c['en'] for c in CONCEPTS]
-
-# Prefijos comunes de salud en ambos idiomas
-HEALTH_KEYWORDS = [
-    "salud", "dental", "odont", "clínica", "médico", "paciente", "enfermedad",
-    "periodontal", "pulpar", "endo-periodontal", "oncológico", "radiológico",
-    "maxilar", "quirúrgico", "farmac", "epidemiol",
-    "health", "dent", "clinic", "medical", "patient", "disease",
-    "periodontal", "pulpar", "endodont", "oncologic", "radiologic",
-    "maxill", "surg", "pharmac", "epidemiol",
-]
-
-@st.cache_data(show_spinner=False)
-def prepare_vectorizer(terms):
-    vect = TfidfVectorizer(ngram_range=(1,2))
-    matrix = vect.fit_transform(terms)
+# La tabla de conceptos (thesaurus_terms_bilingual.CONCEPTS) se construye
+# en el primer uso mediante load_store(); STORE, terms_es y terms_en siguen
+# disponibles como atributos del módulo.
+_LAZY_ATTRS = {
+    "STORE": load_store,
+    "terms_es": lambda: load_store().column('es'),
+    "terms_en": lambda: load_store().column('en'),
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Modo de almacenamiento del índice: float64 (defecto), float32, uint16, int8
+INDEX_MODE = os.environ.get("KEYWORDS_INDEX_MODE") or None
+
+# Snapshot .npz opcional (compact_index.save_index) para no reajustar el TF-IDF
+INDEX_SNAPSHOT = os.environ.get("KEYWORDS_INDEX_SNAPSHOT")
+
+# Peso (0-1) del índice de n-gramas de caracteres fusionado (char_index.py)
+CHAR_WEIGHT = os.environ.get("KEYWORDS_CHAR_WEIGHT")
+CHAR_WEIGHT = float(CHAR_WEIGHT) if CHAR_WEIGHT else None
+
+# IDF de un corpus de fondo (corpus_idf.py, "python cli.py idf ...")
+INDEX_IDF = os.environ.get("KEYWORDS_IDF")
+
+# Índice LSA opcional (lsa.py, "python cli.py lsa ..."): scorers lsa y tfidf+lsa
+INDEX_LSA = os.environ.get("KEYWORDS_LSA")
+
+# Vectores de palabras (word_vectors.py, "python cli.py vectors ..."): scorers wordvec
+INDEX_VECTORS = os.environ.get("KEYWORDS_VECTORS")
+
+# Grafo de conceptos relacionados ("python cli.py neighbors ..."); si no
+# existe se construye uno sobre el índice ES al primer uso
+INDEX_NEIGHBORS = os.environ.get("KEYWORDS_NEIGHBORS")
+RELATED_LIMIT = 5
+
+# Perfil de fusión adicional (JSON, ver fusion.py)
+FUSION_PROFILE = os.environ.get("KEYWORDS_FUSION_PROFILE")
+
+# Puerto local para /metrics (desactivado si no se define)
+METRICS_PORT = os.environ.get("KEYWORDS_METRICS_PORT")
+
+
+@st.cache_resource(show_spinner=False)
+def load_index(mode=INDEX_MODE, snapshot=INDEX_SNAPSHOT, char_weight=CHAR_WEIGHT,
+               idf=INDEX_IDF, lsa=INDEX_LSA, vectors=INDEX_VECTORS,
+               neighbors=INDEX_NEIGHBORS):
+    record_cache("engine_resource", hit=False)
+    terms_es = load_store().column('es')
+    if snapshot and os.path.exists(snapshot):
+        vect, matrix = load_snapshot(snapshot)
+    else:
+        vect, matrix = prepare_vectorizer(terms_es, compact=mode, char_weight=char_weight,
+                                          idf=idf)
+    if lsa and os.path.isdir(lsa):
+        from lsa import LsaIndex
+
+        attach_lsa(vect, matrix, LsaIndex.load(lsa))
+    if vectors and os.path.isdir(vectors):
+        from word_vectors import WordVectors
+
+        attach_word_vectors(vect, matrix, WordVectors.load(vectors), terms_es)
+    if neighbors and os.path.exists(neighbors):
+        attach_neighbors(matrix, load_graph(neighbors))
+    record_index(terms_es, matrix)
     return vect, matrix
 
 
-def extract_ngrams(text, max_n=5):
-    tokens = [t.lower() for t in re.findall(r"\b\w+\b", text)]
-    ngrams = set()
-    for n in range(1, max_n+1):
-        for i in range(len(tokens)-n+1):
-            ngrams.add(" ".join(tokens[i:i+n]))
-    return ngrams
+@st.cache_resource(show_spinner=False)
+def start_metrics(port):
+    enable_stage_metrics()
+    return serve_metrics(port)
 
 
-def suggest_indices(summary, terms, vect, matrix, k=3):
-    # Coincidencias exactas de n-gramas
-    ngrams = extract_ngrams(summary, max_n=5)
-    exact = sorted(
-        (i for i, term in enumerate(terms) if term in ngrams),
-        key=lambda idx: len(terms[idx].split()),
-        reverse=True
-    )
-    if len(exact) >= k:
-        return exact[:k]
-
-    # TF-IDF con boost de salud
-    sims = cosine_similarity(vect.transform([summary]), matrix).flatten()
-    scored = []
-    for i, score in enumerate(sims):
-        boost = 0.3 if any(h in terms[i] for h in HEALTH_KEYWORDS) else 0
-        scored.append((i, score + boost))
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    combined = exact.copy()
-    for idx, _ in scored:
-        if idx not in combined:
-            combined.append(idx)
-        if len(combined) >= k:
-            break
-    return combined
+@st.cache_resource(show_spinner=False)
+def load_autocomplete():
+    return TermAutocomplete(load_store())
+
+
+def get_index():
+    misses = CACHE_REQUESTS.value("engine_resource", "miss")
+    index = load_index()
+    if CACHE_REQUESTS.value("engine_resource", "miss") == misses:
+        record_cache("engine_resource", hit=True)
+    return index
 
 
 def main():
@@ -79,20 +123,102 @@ def main():
         "Este generador usa un vocabulario alineado inmutable en ambos idiomas."
     )
 
-    vect, matrix = prepare_vectorizer(terms_es)
+    show_timings = st.sidebar.checkbox("Mostrar tiempos por etapa")
+    if METRICS_PORT:
+        start_metrics(int(METRICS_PORT))
+
+    with TIMER.collect("load_index") as load_timings:
+        vect, matrix = get_index()
+    store = load_store()
     summary = st.text_area("Tu resumen u objetivo aquí:", height=200)
     k = st.slider("Número de palabras clave", 1, 10, 3)
+    fuzzy = st.checkbox("Tolerar erratas y tildes omitidas", value=False,
+                        help="Sin léxico (KEYWORDS_LEXICON) solo se restauran tildes.")
+    show_related = st.checkbox("Mostrar palabras clave relacionadas", value=True)
+    domains = st.multiselect("Limitar a dominios", list(DOMAIN_LABELS),
+                             format_func=DOMAIN_LABELS.get)
+    scorers = available_scorers(matrix)
+    scorer = st.sidebar.selectbox("Puntuación del fallback", scorers,
+                                  index=scorers.index(DEFAULT_SCORER))
+    if FUSION_PROFILE and os.path.exists(FUSION_PROFILE):
+        load_profile(FUSION_PROFILE)
+    fusion = st.sidebar.selectbox("Fusión de señales", ["ninguna"] + available_profiles(scorers))
+    fusion = PROFILES.get(fusion)
+    mmr = None
+    if st.sidebar.checkbox("Diversificar sugerencias (MMR)"):
+        mmr = st.sidebar.slider("λ de MMR (1 = solo relevancia)", 0.0, 1.0, MMR_LAMBDA)
 
     if st.button("Generar palabras clave"):
         if not summary.strip():
             st.warning("Por favor ingresa un resumen.")
-            return
-        idxs = suggest_indices(summary, terms_es, vect, matrix, k)
-        st.markdown("**Palabras clave sugeridas:**")
-        for idx in idxs:
-            es = terms_es[idx].capitalize()
-            en = terms_en[idx].capitalize()
-            st.write(f"- ES: {es}   |   EN: {en}")
+        else:
+            show_suggestions(summary, k, vect, matrix, show_timings, load_timings, fuzzy,
+                             scorer, fusion, mmr, show_related, domains)
+
+    keyword_picker(store)
+
+
+def show_suggestions(summary, k, vect, matrix, show_timings=False, load_timings=None,
+                     fuzzy=False, scorer=DEFAULT_SCORER, fusion=None, mmr=None,
+                     show_related=False, domains=None):
+    store = load_store()
+    terms_es, terms_en = store.column('es'), store.column('en')
+    DOCUMENT_CHARS.observe(len(summary))
+    with TIMER.collect() as timings:
+        idxs = suggest_indices(summary, terms_es, vect, matrix, k, fuzzy=fuzzy, scorer=scorer,
+                               fusion=fusion, mmr=mmr, domains=domains or None)
+    REQUEST_SECONDS.observe(sum(timings.values()), "streamlit")
+    st.markdown("**Palabras clave sugeridas:**")
+    for idx in idxs:
+        es = terms_es[idx].capitalize()
+        en = terms_en[idx].capitalize()
+        st.write(f"- ES: {es}   |   EN: {en}")
+        if show_related:
+            # Un corte de la CSR del grafo de vecinos por sugerencia
+            ids, _ = related(get_neighbors(matrix), idx, RELATED_LIMIT)
+            if len(ids):
+                st.caption("Relacionadas: " + " · ".join(
+                    f"{terms_es[cid]} / {terms_en[cid]}" for cid in ids.tolist()))
+    if show_timings:
+        timings.update(load_timings or {})
+        show_timing_panel(timings)
+
+
+def _add_keyword(concept_id):
+    selected = st.session_state.setdefault("selected_keywords", [])
+    if concept_id not in selected:
+        selected.append(concept_id)
+
+
+def keyword_picker(store, limit=8):
+    # Búsqueda por prefijo/infijo sobre ES y EN (autocomplete.py). Streamlit
+    # vuelve a ejecutar el script al confirmar el texto (Enter o salir del campo).
+    st.markdown("**Añadir palabra clave del tesauro:**")
+    query = st.text_input("Escribe parte de un término (ES o EN):", key="kw_query")
+    if query.strip():
+        shown = set()
+        for completion in load_autocomplete().search(query, limit=limit):
+            cid = completion.concept_id
+            if cid in shown:
+                continue
+            shown.add(cid)
+            label = f"+ {store.term('es', cid)}  |  {store.term('en', cid)}"
+            st.button(label, key=f"add-{cid}", on_click=_add_keyword, args=(cid,))
+    selected = st.session_state.get("selected_keywords", [])
+    if selected:
+        st.markdown("**Palabras clave añadidas:**")
+        for cid in selected:
+            st.write(f"- ES: {store.term('es', cid).capitalize()}   |   "
+                     f"EN: {store.term('en', cid).capitalize()}")
+
+
+def show_timing_panel(timings):
+    st.sidebar.markdown("**Última consulta (ms):**")
+    st.sidebar.table([{"etapa": name, "ms": round(s * 1000.0, 2)}
+                      for name, s in timings.items()])
+    st.sidebar.markdown("**Acumulado en este proceso:**")
+    st.sidebar.table([{"etapa": name, "llamadas": v["calls"], "total_ms": round(v["total_ms"], 1)}
+                      for name, v in stage_timings().items()])
 
 if __name__ == "__main__":
     main()
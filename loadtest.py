@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Cliente de carga local para server.py.
+
+Abre `--clients` conexiones keep-alive que envían `--requests` resúmenes
+sintéticos cada una y muestra latencia p50/p99 vista por el cliente,
+throughput y las estadísticas del servidor (/stats).
+
+Uso:  python loadtest.py --spawn --clients 64 --requests 50
+      python loadtest.py --port 8765          (servidor ya en marcha)
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from compact_index import sample_summaries
+from concept_store import load_store
+
+
+async def _call(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                  "Content-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(host, port, summaries, k, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for summary in summaries:
+            started = time.perf_counter()
+            status, _ = await _call(reader, writer, "POST", "/suggest", {"summary": summary, "k": k})
+            if status != 200:
+                raise RuntimeError(f"respuesta HTTP {status}")
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients=32, requests=50, k=5, seed=0):
+    terms = load_store().column("es")
+    pool = sample_summaries(terms, n=clients * requests, seed=seed)
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, pool[i * requests:(i + 1) * requests], k, latencies)
+        for i in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, server_stats = await _call(reader, writer, "GET", "/stats")
+    writer.close()
+
+    lat = np.asarray(latencies) * 1000.0
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "latency_ms": {"p50": float(np.percentile(lat, 50)), "p99": float(np.percentile(lat, 99))},
+        "server": server_stats,
+    }
+
+
+async def _spawn_and_run(args):
+    from server import KeywordService, serve
+
+    service = KeywordService(args.max_batch, args.max_wait_ms)
+    ready = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(serve(service, args.host, 0, ready))
+    port = await ready
+    try:
+        return await run_load(args.host, port, args.clients, args.requests, args.k)
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de keywords")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--spawn", action="store_true",
+                        help="levanta el servidor en este mismo proceso")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    if args.spawn:
+        result = asyncio.run(_spawn_and_run(args))
+    else:
+        result = asyncio.run(run_load(args.host, args.port, args.clients, args.requests, args.k))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
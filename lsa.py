@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Índice semántico latente (LSA) sobre la matriz de términos.
+
+• fit_lsa(): TruncatedSVD de la matriz TF-IDF término×feature, opcionalmente
+  junto con documentos de un corpus de fondo (los términos son textos de
+  1-4 palabras y aportan poca co-ocurrencia por sí solos).
+• LsaIndex: embeddings float32 de los conceptos (filas L2) y la proyección
+  feature -> componente, guardados como .npy en un directorio y abiertos
+  con mmap: cargar el índice no lee los arrays hasta la primera consulta.
+• scores(): una consulta es un único producto matriz-vector
+  (embeddings @ q); search() añade el top-k parcial (argpartition).
+• Con un índice IVF (ann.py) en el subdirectorio ivf/, search() y
+  candidates() solo puntúan las celdas más cercanas (tesauros grandes).
+
+El índice depende del vocabulario del vectorizador: meta.json guarda una
+huella del vocabulario que check() (llamado por scorers.attach_lsa)
+compara con el vectorizador en uso.
+
+Uso:
+    python cli.py lsa --output lsa/ --components 128 --corpus resumenes/
+    python cli.py suggest --lsa lsa/ --scorer tfidf+lsa --text "..."
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from rowops import normalize_rows, term_rows
+from textnorm import STOP_WORDS
+
+N_COMPONENTS = 128
+MAX_CORPUS_DOCS = 20000
+
+
+def vocabulary_fingerprint(vect):
+    vocabulary = getattr(vect, "vocabulary_", None)
+    if vocabulary is None:
+        raise ValueError("LSA requiere un vectorizador con vocabulario (no el modo de hashing)")
+    features = sorted(vocabulary, key=vocabulary.get)
+    return hashlib.sha1("\n".join(features).encode("utf-8")).hexdigest()
+
+
+def _content_mask(vect):
+    # Las features formadas solo por palabras funcionales no entran en el espacio latente
+    vocabulary = vect.vocabulary_
+    mask = np.ones(len(vocabulary), dtype=np.float32)
+    for feature, col in vocabulary.items():
+        if all(token in STOP_WORDS for token in feature.split()):
+            mask[col] = 0.0
+    return mask
+
+
+def fit_lsa(vect, matrix, n_components=N_COMPONENTS, corpus=None,
+            max_docs=MAX_CORPUS_DOCS, seed=0):
+    """Ajusta el SVD truncado y devuelve un LsaIndex en memoria."""
+    from scipy import sparse
+    from sklearn.decomposition import TruncatedSVD
+
+    mask = sparse.diags(_content_mask(vect))
+    terms = term_rows(matrix) @ mask
+    fit_rows = terms
+    if corpus is not None:
+        docs = []
+        for doc in corpus:
+            docs.append(doc)
+            if len(docs) >= max_docs:
+                break
+        if docs:
+            fit_rows = sparse.vstack([terms, vect.transform(docs).astype(np.float32) @ mask])
+    n_components = min(n_components, min(fit_rows.shape) - 1)
+    svd = TruncatedSVD(n_components=n_components, random_state=seed)
+    svd.fit(fit_rows)
+    # Las filas de palabras funcionales quedan a cero: la consulta tampoco las usa
+    projection = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+    projection[mask.diagonal() == 0] = 0.0
+    embeddings = normalize_rows(np.asarray(terms @ projection, dtype=np.float32))
+    meta = {"n_components": int(n_components), "n_terms": int(terms.shape[0]),
+            "n_features": int(terms.shape[1]), "vocabulary": vocabulary_fingerprint(vect),
+            "corpus_docs": int(fit_rows.shape[0] - terms.shape[0]),
+            "explained_variance": float(svd.explained_variance_ratio_.sum())}
+    return LsaIndex(embeddings, projection, meta)
+
+
+class LsaIndex:
+    """Embeddings de conceptos (n_términos × k) + proyección (features × k)."""
+
+    def __init__(self, embeddings, projection, meta, ann=None):
+        self.embeddings = embeddings
+        self.projection = projection
+        self.meta = meta
+        self.ann = ann
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "embeddings.npy"), np.asarray(self.embeddings))
+        np.save(os.path.join(path, "projection.npy"), np.asarray(self.projection))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(self.meta, fh, indent=2)
+        if self.ann is not None:
+            self.ann.save(os.path.join(path, "ivf"))
+
+    @classmethod
+    def load(cls, path, mmap=True, nprobe=None):
+        mode = "r" if mmap else None
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        ann = None
+        if os.path.isdir(os.path.join(path, "ivf")):
+            from ann import IvfIndex
+
+            ann = IvfIndex.load(os.path.join(path, "ivf"), mmap)
+            if nprobe:
+                ann.nprobe = nprobe
+        return cls(np.load(os.path.join(path, "embeddings.npy"), mmap_mode=mode),
+                   np.load(os.path.join(path, "projection.npy"), mmap_mode=mode), meta, ann)
+
+    def check(self, vect, n_terms):
+        if self.meta["n_terms"] != n_terms:
+            raise ValueError(f"El índice LSA tiene {self.meta['n_terms']} términos, "
+                             f"el índice actual {n_terms}")
+        if self.meta["vocabulary"] != vocabulary_fingerprint(vect):
+            raise ValueError("El índice LSA se ajustó con otro vocabulario; vuelve a generarlo")
+
+    def project(self, queries):
+        """Consultas TF-IDF dispersas (n × features) -> vectores L2 (n × k)."""
+        return normalize_rows(np.asarray(queries @ self.projection, dtype=np.float32))
+
+    def scores(self, vectors):
+        """Coseno (n × n_términos): embeddings @ q para cada consulta."""
+        return np.asarray(vectors @ self.embeddings.T)
+
+    def candidates(self, vectors, k):
+        """Top-k aproximado por consulta con el IVF: (ids, scores), -1 si faltan."""
+        return self.ann.search(vectors, k)
+
+    def search(self, vector, k=10):
+        """Top-k (IDs, scores) para un único vector de consulta."""
+        if self.ann is not None:
+            ids, scores = self.ann.search(vector, k)
+            keep = ids[0] >= 0
+            return ids[0][keep], scores[0][keep]
+        scores = self.embeddings @ vector
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return best, scores[best]
+
+    @property
+    def nbytes(self):
+        return self.embeddings.nbytes + self.projection.nbytes
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas en proceso expuestas en formato de texto tipo Prometheus.
+
+• Counter, Gauge e Histogram con etiquetas; REGISTRY.render() produce el
+  texto de scrape.
+• Las etapas medidas por instrumentation.TIMER alimentan el histograma
+  keywords_stage_seconds en cuanto se llama a enable_stage_metrics().
+• serve_metrics(port) sirve /metrics en un hilo y su propio puerto (para
+  la app Streamlit); server.py la expone como una ruta más del servicio,
+  en el mismo puerto que /suggest.
+• Los valores se escriben sin redondear (enteros tal cual, floats con
+  repr) y las etiquetas se escapan según el formato de texto.
+• Cachés: el recurso del motor de la app (engine_resource) y la de
+  load_store. La app no tiene caché de rankings ni de PDF que medir.
+"""
+
+import math
+import numbers
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+LENGTH_BUCKETS = (100, 250, 500, 1000, 2500, 5000, 10000, 50000, 250000)
+
+
+def _escape(text, quotes=True):
+    text = str(text).replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quotes else text
+
+
+def _number(value):
+    # Enteros exactos y floats con repr: {:g} redondea a 6 cifras (1.23457e+06)
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    value = float(value)
+    if math.isfinite(value):
+        return repr(value)
+    return "NaN" if math.isnan(value) else ("+Inf" if value > 0 else "-Inf")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    inner = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + inner + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def header(self):
+        return [f"# HELP {self.name} {_escape(self.help, quotes=False)}",
+                f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Total acumulado con inc() o leído en cada scrape con `callback`."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def inc(self, amount=1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = self.header()
+        values = self.callback() if self.callback else self._values
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Valor fijado con set() o calculado en cada scrape con `callback`."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def set(self, value, *labels):
+        with self._lock:
+            self._values[labels] = value if isinstance(value, numbers.Integral) else float(value)
+
+    def render(self):
+        lines = self.header()
+        values = self.callback() if self.callback else self._values
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        for labels, (counts, total, n) in items:
+            names = self.labelnames + ("le",)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(names, labels + (le,))} {cumulative}")
+            suffix = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_number(total)}")
+            lines.append(f"{self.name}_count{suffix} {n}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def __contains__(self, name):
+        return name in self._metrics
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "keywords_stage_seconds", "Duración de cada etapa del motor.", ("stage",)))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "keywords_request_seconds", "Latencia extremo a extremo de una sugerencia.", ("source",)))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "keywords_batch_size", "Resúmenes por lote del micro-batcher.", buckets=SIZE_BUCKETS))
+DOCUMENT_CHARS = REGISTRY.register(Histogram(
+    "keywords_document_chars", "Longitud en caracteres de los resúmenes recibidos.",
+    buckets=LENGTH_BUCKETS))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "keywords_cache_requests_total", "Accesos a cachés por resultado (hit/miss).",
+    ("cache", "result")))
+INDEX_SIZE = REGISTRY.register(Gauge(
+    "keywords_index_size", "Tamaño del índice cargado.", ("component",)))
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(1, cache, "hit" if hit else "miss")
+
+
+def record_index(terms, matrix):
+    INDEX_SIZE.set(len(terms), "terms")
+    INDEX_SIZE.set(matrix.shape[1], "features")
+    INDEX_SIZE.set(matrix.nnz, "nnz")
+    nbytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    INDEX_SIZE.set(nbytes, "matrix_bytes")
+
+
+def _lru_counter(name, help_text, cached):
+    # Expone hits/misses (acumulados) de una función con functools.lru_cache
+    def values():
+        info = cached.cache_info()
+        return {("hit",): info.hits, ("miss",): info.misses}
+    return REGISTRY.register(Counter(name, help_text, ("result",), callback=values))
+
+
+def _observe_stage(name, seconds):
+    STAGE_SECONDS.observe(seconds, name)
+
+
+def enable_stage_metrics(timer=None):
+    """Activa TIMER y vuelca cada etapa medida en STAGE_SECONDS."""
+    if timer is None:
+        from instrumentation import TIMER as timer
+    from concept_store import load_store
+
+    if _observe_stage not in timer.listeners:
+        timer.listeners.append(_observe_stage)
+    timer.enable()
+    if "keywords_store_cache_total" not in REGISTRY:
+        _lru_counter("keywords_store_cache_total", "Accesos a la caché de ConceptStore.",
+                     load_store)
+
+
+# ------------------------------------------------------------
+#  Endpoint HTTP independiente (app Streamlit)
+# ------------------------------------------------------------
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_metrics(port, host="127.0.0.1"):
+    httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=httpd.serve_forever, name="metrics", daemon=True)
+    thread.start()
+    return httpd
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Grafo de vecinos concepto-concepto precalculado (top-N por coseno TF-IDF).
+
+• build_neighbors(): por bloques de filas y trozos de columnas,
+  bloque @ trozo.T (disperso) y top-N parcial (argpartition) que se mezcla
+  con el mejor top-N acumulado de la fila; se descarta la diagonal. La
+  memoria de trabajo es bloque × trozo, nunca n × n, de modo que escala a
+  vocabularios mucho mayores que el tesauro actual.
+• Con varias matrices alineadas por concepto (una por idioma) la similitud
+  es la media de los cosenos: "related keywords" en ES y EN a la vez.
+• El resultado es una CSR float32 (n × n) con como mucho N vecinos por
+  fila, ordenados de más a menos similar: los relacionados de un concepto
+  son el corte indptr[c]:indptr[c + 1] y la similitud entre dos términos
+  es una búsqueda en una fila de N elementos.
+• save_graph()/load_graph(): .npz sin comprimir con data/indices/indptr.
+• get_neighbors(matrix) construye el grafo una vez por índice (como
+  scorers.get_scorer) y attach_neighbors() asocia uno ya calculado.
+
+mmr.py lo usa para diversificar el top-k sin recalcular similitudes.
+
+Uso:
+    python cli.py neighbors --output vecinos.npz --neighbors 20
+    python server.py --neighbors vecinos.npz
+"""
+
+import weakref
+
+import numpy as np
+from scipy import sparse
+
+from instrumentation import TIMER
+from rowops import term_rows
+
+N_NEIGHBORS = 20
+BLOCK_ROWS = 1024
+CHUNK_COLS = 65536
+
+
+def _merge_top(best, top, cand, cand_scores, m):
+    # Mejores m de (acumulado ∪ trozo) por fila, ordenados (desempate por ID)
+    ids = np.concatenate([best, cand], axis=1)
+    scores = np.concatenate([top, cand_scores], axis=1)
+    if ids.shape[1] > m:
+        part = np.argpartition(-scores, m - 1, axis=1)[:, :m]
+        ids = np.take_along_axis(ids, part, axis=1)
+        scores = np.take_along_axis(scores, part, axis=1)
+    order = np.lexsort((ids, -scores), axis=1)
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def build_neighbors(matrices, n_neighbors=N_NEIGHBORS, block_rows=BLOCK_ROWS,
+                    chunk_cols=CHUNK_COLS, min_similarity=0.0):
+    """CSR (n × n) con los `n_neighbors` conceptos más similares de cada uno.
+
+    matrices: una matriz de términos o una lista de ellas alineadas por
+    concepto (se promedian los cosenos).
+    """
+    if not isinstance(matrices, (list, tuple)):
+        matrices = [matrices]
+    terms = [term_rows(m).astype(np.float32) for m in matrices]
+    n = terms[0].shape[0]
+    if any(t.shape[0] != n for t in terms):
+        raise ValueError("Las matrices deben tener los mismos conceptos (filas)")
+    m = min(n_neighbors, n - 1)
+    if m <= 0:
+        return sparse.csr_matrix((n, n), dtype=np.float32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indices, data = [], []
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        best = np.empty((stop - start, 0), dtype=np.int64)
+        top = np.empty((stop - start, 0), dtype=np.float32)
+        for col in range(0, n, chunk_cols):
+            end = min(col + chunk_cols, n)
+            sims = sum((t[start:stop] @ t[col:end].T).toarray() for t in terms) / len(terms)
+            # Diagonal (el propio concepto) dentro de este trozo
+            diagonal = np.arange(max(start, col), min(stop, end))
+            sims[diagonal - start, diagonal - col] = -np.inf
+            c = min(m, end - col)
+            part = np.argpartition(-sims, c - 1, axis=1)[:, :c]
+            best, top = _merge_top(best, top, part + col,
+                                   np.take_along_axis(sims, part, axis=1).astype(np.float32), m)
+        keep = top > min_similarity
+        indices.append(best[keep].astype(np.int32))
+        data.append(top[keep].astype(np.float32))
+        indptr[start + 1:stop + 1] = keep.sum(axis=1)
+    np.cumsum(indptr, out=indptr)
+    return sparse.csr_matrix((np.concatenate(data), np.concatenate(indices), indptr),
+                             shape=(n, n))
+
+
+def build_concept_graph(store, langs=("es", "en"), n_neighbors=N_NEIGHBORS,
+                        block_rows=BLOCK_ROWS, chunk_cols=CHUNK_COLS):
+    """Grafo de conceptos de un ConceptStore con un índice TF-IDF por idioma."""
+    from keyword_engine import prepare_vectorizer
+
+    matrices = [prepare_vectorizer(store.column(lang), compact="float32")[1] for lang in langs]
+    return build_neighbors(matrices, n_neighbors, block_rows, chunk_cols)
+
+
+def related(graph, concept_id, limit=None):
+    """(IDs, similitudes) de los vecinos de un concepto: un corte de la CSR."""
+    row = slice(graph.indptr[concept_id], graph.indptr[concept_id + 1])
+    ids, scores = graph.indices[row], graph.data[row]
+    return (ids, scores) if limit is None else (ids[:limit], scores[:limit])
+
+
+def save_graph(path, graph, langs=None):
+    np.savez(path, data=graph.data, indices=graph.indices, indptr=graph.indptr,
+             shape=np.array(graph.shape, dtype=np.int64),
+             langs=np.array(list(langs or []), dtype="U8"))
+
+
+def load_graph(path):
+    with np.load(path, allow_pickle=False) as snap:
+        return sparse.csr_matrix((snap["data"], snap["indices"], snap["indptr"]),
+                                 shape=tuple(snap["shape"]))
+
+
+def graph_nbytes(graph):
+    return graph.data.nbytes + graph.indices.nbytes + graph.indptr.nbytes
+
+
+# Un grafo por índice (id de la matriz); se libera con la matriz
+_GRAPHS = {}
+
+
+def attach_neighbors(matrix, graph):
+    if graph.shape[0] != matrix.shape[0]:
+        raise ValueError(f"El grafo tiene {graph.shape[0]} términos, el índice {matrix.shape[0]}")
+    key = id(matrix)
+    if key not in _GRAPHS:
+        weakref.finalize(matrix, _GRAPHS.pop, key, None)
+    _GRAPHS[key] = graph
+
+
+def get_neighbors(matrix):
+    graph = _GRAPHS.get(id(matrix))
+    if graph is None:
+        with TIMER.stage("neighbors_build"):
+            graph = build_neighbors(matrix)
+        attach_neighbors(matrix, graph)
+    return graph
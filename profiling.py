@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Perfilado reproducible de una consulta (o lote) de sugerencias.
+
+profile_suggest() ejecuta suggest_batch() una primera vez de
+calentamiento, para que el coste de construir los índices perezosos
+(corrector de erratas, scorers, grafo de vecinos) no se cargue al
+perfil, y después tres veces sobre la misma entrada. Deja en `out_dir`:
+
+• profile.pstats / profile.txt   cProfile (ordenado por tiempo acumulado
+                                 y por tiempo propio)
+• alloc.txt                      tracemalloc: asignaciones por línea
+• profile.collapsed              pilas colapsadas (flamegraph.pl, speedscope)
+
+Cada pasada usa una sola herramienta para no distorsionar las demás.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+from keyword_engine import suggest_batch
+
+
+def _frame_name(code):
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}:{code.co_firstlineno}"
+
+
+class _StackCollector:
+    """Tiempo propio por pila completa usando sys.setprofile."""
+
+    def __init__(self):
+        self.stacks = defaultdict(float)
+        self.stack = []
+        self.last = None
+
+    def _charge(self, now):
+        if self.stack and self.last is not None:
+            self.stacks[";".join(self.stack)] += now - self.last
+        self.last = now
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter()
+        if event == "call":
+            self._charge(now)
+            self.stack.append(_frame_name(frame.f_code))
+        elif event == "c_call":
+            self._charge(now)
+            self.stack.append(f"<c>:{getattr(arg, '__qualname__', repr(arg))}")
+        elif event in ("return", "c_return", "c_exception"):
+            self._charge(now)
+            if self.stack:
+                self.stack.pop()
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, seconds in sorted(self.stacks.items()):
+                micros = int(seconds * 1e6)
+                if micros:
+                    fh.write(f"{stack} {micros}\n")
+
+
+def profile_suggest(summaries, terms, vect, matrix, k=3, out_dir="profile", top=40,
+                    **options):
+    """Perfila suggest_batch(summaries, ...) y devuelve las rutas generadas.
+
+    options: argumentos de suggest_batch (fuzzy, scorer, fusion, mmr, ...).
+    """
+    if isinstance(summaries, str):
+        summaries = [summaries]
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+
+    def run():
+        return suggest_batch(summaries, terms, vect, matrix, k, **options)
+
+    # 0) calentamiento: los índices perezosos no cuentan en el perfil
+    run()
+
+    # 1) cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    result = run()
+    profiler.disable()
+    paths["pstats"] = os.path.join(out_dir, "profile.pstats")
+    profiler.dump_stats(paths["pstats"])
+    report = io.StringIO()
+    stats = pstats.Stats(profiler, stream=report).strip_dirs()
+    for key in ("cumulative", "tottime"):
+        report.write(f"==== ordenado por {key} ====\n")
+        stats.sort_stats(key).print_stats(top)
+    paths["report"] = os.path.join(out_dir, "profile.txt")
+    with open(paths["report"], "w", encoding="utf-8") as fh:
+        fh.write(report.getvalue())
+
+    # 2) tracemalloc
+    tracemalloc.start(25)
+    try:
+        run()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    paths["alloc"] = os.path.join(out_dir, "alloc.txt")
+    with open(paths["alloc"], "w", encoding="utf-8") as fh:
+        fh.write(f"actual={current} B  pico={peak} B\n\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            fh.write(f"{stat}\n")
+
+    # 3) pilas colapsadas
+    collector = _StackCollector()
+    sys.setprofile(collector)
+    try:
+        run()
+    finally:
+        sys.setprofile(None)
+    paths["collapsed"] = os.path.join(out_dir, "profile.collapsed")
+    collector.write(paths["collapsed"])
+    return result, paths
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Operaciones por filas compartidas por índices, scorers y fusión.
+
+• term_rows(): la matriz de términos como CSR float32, sea una CSR, una
+  CompactMatrix o un FusedMatrix (se toma su parte de palabras).
+• normalize_rows(): filas a norma L2 unidad (las nulas quedan a cero).
+• scale_to_peak(): divide cada fila por su máximo, para que señales con
+  escalas distintas (BM25, n-gramas de caracteres) queden en [0, 1].
+"""
+
+import numpy as np
+from scipy import sparse
+
+
+def term_rows(matrix):
+    word = getattr(matrix, "word", matrix)
+    return word.to_csr() if hasattr(word, "to_csr") else sparse.csr_matrix(word, dtype=np.float32)
+
+
+def normalize_rows(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def scale_to_peak(scores):
+    peak = scores.max(axis=1, keepdims=True)
+    peak[peak == 0] = 1.0
+    return scores / peak
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Puntuación de términos para el fallback de suggest_* (tras las exactas).
+
+Un scorer recibe resúmenes y devuelve una matriz densa
+(n_resúmenes × n_términos); el motor le suma el peso a priori de dominios
+y ordena. Todo es álgebra dispersa: ningún bucle Python por término.
+
+• TfidfScorer ("tfidf", por defecto): coseno TF-IDF (similarities()).
+• CharScorer ("char"): solo el coseno de n-gramas de caracteres (reescalado
+  por resumen) de un FusedMatrix; útil como señal aparte en fusion.py.
+• LsaScorer ("lsa") y TfidfLsaScorer ("tfidf+lsa"): coseno en el espacio
+  LSA (lsa.py) solo o combinado linealmente con el TF-IDF. Necesitan
+  attach_lsa(vect, matrix, lsa_index). Si el índice LSA trae IVF solo se
+  puntúan ANN_CANDIDATES conceptos por consulta (el resto queda a 0).
+• WordVectorScorer ("wordvec") y TfidfWordVectorScorer ("tfidf+wordvec"):
+  coseno entre medias de vectores de palabras preentrenados
+  (word_vectors.py) del resumen y de cada término. Necesitan
+  attach_word_vectors(vect, matrix, vectors, terms).
+• BM25Scorer ("bm25"): BM25 sobre el mismo índice (vocabulario e idf del
+  vectorizador; con FusedMatrix, solo la parte de palabras). La matriz
+  término×feature se precalcula con la saturación de tf y la
+  normalización por longitud:
+      w(t, f) = idf(f) · tf · (k1 + 1) / (tf + k1 · (1 - b + b · |t| / avg|t|))
+  y la consulta es la presencia de cada feature en el resumen, de modo que
+  la puntuación es un único producto disperso. Se reescala a [0, 1] por
+  resumen (dividiendo por el máximo) para que el boost a priori de
+  dominios pese lo mismo que con el coseno.
+
+get_scorer(name, vect, matrix) construye cada scorer una vez por índice.
+ATTACHED indica, para los scorers con índice adicional, qué índice falta.
+"""
+
+import weakref
+
+import numpy as np
+from scipy import sparse
+
+from char_index import FusedMatrix
+from compact_index import CompactMatrix
+from instrumentation import TIMER
+from rowops import scale_to_peak
+
+DEFAULT_SCORER = "tfidf"
+
+# Candidatos por consulta cuando el índice LSA tiene IVF (ann.py)
+ANN_CANDIDATES = 200
+
+
+def similarities(vect, matrix, summaries, queries=None):
+    # queries: vect.transform(summaries) ya calculado (lo comparten scorers híbridos)
+    if isinstance(matrix, FusedMatrix):
+        word = similarities(vect, matrix.word, summaries, queries)
+        with TIMER.stage("char_ngrams"):
+            char = matrix.char.similarities(summaries)
+        return matrix.fuse(word, char)
+    if queries is None:
+        with TIMER.stage("tfidf_transform"):
+            queries = vect.transform(summaries)
+    with TIMER.stage("tfidf_product"):
+        if isinstance(matrix, CompactMatrix):
+            return matrix.similarities(queries)
+        # Filas TF-IDF ya normalizadas (L2): el coseno es el producto escalar
+        return (queries @ matrix.T).toarray()
+
+
+class TfidfScorer:
+    name = "tfidf"
+
+    def __init__(self, vect, matrix):
+        self.vect = vect
+        self.matrix = matrix
+
+    def scores(self, summaries):
+        return similarities(self.vect, self.matrix, summaries)
+
+
+def _term_counts(vect, matrix):
+    # tf por (término, feature) a partir de la matriz TF-IDF: en cada fila
+    # peso / idf es proporcional a tf y el menor corresponde a tf = 1
+    m = matrix.word if isinstance(matrix, FusedMatrix) else matrix
+    if isinstance(m, CompactMatrix):
+        m = m.to_csr(np.float64)
+    else:
+        m = sparse.csr_matrix(m, dtype=np.float64)
+    ratio = m.data / np.asarray(vect.idf_, dtype=np.float64)[m.indices]
+    lengths = np.diff(m.indptr)
+    rows = np.repeat(np.arange(m.shape[0]), lengths)
+    row_min = np.full(m.shape[0], np.inf)
+    np.minimum.at(row_min, rows, ratio)
+    tf = np.maximum(np.rint(ratio / row_min[rows]), 1.0)
+    return sparse.csr_matrix((tf, m.indices.copy(), m.indptr.copy()), shape=m.shape)
+
+
+class BM25Scorer:
+    name = "bm25"
+
+    def __init__(self, vect, matrix, k1=1.2, b=0.75):
+        self.vect = vect
+        self.k1 = k1
+        self.b = b
+        counts = _term_counts(vect, matrix)
+        lengths = np.asarray(counts.sum(axis=1)).ravel()
+        avg = lengths.mean() if len(lengths) else 1.0
+        rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        tf = counts.data
+        norm = k1 * (1.0 - b + b * lengths[rows] / avg)
+        idf = np.asarray(vect.idf_, dtype=np.float64)[counts.indices]
+        weights = (idf * tf * (k1 + 1.0) / (tf + norm)).astype(np.float32)
+        # Traspuesta (features × términos) para multiplicar consulta @ pesos
+        self.weights = sparse.csr_matrix((weights, counts.indices, counts.indptr),
+                                         shape=counts.shape).T.tocsr()
+
+    def scores(self, summaries):
+        with TIMER.stage("bm25_transform"):
+            queries = self.vect.transform(summaries)
+            queries.data[:] = 1.0
+        with TIMER.stage("bm25_product"):
+            return scale_to_peak((queries.astype(np.float32) @ self.weights).toarray())
+
+    @property
+    def nbytes(self):
+        w = self.weights
+        return w.data.nbytes + w.indices.nbytes + w.indptr.nbytes
+
+
+class CharScorer:
+    """Coseno de n-gramas de caracteres de un FusedMatrix (char_weight)."""
+
+    name = "char"
+
+    def __init__(self, vect, matrix):
+        if not isinstance(matrix, FusedMatrix):
+            raise ValueError("El scorer 'char' requiere un índice con char_weight")
+        self.vect = vect
+        self.char = matrix.char
+
+    def scores(self, summaries):
+        with TIMER.stage("char_ngrams"):
+            scores = self.char.similarities(summaries)
+        return scale_to_peak(scores)
+
+    @property
+    def nbytes(self):
+        return self.char.nbytes
+
+
+class LsaScorer:
+    """Coseno en el espacio LSA (lsa.LsaIndex); requiere attach_lsa()."""
+
+    name = "lsa"
+
+    def __init__(self, vect, lsa):
+        self.vect = vect
+        self.lsa = lsa
+
+    def _lsa_scores(self, queries):
+        with TIMER.stage("lsa_project"):
+            vectors = self.lsa.project(queries)
+        if self.lsa.ann is not None:
+            with TIMER.stage("lsa_ann"):
+                ids, top = self.lsa.candidates(vectors, ANN_CANDIDATES)
+                scores = np.zeros((len(vectors), len(self.lsa.embeddings)), dtype=np.float32)
+                rows = np.repeat(np.arange(len(vectors)), ids.shape[1]).reshape(ids.shape)
+                keep = ids >= 0
+                scores[rows[keep], ids[keep]] = np.maximum(top[keep], 0.0)
+                return scores
+        with TIMER.stage("lsa_product"):
+            # Conceptos sin relación (coseno negativo) no restan
+            return np.maximum(self.lsa.scores(vectors), 0.0)
+
+    def scores(self, summaries):
+        with TIMER.stage("tfidf_transform"):
+            queries = self.vect.transform(summaries)
+        return self._lsa_scores(queries)
+
+    @property
+    def nbytes(self):
+        return self.lsa.nbytes
+
+
+class TfidfLsaScorer(LsaScorer):
+    """(1 - weight) · coseno TF-IDF + weight · coseno LSA, con una sola transform()."""
+
+    name = "tfidf+lsa"
+
+    def __init__(self, vect, lsa, matrix, weight=0.3):
+        super().__init__(vect, lsa)
+        self.matrix = matrix
+        self.weight = weight
+
+    def scores(self, summaries):
+        with TIMER.stage("tfidf_transform"):
+            queries = self.vect.transform(summaries)
+        tfidf = similarities(self.vect, self.matrix, summaries, queries)
+        return (1.0 - self.weight) * tfidf + self.weight * self._lsa_scores(queries)
+
+
+class WordVectorScorer:
+    """Coseno entre medias de vectores de palabras; requiere attach_word_vectors()."""
+
+    name = "wordvec"
+
+    def __init__(self, vect, vectors, term_embeddings):
+        self.vect = vect
+        self.vectors = vectors
+        self.term_embeddings = term_embeddings
+
+    def _vector_scores(self, summaries):
+        with TIMER.stage("wordvec_embed"):
+            queries = self.vectors.embed(summaries)
+        with TIMER.stage("wordvec_product"):
+            return np.maximum(queries @ self.term_embeddings.T, 0.0)
+
+    def scores(self, summaries):
+        return self._vector_scores(summaries)
+
+    @property
+    def nbytes(self):
+        # La matriz de vectores está en mmap: solo cuentan los embeddings de términos
+        return self.term_embeddings.nbytes
+
+
+class TfidfWordVectorScorer(WordVectorScorer):
+    """(1 - weight) · coseno TF-IDF + weight · coseno de vectores de palabras."""
+
+    name = "tfidf+wordvec"
+
+    def __init__(self, vect, vectors, term_embeddings, matrix, weight=0.3):
+        super().__init__(vect, vectors, term_embeddings)
+        self.matrix = matrix
+        self.weight = weight
+
+    def scores(self, summaries):
+        tfidf = similarities(self.vect, self.matrix, summaries)
+        return (1.0 - self.weight) * tfidf + self.weight * self._vector_scores(summaries)
+
+
+SCORERS = {"tfidf": TfidfScorer, "bm25": BM25Scorer, "char": CharScorer, "lsa": LsaScorer,
+           "tfidf+lsa": TfidfLsaScorer, "wordvec": WordVectorScorer,
+           "tfidf+wordvec": TfidfWordVectorScorer}
+# Scorers que necesitan un índice adicional asociado a la matriz -> opción que lo carga
+ATTACHED = {"lsa": "lsa", "tfidf+lsa": "lsa", "wordvec": "vectors", "tfidf+wordvec": "vectors"}
+
+# Un scorer por índice (id de la matriz); se libera con la matriz
+_CACHE = {}
+
+
+def get_scorer(name, vect, matrix):
+    if name not in SCORERS:
+        raise ValueError(f"Scorer desconocido: {name!r} (opciones: {', '.join(SCORERS)})")
+    if name == "tfidf":
+        # Sin precálculo: no merece la pena cachearlo
+        return TfidfScorer(vect, matrix)
+    key = (name, id(matrix))
+    scorer = _CACHE.get(key)
+    if scorer is None or scorer.vect is not vect:
+        if name in ATTACHED:
+            raise ValueError(f"El scorer {name!r} requiere asociar un índice "
+                             f"{ATTACHED[name]!r} (attach_lsa / attach_word_vectors)")
+        scorer = _CACHE[key] = SCORERS[name](vect, matrix)
+        weakref.finalize(matrix, _CACHE.pop, key, None)
+    return scorer
+
+
+def attach_lsa(vect, matrix, lsa, weight=0.3):
+    """Asocia un lsa.LsaIndex al índice (vect, matrix): habilita "lsa" y "tfidf+lsa"."""
+    lsa.check(vect, matrix.shape[0])
+    _attach(matrix, LsaScorer(vect, lsa), TfidfLsaScorer(vect, lsa, matrix, weight))
+
+
+def attach_word_vectors(vect, matrix, vectors, terms, weight=0.3):
+    """Asocia word_vectors.WordVectors al índice: habilita "wordvec" y "tfidf+wordvec".
+
+    `terms` son los términos de las filas de `matrix` (se incrustan una vez).
+    """
+    if len(terms) != matrix.shape[0]:
+        raise ValueError(f"{len(terms)} términos para un índice de {matrix.shape[0]} filas")
+    with TIMER.stage("wordvec_terms"):
+        embeddings = vectors.embed(list(terms))
+    _attach(matrix, WordVectorScorer(vect, vectors, embeddings),
+            TfidfWordVectorScorer(vect, vectors, embeddings, matrix, weight))
+
+
+def _attach(matrix, *scorers):
+    for scorer in scorers:
+        key = (scorer.name, id(matrix))
+        if key not in _CACHE:
+            weakref.finalize(matrix, _CACHE.pop, key, None)
+        _CACHE[key] = scorer
+
+
+def available_scorers(matrix):
+    return [name for name in SCORERS
+            if (name not in ATTACHED or (name, id(matrix)) in _CACHE)
+            and (name != "char" or isinstance(matrix, FusedMatrix))]
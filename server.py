@@ -0,0 +1,486 @@
+# -*- coding: utf-8 -*-
+"""
+Servicio HTTP/JSON local del generador de keywords (asyncio, sin Streamlit).
+
+• POST /suggest  {"summary": "...", "k": 3, "budget_ms": 20, "fuzzy": false,
+                  "scorer": "tfidf" | "bm25" | "lsa" | "tfidf+lsa" | "wordvec" | "tfidf+wordvec",
+                  "fusion": "rrf" | "linear" | perfil de --fusion-profile,
+                  "mmr": 0.5 (λ de diversificación, opcional),
+                  "domains": ["health", "education"] (facetas de domains.py, opcional)}
+                 ->  {"keywords": [...], "stages": [...], "degraded": false}
+• GET  /stats    latencias p50/p99, throughput e histograma de lotes
+• GET  /autocomplete?q=odont&limit=10   términos ES/EN por prefijo o infijo
+• GET  /related?id=123&limit=10         conceptos relacionados (grafo de vecinos)
+• POST /translate {"keywords": ["salud", "dental health"], "source": "auto"}
+                 ->  {"translations": [{"input", "id", "source", "target", "text", ...}]}
+• GET  /health
+• GET  /metrics  contadores e histogramas en formato de texto (metrics.py)
+
+Las peticiones concurrentes que llegan dentro de `max_wait_ms` se agrupan
+(micro-batching) en una sola llamada a suggest_batch(), es decir, en un
+único producto disperso contra la matriz de términos.
+
+Bajo sobrecarga (más de `--shed-queue` peticiones en cola) el servicio
+descarta la etapa TF-IDF y responde solo con coincidencias exactas en vez
+de seguir encolando.
+
+Uso:  python server.py --port 8765 --max-batch 32 --max-wait-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import Counter, deque, namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from autocomplete import TermAutocomplete
+from concept_store import LANGS, load_store
+from keyword_engine import prepare_vectorizer, suggest_batch_detailed
+from metrics import (BATCH_SIZE, CONTENT_TYPE, DOCUMENT_CHARS, REGISTRY, REQUEST_SECONDS,
+                     enable_stage_metrics, record_index)
+from domains import DOMAINS
+from fusion import PROFILES, available_profiles, load_profile
+from neighbors import attach_neighbors, get_neighbors, load_graph, related
+from scorers import DEFAULT_SCORER, attach_lsa, attach_word_vectors, available_scorers
+from translate import KeywordTranslator
+
+MAX_K = 50
+MAX_BODY = 1 << 20
+
+# Petición de /suggest en la cola del micro-batcher
+SuggestItem = namedtuple("SuggestItem",
+                         "summary k budget queued fuzzy scorer fusion mmr domains")
+
+
+# ------------------------------------------------------------
+#  Estadísticas
+# ------------------------------------------------------------
+
+class ServiceStats:
+    """Latencias (ventana deslizante), throughput e histograma de lotes."""
+
+    def __init__(self, window=10000):
+        self.started = time.perf_counter()
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.batches = 0
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.batch_sizes[size] += 1
+        BATCH_SIZE.observe(size)
+
+    def record_request(self, latency):
+        self.requests += 1
+        self.latencies.append(latency)
+        REQUEST_SECONDS.observe(latency, "server")
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        lat = np.asarray(self.latencies) * 1000.0
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "throughput_rps": self.requests / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                "p50": float(np.percentile(lat, 50)) if len(lat) else None,
+                "p99": float(np.percentile(lat, 99)) if len(lat) else None,
+            },
+            "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+        }
+
+
+# ------------------------------------------------------------
+#  Micro-batching
+# ------------------------------------------------------------
+
+class MicroBatcher:
+    """Agrupa peticiones individuales en lotes de hasta `max_batch`.
+
+    El primer elemento de un lote espera como mucho `max_wait_ms` a que
+    lleguen más; `handler(items)` se ejecuta en un hilo y devuelve un
+    resultado por elemento.
+    """
+
+    def __init__(self, handler, max_batch=32, max_wait_ms=2.0, stats=None):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.stats = stats or ServiceStats()
+        self.queue = asyncio.Queue()
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.stats.record_batch(len(batch))
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.handler, items)
+            except Exception as exc:  # se propaga a cada petición del lote
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+# ------------------------------------------------------------
+#  Servicio
+# ------------------------------------------------------------
+
+LIMIT_ERROR = f"'limit' debe ser un entero positivo (se acota a {MAX_K})"
+
+
+def _limit(query):
+    # 'limit' de la query string: entero >= 1, acotado a MAX_K; si no, ValueError
+    limit = int(query.get("limit", ["10"])[0])
+    if limit < 1:
+        raise ValueError(f"limit={limit}")
+    return min(limit, MAX_K)
+
+
+class KeywordService:
+    """Índice cargado una vez + micro-batcher + rutas HTTP."""
+
+    def __init__(self, max_batch=32, max_wait_ms=2.0, compact=None, shed_queue=None,
+                 char_weight=None, idf=None, lsa=None, vectors=None, fusion_profiles=(),
+                 neighbors=None):
+        self.shed_queue = shed_queue
+        self.store = load_store()
+        self.terms = self.store.column("es")
+        self.autocomplete = TermAutocomplete(self.store)
+        self.translator = KeywordTranslator(self.store, self.autocomplete)
+        for lang in LANGS:
+            # Índices de erratas construidos al arrancar, no en la primera petición
+            self.store.column(lang).corrector
+        enable_stage_metrics()
+        self.vect, self.matrix = prepare_vectorizer(self.terms, compact=compact,
+                                                    char_weight=char_weight, idf=idf)
+        if lsa:
+            from lsa import LsaIndex
+
+            attach_lsa(self.vect, self.matrix, LsaIndex.load(lsa))
+        if vectors:
+            from word_vectors import WordVectors
+
+            attach_word_vectors(self.vect, self.matrix, WordVectors.load(vectors), self.terms)
+        for path in fusion_profiles:
+            load_profile(path)
+        # Grafo de vecinos (MMR y /related): el de 'cli.py neighbors' o el del índice ES
+        if neighbors:
+            attach_neighbors(self.matrix, load_graph(neighbors))
+        self.graph = get_neighbors(self.matrix)
+        record_index(self.terms, self.matrix)
+        self.stats = ServiceStats()
+        self.batcher = MicroBatcher(self._suggest_many, max_batch, max_wait_ms, self.stats)
+
+    def _suggest_many(self, items):
+        # El presupuesto descuenta el tiempo que la petición pasó en cola
+        now = time.perf_counter()
+        budgets = [None if item.budget is None
+                   else max(item.budget - (now - item.queued) * 1000.0, 0.0)
+                   for item in items]
+        return suggest_batch_detailed(
+            [item.summary for item in items], self.terms, self.vect, self.matrix,
+            [item.k for item in items], budgets, [item.fuzzy for item in items],
+            [item.scorer for item in items], [item.fusion for item in items],
+            [item.mmr for item in items], domains=[item.domains for item in items])
+
+    def _keywords(self, ids):
+        return [{"id": cid, "es": self.store.term("es", cid), "en": self.store.term("en", cid)}
+                for cid in ids]
+
+    async def suggest(self, payload):
+        summary = payload.get("summary")
+        if not isinstance(summary, str) or not summary.strip():
+            return 400, {"error": "'summary' debe ser un texto no vacío"}
+        k = payload.get("k", 3)
+        if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= MAX_K:
+            return 400, {"error": f"'k' debe ser un entero entre 1 y {MAX_K}"}
+        budget = payload.get("budget_ms")
+        if budget is not None and (isinstance(budget, bool) or not isinstance(budget, (int, float))
+                                   or not math.isfinite(budget) or budget < 0):
+            return 400, {"error": "'budget_ms' debe ser un número finito no negativo"}
+        fuzzy = payload.get("fuzzy", False)
+        if not isinstance(fuzzy, bool):
+            return 400, {"error": "'fuzzy' debe ser booleano"}
+        scorer = payload.get("scorer", DEFAULT_SCORER)
+        allowed = available_scorers(self.matrix)
+        if scorer not in allowed:
+            return 400, {"error": f"'scorer' debe ser uno de: {', '.join(allowed)}"}
+        fusion = payload.get("fusion")
+        if fusion is not None:
+            profiles = available_profiles(allowed)
+            if fusion not in profiles:
+                return 400, {"error": f"'fusion' debe ser uno de: {', '.join(profiles)}"}
+            fusion = PROFILES[fusion]
+        mmr = payload.get("mmr")
+        if mmr is not None and (isinstance(mmr, bool) or not isinstance(mmr, (int, float))
+                                or not 0.0 <= mmr <= 1.0):
+            return 400, {"error": "'mmr' debe ser un número entre 0 y 1"}
+        domains = payload.get("domains")
+        if domains is not None and (not isinstance(domains, list) or not all(
+                isinstance(d, str) and d in DOMAINS for d in domains)):
+            return 400, {"error": f"'domains' debe ser una lista de: {', '.join(DOMAINS)}"}
+        DOCUMENT_CHARS.observe(len(summary))
+        if self.shed_queue is not None and self.batcher.queue.qsize() >= self.shed_queue:
+            budget = 0
+        started = time.perf_counter()
+        item = SuggestItem(summary, k, budget, started, fuzzy, scorer, fusion, mmr,
+                           domains or None)
+        result = await self.batcher.submit(item)
+        self.stats.record_request(time.perf_counter() - started)
+        return 200, {"keywords": self._keywords(result.indices),
+                     "stages": list(result.stages), "degraded": result.degraded}
+
+    def complete(self, query):
+        q = query.get("q", [""])[0]
+        try:
+            limit = _limit(query)
+        except ValueError:
+            return 400, {"error": LIMIT_ERROR}
+        matches = self.autocomplete.search(q, limit) if q.strip() else []
+        return 200, {"matches": [
+            {"id": m.concept_id, "lang": m.lang, "match": m.match,
+             "es": self.store.term("es", m.concept_id), "en": self.store.term("en", m.concept_id)}
+            for m in matches]}
+
+    def related(self, query):
+        try:
+            cid = int(query.get("id", [""])[0])
+        except ValueError:
+            return 400, {"error": "'id' debe ser un entero"}
+        try:
+            limit = _limit(query)
+        except ValueError:
+            return 400, {"error": LIMIT_ERROR}
+        if not 0 <= cid < len(self.store):
+            return 404, {"error": "concepto no encontrado"}
+        ids, scores = related(self.graph, cid, limit)
+        return 200, {"id": cid, "related": [
+            dict(keyword, score=round(float(s), 3))
+            for keyword, s in zip(self._keywords(ids.tolist()), scores)]}
+
+    def translate(self, payload):
+        keywords = payload.get("keywords")
+        if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+            return 400, {"error": "'keywords' debe ser una lista de textos"}
+        source = payload.get("source", "auto")
+        if source not in ("auto", "es", "en"):
+            return 400, {"error": "'source' debe ser 'auto', 'es' o 'en'"}
+        fuzzy = payload.get("fuzzy", True)
+        if not isinstance(fuzzy, bool):
+            return 400, {"error": "'fuzzy' debe ser booleano"}
+        return 200, {"translations": [
+            {"input": t.source_text, "id": t.concept_id, "source": t.source,
+             "target": t.target, "text": t.text, "match": t.match, "score": round(t.score, 3)}
+            for t in self.translator.translate_many(keywords, source, fuzzy)]}
+
+    async def route(self, method, path, body, query=None):
+        if method == "POST" and path == "/suggest":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return 400, {"error": "JSON inválido"}
+            if not isinstance(payload, dict):
+                return 400, {"error": "se esperaba un objeto JSON"}
+            return await self.suggest(payload)
+        if method == "POST" and path == "/translate":
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                return 400, {"error": "JSON inválido"}
+            if not isinstance(payload, dict):
+                return 400, {"error": "se esperaba un objeto JSON"}
+            return self.translate(payload)
+        if method == "GET" and path == "/stats":
+            return 200, self.stats.snapshot()
+        if method == "GET" and path == "/metrics":
+            return 200, REGISTRY.render()
+        if method == "GET" and path == "/autocomplete":
+            # Se resuelve en el propio bucle: es sub-milisegundo y no se agrupa
+            return self.complete(query or {})
+        if method == "GET" and path == "/related":
+            return self.related(query or {})
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "terms": len(self.terms)}
+        return 404, {"error": "ruta no encontrada"}
+
+
+# ------------------------------------------------------------
+#  HTTP/1.1 mínimo sobre asyncio (keep-alive, Content-Length)
+# ------------------------------------------------------------
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class BadRequest(ValueError):
+    """Petición HTTP mal formada (400)."""
+
+
+class PayloadTooLarge(ValueError):
+    """Cuerpo mayor que MAX_BODY (413)."""
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split(" ", 2)
+    if len(parts) != 3:
+        raise BadRequest("línea de petición inválida")
+    method, target, version = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise BadRequest("Content-Length inválido") from None
+    if length < 0:
+        raise BadRequest("Content-Length inválido")
+    if length > MAX_BODY:
+        raise PayloadTooLarge("petición demasiado grande")
+    body = await reader.readexactly(length) if length else b""
+    keep_alive = (version.strip() == "HTTP/1.1"
+                  and headers.get("connection", "").lower() != "close")
+    url = urlsplit(target)
+    return method, url.path, parse_qs(url.query), body, keep_alive
+
+
+def _response(status, payload, keep_alive):
+    # str -> texto plano (scrape de métricas); cualquier otro valor -> JSON
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), CONTENT_TYPE
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        content_type = "application/json; charset=utf-8"
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def make_handler(service):
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except PayloadTooLarge as exc:
+                    writer.write(_response(413, {"error": str(exc)}, False))
+                    break
+                except ValueError as exc:
+                    writer.write(_response(400, {"error": str(exc)}, False))
+                    break
+                if request is None:
+                    break
+                method, path, query, body, keep_alive = request
+                try:
+                    status, payload = await service.route(method, path, body, query)
+                except Exception as exc:
+                    status, payload = 500, {"error": str(exc)}
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(service, host="127.0.0.1", port=8765, ready=None):
+    service.batcher.start()
+    server = await asyncio.start_server(make_handler(service), host, port)
+    if ready is not None:
+        ready.set_result(server.sockets[0].getsockname()[1])
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de keywords")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--compact", default=os.environ.get("KEYWORDS_INDEX_MODE") or None)
+    parser.add_argument("--shed-queue", type=int, default=None,
+                        help="cola a partir de la cual se omite la etapa TF-IDF")
+    parser.add_argument("--char-weight", type=float, default=None,
+                        help="fusiona un índice de n-gramas de caracteres con este peso (0-1)")
+    parser.add_argument("--idf", default=os.environ.get("KEYWORDS_IDF") or None,
+                        help="idf de corpus de fondo (.npz de 'cli.py idf')")
+    parser.add_argument("--lsa", default=os.environ.get("KEYWORDS_LSA") or None,
+                        help="índice LSA (directorio de 'cli.py lsa'): scorers lsa y tfidf+lsa")
+    parser.add_argument("--vectors", default=os.environ.get("KEYWORDS_VECTORS") or None,
+                        help="vectores de palabras ('cli.py vectors'): scorers wordvec")
+    parser.add_argument("--neighbors", default=os.environ.get("KEYWORDS_NEIGHBORS") or None,
+                        help="grafo de conceptos relacionados (.npz de 'cli.py neighbors')")
+    parser.add_argument("--fusion-profile", action="append", default=[], metavar="JSON",
+                        help="perfil de fusión adicional (fusion.py); repetible")
+    args = parser.parse_args(argv)
+
+    service = KeywordService(args.max_batch, args.max_wait_ms, args.compact, args.shed_queue,
+                             args.char_weight, args.idf, args.lsa, args.vectors,
+                             args.fusion_profile, args.neighbors)
+    print(f"Sirviendo en http://{args.host}:{args.port} "
+          f"(max_batch={args.max_batch}, max_wait_ms={args.max_wait_ms})")
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
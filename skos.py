@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura en streaming del RDF/XML SKOS del Tesauro UNESCO.
+
+iter_resources() recorre el fichero con xml.etree.ElementTree.iterparse y
+emite un SkosResource por cada recurso de primer nivel (hijo de rdf:RDF),
+vaciando el árbol tras procesarlo: la memoria no crece con el tamaño del
+fichero. Acepta las dos formas de RDF/XML habituales:
+
+    <rdf:Description rdf:about="..."><rdf:type rdf:resource="...#Concept"/>
+    <skos:Concept rdf:about="...">
+
+Tipos reconocidos: skos:Concept ("concept"), isothes:ConceptGroup /
+microtesauro ("group") y skos:Collection / dominio ("collection").
+"""
+
+from collections import namedtuple
+from xml.etree.ElementTree import iterparse
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+SKOS = "http://www.w3.org/2004/02/skos/core#"
+ISOTHES = "http://purl.org/iso25964/skos-thes#"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+KINDS = {
+    SKOS + "Concept": "concept",
+    ISOTHES + "ConceptGroup": "group",
+    SKOS + "Collection": "collection",
+}
+
+SkosResource = namedtuple("SkosResource", "uri kind labels broader narrower members")
+
+
+def _tag_uri(tag):
+    # "{espacio}nombre" de ElementTree -> URI completa "espacionombre"
+    return tag[1:].replace("}", "", 1) if tag.startswith("{") else tag
+
+
+def _resource(elem):
+    uri = elem.get(f"{{{RDF}}}about")
+    kind = KINDS.get(_tag_uri(elem.tag))
+    labels, broader, narrower, members = {}, [], [], []
+    for child in elem:
+        tag = child.tag
+        if tag == f"{{{RDF}}}type":
+            kind = kind or KINDS.get(child.get(f"{{{RDF}}}resource"))
+        elif tag == f"{{{SKOS}}}prefLabel":
+            lang = child.get(XML_LANG)
+            if lang and child.text:
+                labels[lang] = child.text.strip()
+        elif tag == f"{{{SKOS}}}broader":
+            broader.append(child.get(f"{{{RDF}}}resource"))
+        elif tag == f"{{{SKOS}}}narrower":
+            narrower.append(child.get(f"{{{RDF}}}resource"))
+        elif tag == f"{{{SKOS}}}member":
+            members.append(child.get(f"{{{RDF}}}resource"))
+    if uri is None or kind is None:
+        return None
+    return SkosResource(uri, kind, labels, broader, narrower, members)
+
+
+def iter_resources(path):
+    """SkosResource de cada concepto, grupo o colección del fichero."""
+    depth = 0
+    root = None
+    for event, elem in iterparse(path, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1:
+            resource = _resource(elem)
+            # Solo se conserva el recurso actual: memoria acotada
+            root.clear()
+            if resource is not None:
+                yield resource
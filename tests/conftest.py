@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+import pytest
+
+# Los módulos del proyecto están en la raíz del repositorio (sin paquete)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Léxico mínimo para que el corrector de erratas esté activo (fuzzy.py lo
+# lee al importarse): contiene las palabras válidas que usan las pruebas
+os.environ["KEYWORDS_LEXICON"] = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                              "data", "lexicon.dic")
+
+
+@pytest.fixture(scope="session")
+def store():
+    from concept_store import load_store
+
+    return load_store()
+
+
+@pytest.fixture(scope="session")
+def column(store):
+    return store.column("es")
+
+
+@pytest.fixture(scope="session")
+def index(column):
+    from keyword_engine import prepare_vectorizer
+
+    return prepare_vectorizer(column)
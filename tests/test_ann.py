@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from ann import IvfIndex, build_ivf, default_nlist, exact_search
+from benchmarks.ann import clustered
+
+
+@pytest.fixture(scope="module")
+def embeddings():
+    return clustered(2000, 16, 20, seed=1)
+
+
+def test_full_probe_equals_exact_search(embeddings):
+    queries = clustered(30, 16, 20, seed=2)
+    ivf = build_ivf(embeddings, nlist=16, iters=5)
+    ids, scores = ivf.search(queries, k=10, nprobe=16)
+    exact_ids, exact_scores = exact_search(embeddings, queries, k=10)
+    assert np.array_equal(ids, exact_ids)
+    assert np.allclose(scores, exact_scores, atol=1e-6)
+
+
+def test_partial_probe_scans_fewer_cells(embeddings):
+    queries = embeddings[:50]
+    ivf = build_ivf(embeddings, nlist=32, iters=5)
+    ids, _ = ivf.search(queries, k=1, nprobe=4)
+    # Cada vector está en la celda de su centroide más cercano: se encuentra a sí mismo
+    assert (ids[:, 0] == np.arange(50)).mean() >= 0.95
+
+
+def test_missing_candidates_are_padded():
+    vectors = np.eye(4, dtype=np.float32)
+    ivf = build_ivf(vectors, nlist=4, iters=1)
+    ids, scores = ivf.search(vectors[:1], k=3, nprobe=1)
+    assert ids[0].tolist() == [0, -1, -1]
+    assert np.isneginf(scores[0, 1:]).all()
+
+
+def test_cells_partition_all_vectors(embeddings, tmp_path):
+    ivf = build_ivf(embeddings, iters=3)
+    assert ivf.meta["nlist"] == default_nlist(len(embeddings))
+    assert sorted(ivf.ids.tolist()) == list(range(len(embeddings)))
+    assert ivf.offsets[-1] == len(embeddings)
+    ivf.save(str(tmp_path))
+    loaded = IvfIndex.load(str(tmp_path))
+    queries = embeddings[:5]
+    assert np.array_equal(loaded.search(queries, 5)[0], ivf.search(queries, 5)[0])
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from autocomplete import TermAutocomplete
+
+
+@pytest.fixture(scope="module")
+def complete(store):
+    return TermAutocomplete(store)
+
+
+def _kinds(matches):
+    return [m.match for m in matches]
+
+
+@pytest.mark.parametrize("query, lang", [("salud", "es"), ("health", "en")])
+def test_prefix_before_infix(complete, query, lang):
+    matches = complete.search(query, 8)
+    kinds = _kinds(matches)
+    assert kinds[0] == "prefix" and "infix" in kinds
+    assert kinds == sorted(kinds, key=("prefix", "infix").index)
+    assert all(m.lang == lang and query in m.term for m in matches)
+    # Entre los prefijos, el término exacto (el más corto) primero
+    assert matches[0].term == query
+
+
+def test_both_languages_resolve_to_the_same_concept(complete, store):
+    es = complete.search("educación", 1)[0]
+    en = complete.search("education", 1)[0]
+    assert (es.lang, en.lang) == ("es", "en")
+    assert es.concept_id == en.concept_id
+    assert store.term("en", es.concept_id) == "education"
+
+
+def test_accents_are_ignored(complete):
+    assert complete.search("educacion", 1)[0].term == "educación"
+
+
+@pytest.mark.parametrize("limit", [1, 3, 10])
+def test_limit_is_respected(complete, limit):
+    assert len(complete.search("edu", limit)) == limit
+    assert len(complete.search("dent", limit)) == limit
+
+
+def test_infix_prefers_word_starts(complete):
+    terms = [m.term for m in complete.infix("mental", 5)]
+    assert terms[0].split()[-1].startswith("mental")
+
+
+def test_no_results(complete):
+    assert complete.search("xq", 5) == []
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from benchmarks.pipeline import compare
+from benchmarks.synth import LENGTHS, generate, inflect
+
+
+def test_generate_is_deterministic(column):
+    first = generate(column, n=5, seed=3)
+    assert first == generate(column, n=5, seed=3)
+    assert first != generate(column, n=5, seed=4)
+
+
+def test_generate_plants_terms(column):
+    for doc in generate(column, n=5, seed=0):
+        assert len(doc.concept_ids) == LENGTHS["abstract"] * 3 // 100
+        assert all(column[cid] in doc.text for cid in doc.concept_ids)
+
+
+def test_inflect():
+    assert inflect("odontología") == "odontológica"
+    assert inflect("education", "en") == "educational"
+
+
+def _run(p50, noise=0.0, throughput=100.0):
+    return {"abstract": {"suggest": {"best_p50_ms": p50, "best_p50_ms_noise": noise,
+                                     "mean_ms": p50 * 3},
+                         "throughput_docs_s": throughput},
+            "meta": {"seed": 0}}
+
+
+def test_compare_flags_regressions():
+    assert compare(_run(1.1), _run(1.0)) == []
+    assert compare(_run(1.5), _run(1.0)) == [("abstract.suggest.best_p50_ms", 1.0, 1.5)]
+    assert compare(_run(1.0, throughput=50.0), _run(1.0)) == [
+        ("abstract.throughput_docs_s", 100.0, 50.0)]
+
+
+def test_compare_widens_threshold_with_noise():
+    # Con un 40% de ruido medido, +50% aún está dentro de tolerancia + ruido
+    assert compare(_run(1.5, noise=0.4), _run(1.0)) == []
+    assert compare(_run(1.5), _run(1.0, noise=0.4)) == []
+    assert compare(_run(1.7, noise=0.4), _run(1.0)) != []
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from keyword_engine import (CostEstimate, exact_matches, suggest_batch_detailed,
+                            suggest_detailed)
+
+SUMMARY = "Estudio sobre la epidemiología de la caries en escolares de zonas rurales"
+
+
+def test_over_budget_degrades_to_exact(column, index):
+    vect, matrix = index
+    result = suggest_detailed(SUMMARY, column, vect, matrix, k=10, budget_ms=0)
+    assert result.degraded is True
+    # El scorer se omitió: solo queda la etapa exacta y sus coincidencias
+    assert result.stages == ("exact",)
+    assert result.indices == exact_matches(SUMMARY, column)[:10].tolist()
+
+
+def test_within_budget_runs_scorer(column, index):
+    vect, matrix = index
+    result = suggest_detailed(SUMMARY, column, vect, matrix, k=10, budget_ms=60_000)
+    assert result.degraded is False
+    assert result.stages == ("exact", "tfidf")
+    assert len(result.indices) == 10
+
+
+def test_exact_hits_filling_k_are_never_degraded(column, index):
+    vect, matrix = index
+    result = suggest_detailed(SUMMARY, column, vect, matrix, k=1, budget_ms=0)
+    assert (result.degraded, result.stages) == (False, ("exact",))
+
+
+def test_budget_is_per_summary(column, index):
+    vect, matrix = index
+    tight, loose = suggest_batch_detailed([SUMMARY, SUMMARY], column, vect, matrix, k=10,
+                                          budget_ms=[0, 60_000])
+    assert tight.degraded and not loose.degraded
+    assert loose.stages == ("exact", "tfidf")
+
+
+def test_cost_estimate_moving_average():
+    cost = CostEstimate(alpha=0.5)
+    assert cost.predict(10) == 0.0
+    cost.update(0.2, n=2)
+    cost.update(0.3, n=1)
+    assert cost.predict(4) == pytest.approx(4 * (0.1 + 0.5 * (0.3 - 0.1)))
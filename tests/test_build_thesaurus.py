@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import importlib.util
+import json
+import os
+
+import numpy as np
+import pytest
+
+from build_thesaurus import MANIFEST_NAME, build
+from hierarchy import Hierarchy
+
+RDF = """<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns:skos="http://www.w3.org/2004/02/skos/core#"
+         xmlns:isothes="http://purl.org/iso25964/skos-thes#">
+  <skos:Concept rdf:about="http://t/c1">
+    <skos:prefLabel xml:lang="es">Educación</skos:prefLabel>
+    <skos:prefLabel xml:lang="en">Education</skos:prefLabel>
+    <skos:narrower rdf:resource="http://t/c2"/>
+  </skos:Concept>
+  <rdf:Description rdf:about="http://t/c2">
+    <rdf:type rdf:resource="http://www.w3.org/2004/02/skos/core#Concept"/>
+    <skos:prefLabel xml:lang="es">Enseñanza  superior</skos:prefLabel>
+    <skos:prefLabel xml:lang="en">Higher education</skos:prefLabel>
+    <skos:broader rdf:resource="http://t/c1"/>
+  </rdf:Description>
+  <skos:Concept rdf:about="http://t/c3">
+    <skos:prefLabel xml:lang="es">Universidad</skos:prefLabel>
+    <skos:prefLabel xml:lang="en">Universities</skos:prefLabel>
+    <skos:broader rdf:resource="http://t/c2"/>
+  </skos:Concept>
+  <skos:Concept rdf:about="http://t/c4">
+    <skos:prefLabel xml:lang="es">Salud pública</skos:prefLabel>
+  </skos:Concept>
+  <isothes:ConceptGroup rdf:about="http://t/g1">
+    <skos:prefLabel xml:lang="es">Educación</skos:prefLabel>
+    <skos:member rdf:resource="http://t/c1"/>
+  </isothes:ConceptGroup>
+</rdf:RDF>
+"""
+
+
+@pytest.fixture
+def paths(tmp_path):
+    rdf = tmp_path / "thesaurus.rdf"
+    rdf.write_text(RDF, encoding="utf-8")
+    return (str(rdf), str(tmp_path / "tables"), str(tmp_path / "index"),
+            str(tmp_path / "hierarchy.npz"))
+
+
+def _module(path):
+    spec = importlib.util.spec_from_file_location(os.path.basename(path)[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_build_writes_tables_index_and_manifest(paths):
+    rdf, tables, index, hierarchy_path = paths
+    report = build(rdf, tables, index, hierarchy_path, n_neighbors=2)
+    assert report["concepts"] == 3 and report["skipped"] == 1
+    assert len(report["written"]) == 6 and report["unchanged"] == []
+
+    concepts = _module(os.path.join(tables, "thesaurus_terms_bilingual.py")).CONCEPTS
+    assert concepts == [{"es": "educación", "en": "education"},
+                        {"es": "enseñanza superior", "en": "higher education"},
+                        {"es": "universidad", "en": "universities"}]
+    assert _module(os.path.join(tables, "thesaurus_terms_en.py")).THESAURUS_TERMS == [
+        "education", "higher education", "universities"]
+
+    hierarchy = Hierarchy.load(hierarchy_path)
+    assert hierarchy.ancestors_of(2).tolist() == [0, 1]
+    assert hierarchy.groups_of(0).tolist() == [0]
+
+    with open(os.path.join(index, MANIFEST_NAME), encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    assert sorted(manifest) == sorted(os.path.abspath(p) for p in report["written"])
+    assert all(len(entry["sha256"]) == 64 for entry in manifest.values())
+
+
+def test_rerun_skips_unchanged_outputs(paths):
+    rdf, tables, index, hierarchy_path = paths
+    first = build(rdf, tables, index, hierarchy_path, n_neighbors=2)
+    mtimes = [os.stat(p).st_mtime_ns for p in first["written"]]
+
+    again = build(rdf, tables, index, hierarchy_path, n_neighbors=2)
+    assert again["written"] == [] and again["unchanged"] == first["written"]
+    assert [os.stat(p).st_mtime_ns for p in first["written"]] == mtimes
+
+    # Solo cambia el grafo de vecinos: el resto sigue al día
+    changed = build(rdf, tables, index, hierarchy_path, n_neighbors=1)
+    assert changed["written"] == [os.path.join(index, "neighbors.npz")]
+
+
+def test_rebuilds_modified_output(paths):
+    rdf, tables, index, hierarchy_path = paths
+    build(rdf, tables, index, hierarchy_path, n_neighbors=2)
+    with open(hierarchy_path, "ab") as fh:
+        fh.write(b"\0")
+    report = build(rdf, tables, index, hierarchy_path, n_neighbors=2)
+    assert report["written"] == [hierarchy_path]
+    assert np.array_equal(Hierarchy.load(hierarchy_path).ancestors_of(2), [0, 1])
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from char_index import CharNgramIndex, FusedMatrix
+from keyword_engine import prepare_vectorizer, suggest_indices
+
+SUMMARY = "Intervenciones odontológicas en pacientes pediátricos"
+
+
+@pytest.fixture(scope="module")
+def fused(column):
+    return prepare_vectorizer(column, char_weight=0.5)
+
+
+def test_char_ngrams_recover_inflected_terms(column, index, fused):
+    word_only = suggest_indices(SUMMARY, column, *index, k=5)
+    with_chars = suggest_indices(SUMMARY, column, *fused, k=5)
+    terms = [column[cid] for cid in with_chars]
+    assert {"odontología", "pediatría"} <= set(terms)
+    assert "odontología" not in [column[cid] for cid in word_only]
+
+
+def test_char_similarities_are_cosines():
+    index = CharNgramIndex(["odontología", "pediatría", "geografía"])
+    sims = index.similarities(["odontológica", "odontología"])
+    assert sims.shape == (2, 3)
+    assert sims[0].argmax() == 0
+    assert sims[1, 0] == pytest.approx(1.0, abs=1e-6)
+    assert (sims >= 0).all() and (sims <= 1 + 1e-6).all()
+
+
+def test_fuse_rescales_char_signal_to_its_peak():
+    fused = FusedMatrix(None, None, weight=0.25)
+    word = np.array([[0.2, 0.4, 0.0]])
+    char = np.array([[0.9, 0.3, 0.0]])
+    assert fused.fuse(word, char)[0].tolist() == pytest.approx([0.4, 0.3 + 0.25 / 3, 0.0])
+    with pytest.raises(ValueError):
+        FusedMatrix(None, None, weight=1.5)
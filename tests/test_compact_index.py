@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from compact_index import CompactMatrix, check_recall, sample_summaries
+
+
+@pytest.mark.parametrize("mode", ["float32", "uint16", "int8"])
+def test_compact_recall_matches_dense(column, mode):
+    summaries = sample_summaries(list(column), n=60, seed=1)
+    assert check_recall(column, summaries, mode, k=5) >= 0.99
+
+
+def test_compact_matrix_roundtrip(index):
+    _, matrix = index
+    compact = CompactMatrix(matrix, "float32")
+    dense = matrix[:50].toarray()
+    assert np.allclose(compact.to_csr()[:50].toarray(), dense, atol=1e-6)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from concept_store import as_column
+from keyword_engine import exact_matches, top_k
+from textnorm import normalize_key
+
+
+def test_columns_are_aligned_by_id(store):
+    es, en = store.column("es"), store.column("en")
+    assert len(es) == len(en) == len(store)
+    cid = es.lookup(["padres progenitores"])[0]
+    assert store.term("es", cid) == "padres (progenitores)"
+    assert store.term("en", cid) == "parents"
+
+
+def test_punctuated_terms_match_exactly(store, column):
+    summary = "Encuesta a padres (progenitores) sobre el aprendizaje (oficios) juvenil."
+    terms = [column[cid] for cid in exact_matches(summary, column)]
+    assert "padres (progenitores)" in terms
+    assert "aprendizaje (oficios)" in terms
+    # Los más largos primero: los dos términos de dos palabras van delante
+    assert set(terms[:2]) == {"padres (progenitores)", "aprendizaje (oficios)"}
+
+
+def test_lookup_returns_sorted_unique_ids(column):
+    keys = [normalize_key("Salud"), "salud", "no existe"]
+    ids = column.lookup(keys)
+    assert ids.tolist() == sorted(set(ids.tolist())) and len(ids) == 1
+
+
+def test_as_column_wraps_plain_lists():
+    column = as_column(["Salud pública", "salud"])
+    assert len(column) == 2 and column[0] == "Salud pública"
+    assert column.lookup(["salud publica", "salud pública"]).tolist() == [0]
+
+
+def test_term_metadata_arrays():
+    column = as_column(["salud", "enseñanza (oficios)", "política de la salud"])
+    meta = column.meta
+    assert meta.word_count.tolist() == [1, 2, 4]
+    assert meta.char_length.tolist() == [5, 19, 20]
+    assert (meta.prior > 0).tolist() == [True, False, True]
+
+
+def test_top_k_breaks_ties_by_id():
+    scores = np.array([0.5, 0.9, 0.5, 0.1, 0.5])
+    assert top_k(scores, 3).tolist() == [1, 0, 2]
+    assert top_k(scores, 3, exclude=np.array([1])).tolist() == [0, 2, 4]
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from corpus_idf import CorpusIDF, HashedTfidfVectorizer, iter_corpus
+from keyword_engine import prepare_vectorizer, suggest_indices
+
+DOCS = [
+    "la salud de los escolares en zonas rurales",
+    "la política educativa y la salud",
+    "la caries dental en escolares",
+    "la enseñanza superior",
+]
+
+
+def _df(corpus, word):
+    column = HashedTfidfVectorizer(corpus)._counts.transform([word]).indices[0]
+    return int(corpus.df[column])
+
+
+def test_iter_corpus_reads_dirs_and_line_files(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "b.txt").write_text("segundo", encoding="utf-8")
+    (docs / "a.txt").write_text("primero", encoding="utf-8")
+    (docs / "notas.md").write_text("ignorado", encoding="utf-8")
+    lines = tmp_path / "lineas.txt"
+    lines.write_text("uno\n\ndos\n", encoding="utf-8")
+    assert [d.strip() for d in iter_corpus([str(docs), str(lines)])] == [
+        "primero", "segundo", "uno", "dos"]
+
+
+def test_partial_fit_accumulates_document_frequencies():
+    whole = CorpusIDF(1 << 12).partial_fit(DOCS)
+    parts = CorpusIDF(1 << 12).partial_fit(DOCS[:1], batch_size=1).partial_fit(DOCS[1:])
+    assert whole.n_docs == parts.n_docs == 4
+    assert np.array_equal(whole.df, parts.df)
+    assert (_df(whole, "la"), _df(whole, "escolares"), _df(whole, "caries")) == (4, 2, 1)
+    # Suavizado de TfidfVectorizer: ln((1 + n) / (1 + df)) + 1
+    assert whole.idf[whole.df.argmax()] == pytest.approx(1.0)
+
+
+def test_save_load_and_engine_use(tmp_path, column):
+    corpus = CorpusIDF(1 << 14).partial_fit(DOCS)
+    path = str(tmp_path / "idf.npz")
+    corpus.save(path)
+    loaded = CorpusIDF.load(path)
+    assert loaded.n_docs == 4 and loaded.ngram_range == (1, 2)
+    assert np.array_equal(loaded.df, corpus.df)
+
+    vect, matrix = prepare_vectorizer(column, idf=path)
+    assert isinstance(vect, HashedTfidfVectorizer)
+    assert matrix.shape == (len(column), 1 << 14)
+    ids = suggest_indices("Los escolares de la enseñanza superior", column, vect, matrix, k=4)
+    assert len(ids) == 4
+    assert [column[cid] for cid in ids[:2]] == ["enseñanza superior", "enseñanza"]
+
+
+def test_reweight_matches_a_fresh_fit():
+    terms = ["salud", "salud escolar", "caries dental"]
+    corpus = CorpusIDF(1 << 12).partial_fit(DOCS[:2])
+    vect = HashedTfidfVectorizer(corpus)
+    vect.fit_transform(terms)
+    corpus.partial_fit(DOCS[2:])
+    fresh = HashedTfidfVectorizer(corpus).fit_transform(terms)
+    assert np.allclose(vect.reweight().toarray(), fresh.toarray())
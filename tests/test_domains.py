@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from domains import (DOMAIN_EDUCATION, DOMAIN_HEALTH, DOMAINS, domain_bits, domain_flags,
+                     domain_mask, prior_flags, prior_weights)
+from keyword_engine import suggest_detailed
+from textnorm import normalize_key
+
+
+def test_domain_flags_and_prior():
+    flags = domain_flags(["salud mental", "enseñanza superior", "medicina clínica", "acero"])
+    assert flags[0] & DOMAIN_HEALTH and flags[1] & DOMAIN_EDUCATION
+    # "cine" solo casa al inicio de palabra: "medicina" no es cultura
+    assert not flags[2] & DOMAINS["culture"]
+    assert flags[3] == 0
+    prior = prior_weights(prior_flags(["salud mental", "enseñanza superior"]))
+    assert prior[0] > 0 and prior[1] == 0
+
+
+def test_health_facet_matches_word_start():
+    terms = ["student housing", "accidents", "residential child care",
+             "antecedentes académicos", "odontología", "dental caries"]
+    health = (domain_flags(terms) & DOMAIN_HEALTH).astype(bool).tolist()
+    assert health == [False, False, False, False, True, True]
+    # El peso a priori conserva la búsqueda como subcadena
+    assert (prior_flags(terms) & DOMAIN_HEALTH).all()
+
+
+def test_student_concepts_not_in_health_facet(store):
+    en = store.column("en")
+    for term in ("students", "student housing", "accidents", "educational background"):
+        cid = en.key_index[normalize_key(term)]
+        assert not store.facets[cid] & DOMAIN_HEALTH, term
+
+
+def test_domain_bits():
+    assert domain_bits(None) is None
+    assert domain_bits(["health", "education"]) == DOMAIN_HEALTH | DOMAIN_EDUCATION
+    with pytest.raises(ValueError):
+        domain_bits(["astrology"])
+
+
+def test_domain_mask():
+    facets = np.array([0, DOMAIN_HEALTH, DOMAIN_EDUCATION, DOMAIN_HEALTH | DOMAIN_EDUCATION],
+                      dtype=np.uint8)
+    assert domain_mask(facets, DOMAIN_HEALTH).tolist() == [False, True, False, True]
+
+
+def test_store_facets_cover_both_languages(store):
+    es, en = store.column("es"), store.column("en")
+    assert es.meta.facets is en.meta.facets
+    assert (store.facets & es.meta.domain_flags == es.meta.domain_flags).all()
+
+
+@pytest.mark.parametrize("fusion", [None, "rrf"])
+def test_suggest_respects_domain_filter(store, column, index, fusion):
+    vect, matrix = index
+    summary = "La enseñanza de la odontología y la epidemiología de la caries en escolares"
+    result = suggest_detailed(summary, column, vect, matrix, k=5, fusion=fusion,
+                              domains=["education"])
+    assert result.indices
+    assert (store.facets[result.indices] & DOMAIN_EDUCATION).all()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from fusion import (PROFILES, fuse, get_profile, make_profile, pad_rankings,
+                    rank_candidates)
+
+
+def test_pad_rankings():
+    out = pad_rankings([[3, 1], [], [2]])
+    assert out.tolist() == [[3, 1], [-1, -1], [2, -1]]
+
+
+def test_rank_candidates_breaks_ties_by_id():
+    scores = np.array([[0.1, 0.5, 0.5, 0.0]])
+    assert rank_candidates(scores, 3).tolist() == [[1, 2, 0]]
+
+
+def test_rrf_combines_ranks():
+    profile = make_profile({"method": "rrf", "rrf_k": 0, "candidates": 2,
+                            "weights": {"exact": 1.0, "tfidf": 1.0}})
+    exact = pad_rankings([[2]])
+    scores = {"tfidf": np.array([[0.9, 0.1, 0.5, 0.0]])}
+    fused = fuse(profile, exact, scores, 4)
+    # 2: exacta (1/1) + segundo de tfidf (1/2); 0: primero de tfidf (1/1)
+    assert fused[0, 2] == pytest.approx(1.5)
+    assert fused[0, 0] == pytest.approx(1.0)
+    assert np.isneginf(fused[0, [1, 3]]).all()
+
+
+def test_linear_rescales_each_signal():
+    profile = make_profile({"method": "linear",
+                            "weights": {"exact": 1.0, "tfidf": 0.5, "bm25": 0.5}})
+    exact = pad_rankings([[3], []])
+    scores = {"tfidf": np.array([[0.2, 0.4, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]]),
+              "bm25": np.array([[10.0, 0.0, 5.0, 0.0], [0.0, 2.0, 0.0, 0.0]])}
+    fused = fuse(profile, exact, scores, 4)
+    assert fused[0].tolist() == pytest.approx([0.75, 0.5, 0.25, 1.0])
+    assert fused[1].tolist() == pytest.approx([0.0, 0.5, 0.0, 0.0])
+
+
+def test_profile_validation():
+    with pytest.raises(ValueError):
+        make_profile({"method": "max", "weights": {"tfidf": 1}})
+    with pytest.raises(ValueError):
+        make_profile({"weights": {"tfidf": -1}})
+    with pytest.raises(ValueError):
+        get_profile("nope")
+    assert get_profile("rrf") is PROFILES["rrf"]
+
+
+def test_engine_fusion_keeps_exact_matches(column, index):
+    from keyword_engine import suggest_detailed
+
+    vect, matrix = index
+    result = suggest_detailed("la epidemiología de la caries", column, vect, matrix, k=3,
+                              fusion="rrf")
+    assert result.stages == ("exact", "tfidf", "bm25", "fusion")
+    assert "epidemiología" in [column[cid] for cid in result.indices]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from autocomplete import TermAutocomplete
+from fuzzy import DeletionIndex, TermCorrector, edit_distance, max_edits
+from keyword_engine import exact_matches
+
+
+def test_edit_distance_is_bounded():
+    assert edit_distance("caries", "caries", 2) == 0
+    assert edit_distance("caries", "caires", 2) == 1  # transposición
+    assert edit_distance("salud", "saludable", 2) == 3
+
+
+def test_deletion_index_lookup():
+    index = DeletionIndex(["geografia", "geologia", "biologia"], max_distance=2)
+    assert index.lookup("geografai")[0] == ("geografia", 1)
+    assert index.lookup("zzzzzz") == []
+
+
+def test_max_edits_grows_with_length():
+    assert max_edits(4) == 0
+    assert max_edits(6) == 1
+    assert max_edits(12) == 2
+
+
+@pytest.mark.parametrize("typo, expected", [
+    ("epidemologia", "epidemiología"),
+    ("odontolgia", "odontología"),
+    ("educacion", "educación"),
+    ("enseñansa", "enseñanza"),
+])
+def test_corrects_typos(column, typo, expected):
+    assert column.corrector.correct(typo)[0] == expected
+
+
+@pytest.mark.parametrize("word", ["dental", "muestran", "analizamos", "observaron",
+                                  "resultados", "diferencias"])
+def test_valid_words_are_not_corrected(column, word):
+    assert column.corrector.correct(word) is None
+
+
+def test_known_and_lexicon_words_are_not_corrected():
+    corrector = TermCorrector(["salud mental"], known=["mentol"], lexicon=["mentira"])
+    assert corrector.correct("mentol") is None
+    assert corrector.correct("mentira") is None
+    assert corrector.correct("mentla") == ("mental", 1)
+
+
+def test_without_lexicon_only_accents_are_restored():
+    corrector = TermCorrector(["salud mental", "observación", "resultado"])
+    assert corrector.correct("mentla") is None
+    assert corrector.correct("observaron") is None
+    assert corrector.correct("resultados") is None
+    assert corrector.correct("observacion") == ("observación", 0)
+
+
+def test_lexicon_words_do_not_become_exact_hits(column):
+    summary = "Se observaron diferencias en los resultados de la encuesta"
+    literal = exact_matches(summary, column).tolist()
+    assert exact_matches(summary, column, fuzzy=True).tolist() == literal
+
+
+def test_typo_hits_rank_below_literal_matches(column):
+    summary = "Estudio sobre la salud dental y la epidemologia de la caries"
+    ids = exact_matches(summary, column, fuzzy=True).tolist()
+    terms = [column[cid] for cid in ids]
+    assert "salud mental" not in terms
+    assert terms.index("salud") < terms.index("epidemiología")
+
+
+def test_fuzzy_off_is_literal(column):
+    ids = exact_matches("la epidemologia de la caries", column).tolist()
+    assert "epidemiología" not in [column[cid] for cid in ids]
+
+
+def test_autocomplete_falls_back_to_corrections(store):
+    matches = TermAutocomplete(store).search("odontolgia", 3)
+    assert [(m.term, m.match) for m in matches][:1] == [("odontología", "fuzzy")]
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from concept_store import ConceptStore
+from hierarchy import Hierarchy, build_from_resources, require_hierarchy
+from skos import SkosResource
+
+
+@pytest.fixture(scope="module")
+def tree():
+    # 0 <- 1 <- 2 <- 3, 2 también bajo 4 (poli-jerarquía); 70 conceptos para
+    # cruzar el límite de una palabra de 64 bits (69 bajo 65)
+    edges = [(1, 0), (2, 1), (3, 2), (2, 4), (69, 65)]
+    return Hierarchy.from_edges(70, edges, memberships=[(3, 0)], group_labels=["Geo"],
+                                group_domains=[0], domain_labels=["Ciencias sociales"])
+
+
+def test_ancestor_closure(tree):
+    assert tree.ancestors_of(3).tolist() == [0, 1, 2, 4]
+    assert tree.ancestors_of(0).tolist() == []
+    assert tree.ancestors_of(69).tolist() == [65]
+    assert tree.is_descendant(3, 0) and tree.is_descendant(3, 4)
+    assert not tree.is_descendant(0, 3)
+    assert sorted(tree.parents(2).tolist()) == [1, 4]
+
+
+def test_descendant_and_lineage_masks(tree):
+    assert np.flatnonzero(tree.descendants_mask(1)).tolist() == [2, 3]
+    assert np.flatnonzero(tree.lineage_mask([2])).tolist() == [0, 1, 3, 4]
+    assert not tree.lineage_mask([]).any()
+
+
+def test_groups_and_roundtrip(tree, tmp_path):
+    assert tree.groups_of(3).tolist() == [0]
+    path = str(tmp_path / "h.npz")
+    tree.save(path)
+    loaded = Hierarchy.load(path)
+    assert np.array_equal(loaded.ancestors, tree.ancestors)
+    assert loaded.domain_labels.tolist() == ["Ciencias sociales"]
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match="ciclos"):
+        Hierarchy.from_edges(3, [(0, 1), (1, 2), (2, 0)])
+
+
+def test_require_hierarchy_checks_size(tree, tmp_path):
+    path = str(tmp_path / "h.npz")
+    tree.save(path)
+    assert len(require_hierarchy(70, path)) == 70
+    with pytest.raises(ValueError, match="70 conceptos"):
+        require_hierarchy(4485, path)
+    with pytest.raises(ValueError, match="No existe"):
+        require_hierarchy(70, str(tmp_path / "missing.npz"))
+
+
+def _concept(uri, es, en, broader=()):
+    return SkosResource(uri, "concept", {"es": es, "en": en}, list(broader), [], [])
+
+
+def test_build_from_resources_resolves_shared_labels():
+    store = ConceptStore([{"es": "cultura oceánica", "en": "ocean literacy"},
+                          {"es": "cultura oceánica", "en": "oceanic cultures"},
+                          {"es": "cultura", "en": "culture"},
+                          {"es": "doble", "en": "double"},
+                          {"es": "doble", "en": "double"}])
+    resources = [
+        _concept("c0", "cultura oceánica", "ocean literacy", ["c2"]),
+        _concept("c1", "cultura oceánica", "oceanic cultures", ["c2"]),
+        _concept("c2", "cultura", "culture"),
+        _concept("c3", "doble", "double", ["c2"]),
+        SkosResource("g", "group", {"es": "Cultura"}, [], [], ["c0", "c1", "c2"]),
+    ]
+    with pytest.warns(UserWarning, match="etiquetas repetidas"):
+        hierarchy, report = build_from_resources(resources, store)
+    # La etiqueta ES compartida se resuelve por la EN; "doble" no se puede resolver
+    assert hierarchy.parents(0).tolist() == [2] and hierarchy.parents(1).tolist() == [2]
+    assert report["ambiguous"] == 1
+    assert hierarchy.groups_of(1).tolist() == [0]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from instrumentation import TIMER, StageTimer
+from keyword_engine import suggest_indices
+
+
+def test_disabled_timer_records_nothing():
+    timer = StageTimer()
+    with timer.stage("exact"):
+        pass
+    assert timer.snapshot() == {}
+
+
+def test_collect_nests_and_notifies_listeners():
+    timer = StageTimer()
+    seen = []
+    timer.listeners.append(lambda name, seconds: seen.append(name))
+    with timer.collect() as outer:
+        with timer.stage("ngrams"):
+            pass
+        with timer.collect() as inner:
+            with timer.stage("exact"):
+                pass
+    assert set(inner) == {"exact"}
+    assert set(outer) == {"ngrams", "exact"}
+    assert seen == ["ngrams", "exact"]
+    assert timer.snapshot()["exact"]["calls"] == 1
+
+
+def test_engine_reports_its_stages(column, index):
+    vect, matrix = index
+    with TIMER.collect() as timings:
+        suggest_indices("La epidemiología de la caries", column, vect, matrix, k=5)
+    assert {"ngrams", "exact", "boost", "rank"} <= set(timings)
+    assert all(seconds >= 0 for seconds in timings.values())
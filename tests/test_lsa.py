@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from keyword_engine import prepare_vectorizer, suggest_detailed
+from lsa import LsaIndex, fit_lsa
+from rowops import normalize_rows, scale_to_peak, term_rows
+from scorers import attach_lsa
+
+
+@pytest.fixture(scope="module")
+def lsa(index):
+    return fit_lsa(*index, n_components=32)
+
+
+def test_row_helpers():
+    x = np.array([[3.0, 4.0], [0.0, 0.0]])
+    assert normalize_rows(x).tolist() == [[0.6, 0.8], [0.0, 0.0]]
+    assert scale_to_peak(np.array([[1.0, 4.0], [0.0, 0.0]])).tolist() == [[0.25, 1.0],
+                                                                          [0.0, 0.0]]
+
+
+def test_embeddings_are_unit_rows(index, lsa):
+    _, matrix = index
+    assert lsa.embeddings.shape == (matrix.shape[0], 32)
+    assert lsa.embeddings.dtype == np.float32
+    norms = np.linalg.norm(lsa.embeddings, axis=1)
+    assert np.allclose(norms[norms > 0], 1.0, atol=1e-5)
+    assert term_rows(matrix).shape == matrix.shape
+
+
+def test_search_finds_the_term_itself(column, index, lsa):
+    vect, _ = index
+    cid = list(column).index("odontología")
+    query = lsa.project(vect.transform(["odontología"]))[0]
+    ids, scores = lsa.search(query, k=5)
+    assert cid in ids.tolist()
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_save_load_mmap_and_check(tmp_path, column, index, lsa):
+    vect, matrix = index
+    lsa.save(str(tmp_path))
+    loaded = LsaIndex.load(str(tmp_path))
+    assert isinstance(loaded.embeddings, np.memmap)
+    assert np.array_equal(loaded.embeddings, lsa.embeddings)
+    loaded.check(vect, matrix.shape[0])
+    with pytest.raises(ValueError):
+        loaded.check(vect, matrix.shape[0] + 1)
+    other, _ = prepare_vectorizer(["salud", "educación"])
+    with pytest.raises(ValueError):
+        loaded.check(other, matrix.shape[0])
+
+
+def test_attached_lsa_scorer(column, lsa):
+    vect, matrix = prepare_vectorizer(column)
+    attach_lsa(vect, matrix, lsa)
+    result = suggest_detailed("Tratamientos odontológicos", column, vect, matrix, k=3,
+                              scorer="tfidf+lsa")
+    assert result.stages == ("exact", "tfidf+lsa") and len(result.indices) == 3
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from metrics import Counter, Gauge, Histogram, Registry
+
+
+def _render(*metrics):
+    registry = Registry()
+    for metric in metrics:
+        registry.register(metric)
+    return registry.render().splitlines()
+
+
+def test_counter_and_gauge_keep_precision():
+    requests = Counter("requests_total", "Peticiones.", ("route",))
+    requests.inc(1, "/suggest")
+    requests.inc(2, "/suggest")
+    size = Gauge("index_bytes", "Bytes.", ("component",))
+    size.set(123456789, "matrix")
+    size.set(1234567.5, "pool")
+    lines = _render(requests, size)
+    assert lines[:3] == ["# HELP requests_total Peticiones.", "# TYPE requests_total counter",
+                         'requests_total{route="/suggest"} 3']
+    assert 'index_bytes{component="matrix"} 123456789' in lines
+    assert 'index_bytes{component="pool"} 1234567.5' in lines
+
+
+def test_histogram_buckets_sum_and_count():
+    hist = Histogram("chars", "Longitud.", buckets=(100, 1000))
+    for value in (50, 500, 2_000_000):
+        hist.observe(value)
+    lines = _render(hist)
+    assert lines[2:] == ['chars_bucket{le="100"} 1', 'chars_bucket{le="1000"} 2',
+                         'chars_bucket{le="+Inf"} 3', "chars_sum 2000550.0", "chars_count 3"]
+
+
+def test_label_values_and_help_are_escaped():
+    counter = Counter("odd_total", "Línea 1\nlínea 2", ("cache",))
+    counter.inc(1, 'a"b\\c\nd')
+    lines = _render(counter)
+    assert lines[0] == "# HELP odd_total Línea 1\\nlínea 2"
+    assert lines[2] == 'odd_total{cache="a\\"b\\\\c\\nd"} 1'
+
+
+def test_callback_counter():
+    hits = Counter("cache_total", "Caché.", ("result",),
+                   callback=lambda: {("hit",): 7, ("miss",): 2})
+    assert _render(hits)[2:] == ['cache_total{result="hit"} 7', 'cache_total{result="miss"} 2']
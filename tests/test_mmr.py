@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from scipy import sparse
+
+from keyword_engine import suggest_detailed
+from mmr import MMR_POOL, mmr_rerank
+
+
+@pytest.fixture
+def graph():
+    # 0 y 1 casi duplicados; 2, 3 y 4 sin relación con ellos
+    sims = np.zeros((5, 5), dtype=np.float32)
+    sims[0, 1] = sims[1, 0] = 0.95
+    sims[2, 3] = sims[3, 2] = 0.2
+    return sparse.csr_matrix(sims)
+
+
+def test_lambda_one_keeps_relevance_order(graph):
+    assert mmr_rerank([0, 1, 2, 3, 4], graph, 4, lam=1.0) == [0, 1, 2, 3]
+
+
+def test_lower_lambda_drops_near_duplicates(graph):
+    assert mmr_rerank([0, 1, 2, 3, 4], graph, 2, lam=0.5) == [0, 2]
+    picked = mmr_rerank([0, 1, 2, 3, 4], graph, 3, lam=0.5)
+    assert picked[0] == 0 and 1 not in picked
+
+
+def test_custom_relevance_and_short_lists(graph):
+    assert mmr_rerank([0, 1, 2], graph, 1, lam=0.0) == [0]
+    assert mmr_rerank([1, 0], graph, 5, lam=0.5) == [1, 0]
+    assert mmr_rerank([0, 1, 2], graph, 2, lam=0.5, relevance=[0.1, 1.0, 0.9]) == [1, 2]
+
+
+def test_engine_mmr(column, index):
+    vect, matrix = index
+    summary = "Geografía económica y social"
+    plain = suggest_detailed(summary, column, vect, matrix, k=MMR_POOL)
+    same = suggest_detailed(summary, column, vect, matrix, k=5, mmr=1.0)
+    assert same.indices == plain.indices[:5]
+    assert same.stages[-1] == "mmr"
+    top = [column[cid] for cid in plain.indices[:3]]
+    assert {"geografía económica", "geografía"} <= set(top)
+    diverse = suggest_detailed(summary, column, vect, matrix, k=3, mmr=0.5)
+    terms = [column[cid] for cid in diverse.indices]
+    assert terms[0] == "geografía económica" and "geografía" not in terms
+    assert set(diverse.indices) <= set(plain.indices)
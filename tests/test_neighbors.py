@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from scipy import sparse
+
+from keyword_engine import prepare_vectorizer
+from neighbors import (attach_neighbors, build_concept_graph, build_neighbors,
+                       get_neighbors, load_graph, related, save_graph)
+
+TERMS = ["salud", "salud pública", "política de la salud", "educación", "educación superior",
+         "política educativa", "enseñanza superior", "geografía"]
+
+
+@pytest.fixture(scope="module")
+def toy():
+    return prepare_vectorizer(TERMS)
+
+
+def test_full_graph_is_symmetric_without_self_loops(toy):
+    _, matrix = toy
+    graph = build_neighbors(matrix, n_neighbors=len(TERMS) - 1)
+    assert graph.diagonal().sum() == 0
+    assert abs(graph - graph.T).max() < 1e-6
+
+
+def test_top_n_edges_have_symmetric_weights(store):
+    graph = build_concept_graph(store, n_neighbors=5)
+    assert graph.shape == (len(store), len(store))
+    assert np.diff(graph.indptr).max() <= 5
+    rows = np.repeat(np.arange(graph.shape[0]), np.diff(graph.indptr))
+    assert not (rows == graph.indices).any()
+    # Si a y b se citan mutuamente, la similitud es la misma en ambos sentidos
+    transposed = graph.T.tocsr()
+    both = graph.multiply(transposed > 0)
+    assert abs(both - both.T).max() < 1e-6
+    assert both.nnz > 0
+
+
+def test_blocks_and_chunks_do_not_change_the_graph(toy):
+    _, matrix = toy
+    whole = build_neighbors(matrix, n_neighbors=3)
+    tiled = build_neighbors(matrix, n_neighbors=3, block_rows=3, chunk_cols=2)
+    assert np.array_equal(whole.indptr, tiled.indptr)
+    assert np.allclose(whole.data, tiled.data)
+
+
+def test_related_is_sorted_and_respects_limit(toy):
+    _, matrix = toy
+    graph = build_neighbors(matrix, n_neighbors=4)
+    ids, scores = related(graph, TERMS.index("salud"))
+    assert len(ids) <= 4 and list(scores) == sorted(scores, reverse=True)
+    assert TERMS[ids[0]] == "salud pública"
+    for limit in (0, 1, 2):
+        assert len(related(graph, 0, limit)[0]) == min(limit, len(ids))
+    # "geografía" no comparte features con nadie: sin vecinos
+    assert len(related(graph, TERMS.index("geografía"))[0]) == 0
+
+
+def test_save_load_and_attach(toy, tmp_path):
+    _, matrix = toy
+    graph = build_neighbors(matrix, n_neighbors=3)
+    path = str(tmp_path / "graph.npz")
+    save_graph(path, graph, ("es",))
+    loaded = load_graph(path)
+    assert (loaded != graph).nnz == 0
+    attach_neighbors(matrix, loaded)
+    assert get_neighbors(matrix) is loaded
+    with pytest.raises(ValueError):
+        attach_neighbors(matrix, sparse.csr_matrix((2, 2)))
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+import os
+
+from keyword_engine import suggest_batch
+from profiling import profile_suggest
+
+
+def test_profile_suggest_writes_reports(column, index, tmp_path):
+    vect, matrix = index
+    summary = "La epidemiología de la caries en escolares"
+    result, paths = profile_suggest(summary, column, vect, matrix, k=4, out_dir=str(tmp_path),
+                                    top=5, fusion="rrf")
+    assert result == suggest_batch([summary], column, vect, matrix, 4, fusion="rrf")
+    assert set(paths) == {"pstats", "report", "alloc", "collapsed"}
+    assert all(os.path.getsize(path) > 0 for path in paths.values())
+    with open(paths["report"], encoding="utf-8") as fh:
+        assert "suggest_batch" in fh.read()
+    with open(paths["collapsed"], encoding="utf-8") as fh:
+        stack, micros = fh.readline().rsplit(" ", 1)
+    assert int(micros) > 0
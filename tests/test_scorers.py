@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from keyword_engine import prepare_vectorizer, suggest_detailed
+from scorers import BM25Scorer, TfidfScorer, _term_counts, available_scorers, get_scorer
+
+TERMS = ["educación", "educación superior", "educación superior a distancia", "salud",
+         "salud pública", "enseñanza superior"]
+QUERY = "la educación superior y la salud pública"
+
+
+@pytest.fixture(scope="module")
+def toy():
+    return prepare_vectorizer(TERMS)
+
+
+def _ranking(scores):
+    return [TERMS[i] for i in np.argsort(-scores[0], kind="stable")]
+
+
+def test_bm25_and_tfidf_agree_on_the_toy_ranking(toy):
+    bm25 = BM25Scorer(*toy).scores([QUERY])
+    tfidf = TfidfScorer(*toy).scores([QUERY])
+    assert _ranking(bm25)[:3] == _ranking(tfidf)[:3] == [
+        "salud pública", "educación superior", "educación superior a distancia"]
+    # BM25 se reescala a su máximo por fila; el coseno no
+    assert bm25.max() == pytest.approx(1.0) and tfidf.max() < 1.0
+
+
+def test_bm25_matches_the_formula(toy):
+    vect, matrix = toy
+    k1, b = 1.2, 0.75
+    counts = _term_counts(vect, matrix).toarray()
+    lengths = counts.sum(axis=1)
+    query = vect.transform([QUERY]).toarray()[0] > 0
+    idf = np.asarray(vect.idf_)
+    norm = k1 * (1 - b + b * lengths / lengths.mean())
+    expected = (idf * counts * (k1 + 1) / (counts + norm[:, None]) * query).sum(axis=1)
+    got = BM25Scorer(vect, matrix, k1, b).scores([QUERY])[0]
+    assert got == pytest.approx(expected / expected.max(), rel=1e-5)
+
+
+def test_length_normalization(toy):
+    long_id, short_id = TERMS.index("educación superior a distancia"), TERMS.index(
+        "educación superior")
+    flat = BM25Scorer(*toy, b=0.0).scores(["educación superior"])[0]
+    assert flat[long_id] == pytest.approx(flat[short_id])
+    normalized = BM25Scorer(*toy).scores(["educación superior"])[0]
+    assert normalized[short_id] > normalized[long_id]
+
+
+def test_term_counts_recover_repeated_words():
+    vect, matrix = prepare_vectorizer(["agua y agua potable", "agua"])
+    counts = _term_counts(vect, matrix)
+    assert counts[0, vect.vocabulary_["agua"]] == 2
+    assert counts[1, vect.vocabulary_["agua"]] == 1
+
+
+def test_engine_uses_bm25(column, index):
+    vect, matrix = index
+    assert {"tfidf", "bm25"} <= set(available_scorers(matrix))
+    assert get_scorer("bm25", vect, matrix) is get_scorer("bm25", vect, matrix)
+    result = suggest_detailed(QUERY, column, vect, matrix, k=6, scorer="bm25")
+    assert result.stages == ("exact", "bm25") and len(result.indices) == 6
+    with pytest.raises(ValueError):
+        get_scorer("nope", vect, matrix)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+
+import pytest
+
+from server import BadRequest, KeywordService, PayloadTooLarge, _read_request
+
+
+@pytest.fixture(scope="module")
+def service():
+    return KeywordService(4, 1.0)
+
+
+def _suggest(service, payload):
+    return asyncio.run(service.suggest(payload))
+
+
+@pytest.mark.parametrize("payload, field", [
+    ({"summary": ""}, "summary"),
+    ({"summary": "salud", "k": True}, "k"),
+    ({"summary": "salud", "k": 0}, "k"),
+    ({"summary": "salud", "budget_ms": -1}, "budget_ms"),
+    ({"summary": "salud", "budget_ms": True}, "budget_ms"),
+    ({"summary": "salud", "budget_ms": float("nan")}, "budget_ms"),
+    ({"summary": "salud", "budget_ms": float("inf")}, "budget_ms"),
+    ({"summary": "salud", "fuzzy": "yes"}, "fuzzy"),
+    ({"summary": "salud", "scorer": "nope"}, "scorer"),
+    ({"summary": "salud", "fusion": "nope"}, "fusion"),
+    ({"summary": "salud", "mmr": 2}, "mmr"),
+    ({"summary": "salud", "domains": "health"}, "domains"),
+    ({"summary": "salud", "domains": [["health"]]}, "domains"),
+    ({"summary": "salud", "domains": ["astrology"]}, "domains"),
+])
+def test_suggest_validation(service, payload, field):
+    status, body = _suggest(service, payload)
+    assert status == 400
+    assert f"'{field}'" in body["error"]
+
+
+def test_route_rejects_invalid_json(service):
+    status, _ = asyncio.run(service.route("POST", "/suggest", b"{nope"))
+    assert status == 400
+    status, _ = asyncio.run(service.route("POST", "/suggest", b'{"summary": "x", '
+                                                             b'"budget_ms": NaN}'))
+    assert status == 400
+
+
+def test_valid_suggest(service):
+    async def run():
+        service.batcher.start()
+        try:
+            return await service.suggest({"summary": "La epidemiología de la caries", "k": 2})
+        finally:
+            await service.batcher.stop()
+
+    status, body = asyncio.run(run())
+    assert status == 200
+    assert len(body["keywords"]) == 2 and body["degraded"] is False
+
+
+@pytest.mark.parametrize("limit", ["0", "-5", "abc"])
+def test_limit_must_be_positive(service, limit):
+    assert service.complete({"q": ["salud"], "limit": [limit]})[0] == 400
+    assert service.related({"id": ["0"], "limit": [limit]})[0] == 400
+
+
+def test_limit_is_capped(service):
+    status, body = service.related({"id": ["0"], "limit": ["1000"]})
+    assert status == 200 and 0 < len(body["related"]) <= 50
+    status, body = service.complete({"q": ["salud"], "limit": ["2"]})
+    assert status == 200 and len(body["matches"]) == 2
+
+
+def _parse(raw):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_request(reader)
+    return asyncio.run(run())
+
+
+def test_read_request_parses_body():
+    body = json.dumps({"summary": "salud"}).encode()
+    method, path, query, got, keep_alive = _parse(
+        b"POST /suggest?x=1 HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+    assert (method, path, query, got, keep_alive) == ("POST", "/suggest", {"x": ["1"]},
+                                                      body, True)
+
+
+@pytest.mark.parametrize("raw", [
+    b"GARBAGE\r\n\r\n",
+    b"POST /suggest HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+    b"POST /suggest HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+])
+def test_read_request_malformed_is_bad_request(raw):
+    with pytest.raises(BadRequest):
+        _parse(raw)
+
+
+def test_read_request_oversized_body():
+    with pytest.raises(PayloadTooLarge):
+        _parse(b"POST /suggest HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n")
+
+
+@pytest.mark.parametrize("payload", [
+    {"keywords": "salud"},
+    {"keywords": ["salud"], "source": "fr"},
+    {"keywords": ["salud"], "fuzzy": "false"},
+])
+def test_translate_validation(service, payload):
+    assert service.translate(payload)[0] == 400
+
+
+def test_translate(service):
+    status, body = service.translate({"keywords": ["salud"], "fuzzy": False})
+    assert status == 200
+    assert body["translations"][0]["text"] == "health"
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+
+from compact_index import load_index, save_index
+from keyword_engine import suggest_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_engine_import_does_not_load_vocabulary():
+    code = ("import sys, concept_store, keyword_engine\n"
+            "print(sorted(m for m in sys.modules if m.startswith('thesaurus_terms')))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_snapshot_roundtrip_gives_same_suggestions(column, index, tmp_path):
+    vect, matrix = index
+    path = str(tmp_path / "index.npz")
+    save_index(path, vect, matrix)
+    loaded_vect, loaded_matrix = load_index(path)
+    summaries = ["La epidemiología de la caries", "Política educativa y enseñanza superior"]
+    assert (suggest_batch(summaries, column, loaded_vect, loaded_matrix, k=5)
+            == suggest_batch(summaries, column, vect, matrix, k=5))
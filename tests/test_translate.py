@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+import io
+
+import pytest
+
+from translate import KeywordTranslator, translate_file
+
+
+@pytest.fixture(scope="module")
+def translator(store):
+    return KeywordTranslator(store)
+
+
+def test_exact_both_directions(translator):
+    es = translator.translate("Salud")
+    assert (es.source, es.text, es.match, es.score) == ("es", "health", "exact", 1.0)
+    en = translator.translate("health policy", source="en")
+    assert (en.text, en.match) == ("política de la salud", "exact")
+
+
+def test_typo_score_is_per_token(translator):
+    t = translator.translate("salud mentl")
+    assert (t.text, t.match) == ("mental health", "typo")
+    assert t.score == pytest.approx(1 - 1 / len("mentl"))
+
+
+@pytest.mark.parametrize("text", ["salud dental", "dental health"])
+def test_no_confident_wrong_translation(translator, text):
+    t = translator.translate(text)
+    assert t.text not in ("mental health", "salud mental")
+
+
+def test_auto_prefers_detected_language(translator):
+    assert translator.detect(["politica", "educativa"]) == ("es",)
+    t = translator.translate("politica educativa")
+    assert t.source != "en"
+
+
+def test_translate_file_streams_csv(translator):
+    out = io.StringIO()
+    count = translate_file(io.StringIO("salud\nepidemologia\n"), out, translator=translator)
+    rows = out.getvalue().splitlines()
+    assert count == 2
+    assert rows[1].startswith("salud,") and ",health,exact," in rows[1]
+    assert ",epidemiology,typo," in rows[2]
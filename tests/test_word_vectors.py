@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+
+from keyword_engine import prepare_vectorizer, suggest_detailed
+from scorers import attach_word_vectors
+from word_vectors import WordVectors, ingest_vec
+
+VEC = """6 3
+salud 1 0 0
+dientes 0.9 0.1 0
+escuela 0 1 0
+salud 0 0 1
+de 0 0 5
+malformada 1 2
+educación 0 0.9 0.1
+"""
+
+
+@pytest.fixture(scope="module")
+def vectors(tmp_path_factory):
+    root = tmp_path_factory.mktemp("vec")
+    path = root / "toy.vec"
+    path.write_text(VEC, encoding="utf-8")
+    return ingest_vec(str(path), str(root / "out"), lang="es")
+
+
+def test_ingest_keeps_first_occurrence_and_skips_bad_lines(vectors):
+    assert len(vectors) == 5 and vectors.dim == 3
+    assert vectors.meta["rows"] == 5 and vectors.meta["lang"] == "es"
+    assert isinstance(vectors.vectors, np.memmap)
+    rows = vectors.lookup(["salud", "escuela", "malformada", "nada"])
+    assert rows[2:].tolist() == [-1, -1]
+    assert vectors.vectors[rows[0]].tolist() == [1.0, 0.0, 0.0]
+    assert np.allclose(np.linalg.norm(vectors.vectors, axis=1), 1.0)
+
+
+def test_embed_averages_content_words(vectors):
+    out = vectors.embed(["salud de la escuela", "nada conocido", "salud"])
+    assert out[0] == pytest.approx(np.array([1.0, 1.0, 0.0]) / np.sqrt(2))
+    assert not out[1].any()
+    assert out[2].tolist() == [1.0, 0.0, 0.0]
+
+
+def test_word_vector_scorer(vectors):
+    terms = ["salud", "escuela", "educación"]
+    vect, matrix = prepare_vectorizer(terms)
+    attach_word_vectors(vect, matrix, vectors, terms)
+    result = suggest_detailed("los dientes", terms, vect, matrix, k=1, scorer="wordvec")
+    assert result.stages == ("exact", "wordvec")
+    assert result.indices == [0]
+    with pytest.raises(ValueError):
+        attach_word_vectors(vect, matrix, vectors, terms[:2])
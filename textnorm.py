@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Normalización de texto compartida por el motor y los índices de términos.
+
+Las claves normalizadas usan la misma tokenización que extract_ngrams(),
+de modo que una clave de término y un n-grama del resumen son comparables.
+fold_key() además elimina tildes y diacríticos ("Odontología" y
+"odontologia" dan la misma clave) para búsquedas tolerantes.
+STOP_WORDS son las palabras funcionales ES/EN que LSA, los vectores de
+palabras y la traducción no tratan como contenido.
+"""
+
+import re
+import unicodedata
+
+TOKEN_RE = re.compile(r"\b\w+\b")
+
+# Palabras funcionales: en LSA, por ejemplo, sin excluirlas los primeros
+# componentes del SVD agrupan "economías en transición" con "búsqueda en línea"
+STOP_WORDS = frozenset(
+    "a al con de del e el en entre la las lo los o para por sin sobre su sus u un una y "
+    "an and as at by for from in into of on or the to with".split())
+
+
+def tokenize(text):
+    return [t.lower() for t in TOKEN_RE.findall(text)]
+
+
+def normalize_key(text):
+    return " ".join(tokenize(text))
+
+
+def fold_accents(text):
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def fold_key(text):
+    return normalize_key(fold_accents(text))
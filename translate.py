@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Traducción de keywords ES <-> EN a través de la alineación de CONCEPTS.
+
+• Búsqueda exacta O(1): clave normalizada sin tildes -> ID de concepto,
+  un diccionario por idioma.
+• Si no hay coincidencia exacta se corrigen las erratas token a token con
+  el índice de borrados (fuzzy.TermCorrector, match "typo") y, como último
+  recurso, TermAutocomplete.similar() (Dice sobre trigramas) con un
+  umbral mínimo. Un candidato por trigramas solo se acepta si cada token
+  de la consulta casa con uno suyo dentro de fuzzy.max_edits (misma
+  primera letra): "salud dental" no se traduce como "mental health".
+• Con source="auto" el idioma detectado (el que reconoce más tokens) es
+  el único que se corrige; solo ante un empate se prueban ambos.
+• La puntuación de una corrección es la del peor token corregido,
+  1 - ediciones / longitud del token.
+• translate_many() memoriza por clave, de modo que listas masivas con
+  repeticiones solo resuelven cada keyword distinta una vez (la memoria
+  se vacía al llegar a MEMO_SIZE claves para acotar el consumo).
+
+Uso:  python cli.py translate --input keywords.csv --column 0 --output out.csv
+"""
+
+import csv
+from collections import namedtuple
+
+from autocomplete import TermAutocomplete
+from concept_store import LANGS, load_store
+from fuzzy import edit_distance, max_edits
+from textnorm import STOP_WORDS, fold_key
+
+Translation = namedtuple("Translation", "source_text concept_id source target text match score")
+
+_OTHER = {"es": "en", "en": "es"}
+MEMO_SIZE = 200_000
+SIMILAR_CANDIDATES = 5
+
+
+def _token_score(token, edits):
+    return 1.0 - edits / max(len(token), 1)
+
+
+def _aligned(query, candidate):
+    """Peor puntuación por token si cada token de `query` casa con uno de
+    `candidate` (las palabras funcionales sobrantes se ignoran); None si no."""
+    pending = list(candidate)
+    worst = 1.0
+    for token in query:
+        best = None
+        for j, other in enumerate(pending):
+            if other == token:
+                best = (0, j)
+                break
+            limit = max_edits(len(token))
+            if limit and other[0] == token[0]:
+                edits = edit_distance(token, other, limit)
+                if edits <= limit and (best is None or edits < best[0]):
+                    best = (edits, j)
+        if best is None:
+            return None
+        worst = min(worst, _token_score(token, best[0]))
+        del pending[best[1]]
+    return worst if all(token in STOP_WORDS for token in pending) else None
+
+
+class KeywordTranslator:
+    def __init__(self, store=None, autocomplete=None, fuzzy_min_score=0.6):
+        self.store = store or load_store()
+        self.fuzzy_min_score = fuzzy_min_score
+        self.keys = {}
+        for lang in LANGS:
+            column = self.store.column(lang)
+            index = {}
+            for cid in range(len(column)):
+                index.setdefault(fold_key(column[cid]), cid)
+            self.keys[lang] = index
+        self._autocomplete = autocomplete
+        self._memo = {}
+
+    @property
+    def autocomplete(self):
+        if self._autocomplete is None:
+            self._autocomplete = TermAutocomplete(self.store)
+        return self._autocomplete
+
+    def _result(self, text, cid, source, match, score):
+        target = _OTHER[source]
+        return Translation(text, cid, source, target, self.store.term(target, cid), match, score)
+
+    def detect(self, tokens):
+        """Idiomas candidatos: el que reconoce más tokens o, si empatan, todos."""
+        counts = {lang: sum(self.store.column(lang).corrector.recognizes(t) for t in tokens)
+                  for lang in LANGS}
+        top = max(counts.values())
+        return tuple(lang for lang in LANGS if counts[lang] == top)
+
+    def translate(self, text, source="auto", fuzzy=True):
+        """Traduce una keyword; source = "es", "en" o "auto"."""
+        key = fold_key(text)
+        langs = LANGS if source == "auto" else (source,)
+        for lang in langs:
+            cid = self.keys[lang].get(key)
+            if cid is not None:
+                return self._result(text, cid, lang, "exact", 1.0)
+        if fuzzy and key:
+            tokens = key.split()
+            if source == "auto":
+                langs = self.detect(tokens)
+            best = None
+            for lang in langs:
+                corrector = self.store.column(lang).corrector
+                fixed, score = [], 1.0
+                for token in tokens:
+                    hit = corrector.correct(token)
+                    if hit is None:
+                        fixed.append(token)
+                    else:
+                        fixed.append(hit[0])
+                        score = min(score, _token_score(token, hit[1]))
+                cid = self.keys[lang].get(fold_key(" ".join(fixed)))
+                if cid is not None and (best is None or score > best[0]):
+                    best = (score, lang, cid)
+            if best is not None:
+                score, lang, cid = best
+                return self._result(text, cid, lang, "typo", score)
+            for lang in langs:
+                for completion, dice in self.autocomplete.similar(
+                        key, limit=SIMILAR_CANDIDATES, min_score=self.fuzzy_min_score,
+                        lang=lang):
+                    candidate = fold_key(completion.term).split()
+                    score = _aligned(tokens, candidate)
+                    if score is not None:
+                        return self._result(text, completion.concept_id, completion.lang,
+                                            "fuzzy", min(score, dice))
+        return Translation(text, None, None if source == "auto" else source, None, None, None, 0.0)
+
+    def translate_many(self, texts, source="auto", fuzzy=True):
+        # Dos niveles: texto literal (evita normalizar repeticiones exactas)
+        # y clave normalizada (variantes de mayúsculas/tildes comparten resultado)
+        memo = self._memo
+        for text in texts:
+            hit = memo.get((text, source, fuzzy))
+            if hit is None:
+                key = (fold_key(text), source, fuzzy)
+                hit = memo.get(key)
+                if hit is None:
+                    if len(memo) >= MEMO_SIZE:
+                        memo.clear()
+                    hit = memo[key] = self.translate(text, source, fuzzy)
+                if hit.source_text != text:
+                    hit = hit._replace(source_text=text)
+                memo[(text, source, fuzzy)] = hit
+            yield hit
+
+
+def translate_file(src, dst, source="auto", column=None, fuzzy=True, delimiter=",",
+                   translator=None):
+    """Traduce una keyword por línea (o la columna `column` de un CSV) en streaming."""
+    translator = translator or KeywordTranslator()
+    writer = csv.writer(dst, delimiter=delimiter)
+    writer.writerow(["input", "concept_id", "source", "target", "translation", "match", "score"])
+    if column is None:
+        texts = (line.rstrip("\r\n") for line in src)
+    else:
+        texts = (row[column] if len(row) > column else ""
+                 for row in csv.reader(src, delimiter=delimiter))
+    count = 0
+    for t in translator.translate_many(texts, source, fuzzy):
+        writer.writerow([t.source_text, "" if t.concept_id is None else t.concept_id,
+                         t.source or "", t.target or "", t.text or "", t.match or "",
+                         f"{t.score:.3f}"])
+        count += 1
+    return count
+
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Carga perezosa de los módulos de vocabulario del Tesauro UNESCO.
+
+Ningún módulo thesaurus_terms_* se importa hasta que se pide: una
+herramienta que solo usa un idioma, o solo un snapshot del índice, no paga
+por los demás.
+"""
+
+import importlib
+from functools import lru_cache
+
+VOCAB_MODULES = {
+    "bilingual": "thesaurus_terms_bilingual",
+    "es": "thesaurus_terms_es",
+    "en": "thesaurus_terms_en",
+}
+
+
+@lru_cache(maxsize=None)
+def load_concepts():
+    """Lista alineada [{'es':..., 'en':...}, ...] (define los IDs de concepto)."""
+    return importlib.import_module(VOCAB_MODULES["bilingual"]).CONCEPTS
+
+
+@lru_cache(maxsize=None)
+def load_terms(lang):
+    """Vocabulario de un solo idioma (orden alfabético, no alineado por ID)."""
+    return importlib.import_module(VOCAB_MODULES[lang]).THESAURUS_TERMS
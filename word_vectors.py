@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Vectores de palabras preentrenados (fastText / word2vec en formato .vec).
+
+• ingest_vec(): lee el .vec en streaming (una vez) y escribe un directorio
+  con la matriz float32 (filas L2, np.lib.format.open_memmap: nunca está
+  entera en RAM) y un vocabulario compacto: hashes de 64 bits de las
+  palabras ordenados + la fila de cada uno (12 bytes por palabra, sin
+  cadenas Python). Si una palabra se repite se conserva la primera
+  aparición (los .vec vienen ordenados por frecuencia).
+• WordVectors.load(): abre los .npy con mmap; arrancar no lee la matriz y
+  cada consulta solo toca las filas de sus palabras (búsqueda binaria en
+  los hashes).
+• embed(): media de los vectores de las palabras de cada texto (sin
+  palabras funcionales, ver textnorm.STOP_WORDS), normalizada L2. Textos sin
+  ninguna palabra conocida dan el vector cero.
+
+Los términos del tesauro se incrustan igual que los resúmenes y
+scorers.attach_word_vectors() registra los scorers "wordvec" y
+"tfidf+wordvec".
+
+Uso:
+    python cli.py vectors --input cc.es.300.vec --output vectores_es/ --lang es
+    python cli.py suggest --vectors vectores_es/ --scorer tfidf+wordvec --text "..."
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+from textnorm import STOP_WORDS
+
+TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+BLOCK_ROWS = 10000
+
+
+def word_hash(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _header(path):
+    # (filas, dimensión, ¿la primera línea es cabecera?)
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        first = fh.readline().split()
+        if len(first) == 2 and all(part.isdigit() for part in first):
+            return int(first[0]), int(first[1]), True
+        rows = 1 + sum(1 for _ in fh)
+    return rows, len(first) - 1, False
+
+
+def ingest_vec(path, output, max_words=None, lang=None):
+    """Convierte un .vec de texto en el directorio que abre WordVectors.load()."""
+    from numpy.lib.format import open_memmap
+
+    rows, dim, has_header = _header(path)
+    if max_words:
+        rows = min(rows, max_words)
+    os.makedirs(output, exist_ok=True)
+    vectors = open_memmap(os.path.join(output, "vectors.npy"), mode="w+",
+                          dtype=np.float32, shape=(rows, dim))
+    seen = set()
+    hashes = []
+    block = np.empty((BLOCK_ROWS, dim), dtype=np.float32)
+    filled = written = 0
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        if has_header:
+            fh.readline()
+        for line in fh:
+            if written + filled >= rows:
+                break
+            parts = line.rstrip().rsplit(" ", dim)
+            if len(parts) != dim + 1:
+                continue
+            h = word_hash(parts[0])
+            if h in seen:
+                continue
+            seen.add(h)
+            hashes.append(h)
+            block[filled] = np.asarray(parts[1:], dtype=np.float32)
+            filled += 1
+            if filled == BLOCK_ROWS:
+                vectors[written:written + filled] = _l2(block)
+                written += filled
+                filled = 0
+    if filled:
+        vectors[written:written + filled] = _l2(block[:filled])
+        written += filled
+    vectors.flush()
+    del vectors
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    order = np.argsort(hashes, kind="stable")
+    np.save(os.path.join(output, "hashes.npy"), hashes[order])
+    np.save(os.path.join(output, "rows.npy"), order.astype(np.int32))
+    meta = {"rows": int(written), "dim": int(dim), "lang": lang,
+            "source": os.path.basename(path), "max_words": max_words}
+    with open(os.path.join(output, "meta.json"), "w", encoding="utf-8") as fh:
+        json.dump(meta, fh, indent=2)
+    return WordVectors.load(output)
+
+
+def _l2(block):
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return block / norms
+
+
+class WordVectors:
+    """Matriz de vectores (mmap) + vocabulario por hash."""
+
+    def __init__(self, vectors, hashes, rows, meta):
+        self.vectors = vectors
+        self.hashes = hashes
+        self.rows = rows
+        self.meta = meta
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        mode = "r" if mmap else None
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        # Filas sin usar (palabras repetidas o líneas inválidas) al final
+        vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode=mode)[:meta["rows"]]
+        return cls(vectors,
+                   np.load(os.path.join(path, "hashes.npy"), mmap_mode=mode),
+                   np.load(os.path.join(path, "rows.npy"), mmap_mode=mode), meta)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    def lookup(self, words):
+        """Fila de cada palabra (-1 si no está en el vocabulario)."""
+        if not words:
+            return np.empty(0, dtype=np.int64)
+        keys = np.fromiter((word_hash(w) for w in words), dtype=np.uint64, count=len(words))
+        pos = np.searchsorted(self.hashes, keys)
+        pos = np.minimum(pos, len(self.hashes) - 1)
+        found = self.hashes[pos] == keys
+        return np.where(found, self.rows[pos], -1).astype(np.int64)
+
+    def embed(self, texts):
+        """Media L2 de los vectores de las palabras de cada texto (n × dim)."""
+        tokens = [[t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+                  for text in texts]
+        vocab = sorted({t for toks in tokens for t in toks})
+        rows = dict(zip(vocab, self.lookup(vocab).tolist()))
+        known = sorted({r for r in rows.values() if r >= 0})
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        if not known:
+            return out
+        # Solo se leen (del mmap) las filas de las palabras presentes
+        local = {r: i for i, r in enumerate(known)}
+        block = np.asarray(self.vectors[known], dtype=np.float32)
+        for i, toks in enumerate(tokens):
+            idx = [local[rows[t]] for t in toks if rows[t] >= 0]
+            if idx:
+                out[i] = block[idx].sum(axis=0)
+        return _l2(out)
+
+    @property
+    def nbytes(self):
+        return self.vectors.nbytes + self.hashes.nbytes + self.rows.nbytes